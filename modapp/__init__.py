@@ -1,15 +1,17 @@
-from .base_converter import BaseConverter
+from .base_converter import BaseConverter, TrustLevel
 from .base_transport import BaseTransport, BaseTransportConfig
 from .param_functions import Depends, Meta
-from .routing import APIRouter
+from .routing import APIRouter, ReplyBatch
 from .server import Modapp
 
 __all__ = [
     "Modapp",
     "BaseConverter",
+    "TrustLevel",
     "BaseTransport",
     "BaseTransportConfig",
     "APIRouter",
+    "ReplyBatch",
     "Meta",
     "Depends",
 ]
@@ -1,6 +1,12 @@
+import asyncio
+import contextvars
 import functools
+import os
 import typing
 import sys
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack
 
 try:
     # anyio is optional dependency
@@ -17,6 +23,32 @@ else:  # pragma: no cover
 P = ParamSpec("P")
 T = typing.TypeVar("T")
 
+# None: default of anyio or ThreadPoolExecutor
+_max_workers: typing.Optional[int] = None
+# stdlib executor is used if anyio is not installed
+_executor: typing.Optional[ThreadPoolExecutor] = None
+# anyio limiters are bound to event loop
+_limiter_by_loop: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, typing.Any]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def set_threadpool_max_workers(max_workers: typing.Optional[int]) -> None:
+    """Set max number of threads which run sync functions with `run_in_threadpool` at once,
+    further calls wait for a free thread.
+
+    Args:
+        max_workers (typing.Optional[int]): max number of threads, None for default of anyio
+            or `ThreadPoolExecutor` if anyio is not installed.
+    """
+    global _max_workers, _executor
+    _max_workers = max_workers
+    if _executor is not None:
+        # running calls are finished in old executor
+        _executor.shutdown(wait=False)
+        _executor = None
+    _limiter_by_loop.clear()
+
 
 async def run_in_threadpool(
     func: typing.Callable[P, T], *args: P.args, **kwargs: P.kwargs
@@ -24,8 +56,111 @@ async def run_in_threadpool(
     if kwargs:  # pragma: no cover
         # run_sync doesn't accept 'kwargs', so bind them in here
         func = functools.partial(func, **kwargs)
-    
+
     if anyio is None:
-        raise Exception('Install modapp with anyio dependency to be able to run background tasks')
-    
-    return await anyio.to_thread.run_sync(func, *args)
+        global _executor
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_max_workers, thread_name_prefix="modapp"
+            )
+        loop = asyncio.get_running_loop()
+        # context variables are available in thread like with anyio
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            _executor, functools.partial(context.run, func, *args)
+        )
+
+    limiter = None
+    if _max_workers is not None:
+        loop = asyncio.get_running_loop()
+        limiter = _limiter_by_loop.get(loop)
+        if limiter is None:
+            limiter = anyio.CapacityLimiter(_max_workers)
+            _limiter_by_loop[loop] = limiter
+    return await anyio.to_thread.run_sync(func, *args, limiter=limiter)
+
+
+# worker thread of current request, set by `WorkerThreads.lease`
+_request_thread: contextvars.ContextVar[typing.Optional[ThreadPoolExecutor]] = (
+    contextvars.ContextVar("request_thread", default=None)
+)
+
+
+class WorkerThreads:
+    """Bounded set of worker threads which run sync handlers and sync dependencies.
+
+    Each request leases one thread: enter and exit of its sync dependencies and its sync
+    handler run in it, so that thread-affine resources like sqlite connections can be
+    created in a dependency and used in the handler. Requests wait for a free thread if all
+    of them are leased.
+    """
+
+    def __init__(self, max_workers: typing.Optional[int] = None) -> None:
+        """Create set of worker threads, threads are started on first use.
+
+        Args:
+            max_workers (typing.Optional[int], optional): max number of requests running
+                sync code at once. Defaults to None, default of `ThreadPoolExecutor` is used
+                then.
+        """
+        self.max_workers = (
+            max_workers if max_workers is not None else min(32, (os.cpu_count() or 1) + 4)
+        )
+        # executor with one thread for each worker thread which is not leased
+        self._idle_executors: typing.List[ThreadPoolExecutor] = []
+        # semaphores are bound to event loop
+        self._semaphore_by_loop: (
+            "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]"
+        ) = weakref.WeakKeyDictionary()
+
+    async def lease(self, stack: AsyncExitStack) -> None:
+        """Lease worker thread to current request, sync code of request run with
+        `run_in_request_thread` runs in it until close of `stack`.
+
+        Args:
+            stack (AsyncExitStack): stack of request, thread is returned on its close after
+                exit of dependencies entered after lease.
+        """
+        semaphore = self.__get_semaphore()
+        await semaphore.acquire()
+        try:
+            executor = self._idle_executors.pop()
+        except IndexError:
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="modapp")
+
+        def release(token: contextvars.Token[typing.Optional[ThreadPoolExecutor]]) -> None:
+            _request_thread.reset(token)
+            self._idle_executors.append(executor)
+            semaphore.release()
+
+        stack.callback(release, _request_thread.set(executor))
+
+    def shutdown(self) -> None:
+        """Stop worker threads which are not leased."""
+        for executor in self._idle_executors:
+            executor.shutdown(wait=False)
+        self._idle_executors.clear()
+
+    def __get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphore_by_loop.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_workers)
+            self._semaphore_by_loop[loop] = semaphore
+        return semaphore
+
+
+async def run_in_request_thread(
+    func: typing.Callable[P, T], *args: P.args, **kwargs: P.kwargs
+) -> T:
+    """Run sync function in worker thread leased to current request with
+    `WorkerThreads.lease`, or with `run_in_threadpool` if request has no leased thread."""
+    executor = _request_thread.get()
+    if executor is None:
+        return await run_in_threadpool(func, *args, **kwargs)
+
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        executor, functools.partial(context.run, func, *args, **kwargs)
+    )
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Type
+from enum import Enum, unique
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Sequence, Type
 
 from .base_model import BaseModel, ModelType
 
@@ -9,15 +10,76 @@ if TYPE_CHECKING:
     from .errors import BaseModappError
 
 
+@unique
+class TrustLevel(Enum):
+    # validate all incoming data
+    VALIDATE = "validate"
+    # data is produced by trusted party, e.g. own server, construct models without validation
+    TRUSTED = "trusted"
+
+
 class BaseConverter(ABC):
+    # media type of raw data in HTTP headers, e.g. `application/json`
+    CONTENT_TYPE: ClassVar[str] = ""
+    # other media types of the same format, which are accepted in requests
+    CONTENT_TYPE_ALIASES: ClassVar[tuple[str, ...]] = ()
+    # content subtype in gRPC, e.g. `proto` in `application/grpc+proto`
+    GRPC_CONTENT_SUBTYPE: ClassVar[str | None] = None
+
+    def __init__(self, trust_level: TrustLevel = TrustLevel.VALIDATE) -> None:
+        """Create converter.
+
+        Args:
+            trust_level (TrustLevel, optional): trust level of converted data, routes can
+                override it. Defaults to TrustLevel.VALIDATE.
+        """
+        self.trust_level = trust_level
+
     @abstractmethod
-    def raw_to_model(self, raw: bytes, model_cls: Type[ModelType]) -> ModelType:
+    def raw_to_model(
+        self,
+        raw: bytes,
+        model_cls: Type[ModelType],
+        trust_level: TrustLevel | None = None,
+    ) -> ModelType:
         raise NotImplementedError()
 
     @abstractmethod
     def model_to_raw(self, model: BaseModel) -> bytes:
         raise NotImplementedError()
 
+    def raw_to_models_many(
+        self,
+        raws: Sequence[bytes],
+        model_cls: Type[ModelType],
+        trust_level: TrustLevel | None = None,
+    ) -> list[ModelType]:
+        """Convert batch of raw messages of the same type to models.
+
+        Converters can override it to resolve everything model-specific only once per batch.
+        """
+        return [self.raw_to_model(raw, model_cls, trust_level) for raw in raws]
+
+    def models_to_raw_many(self, models: Sequence[BaseModel]) -> list[bytes]:
+        """Convert batch of models to raw messages."""
+        return [self.model_to_raw(model) for model in models]
+
+    def get_model_constructor(
+        self, model_cls: Type[ModelType], trust_level: TrustLevel | None = None
+    ) -> Callable[[dict[str, Any]], ModelType]:
+        """Get function that constructs model from model dict according to trust level.
+
+        Args:
+            model_cls (Type[ModelType]): model class
+            trust_level (TrustLevel | None, optional): trust level of the data, trust level
+                of the converter is used if not set. Defaults to None.
+        """
+        if trust_level is None:
+            trust_level = self.trust_level
+        if trust_level is TrustLevel.TRUSTED:
+            return model_cls.construct_from_dict
+        return model_cls.validate_and_construct_from_dict
+
     @abstractmethod
     def error_to_raw(self, error: BaseModappError) -> bytes:
         """Convert error object to raw data.
@@ -32,3 +94,6 @@ class BaseConverter(ABC):
             bytes: raw data with error information
         """
         raise NotImplementedError()
+
+
+__all__ = ["BaseConverter", "TrustLevel"]
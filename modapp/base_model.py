@@ -2,8 +2,8 @@ from __future__ import annotations
 
 import sys
 from abc import abstractmethod
-from dataclasses import dataclass
-from typing import Any, ClassVar, TypeVar
+from dataclasses import MISSING
+from typing import Any, Callable, ClassVar, NamedTuple, TypeVar
 
 if sys.version_info >= (3, 11, 0):
     from typing import Self
@@ -11,8 +11,28 @@ else:
     from typing_extensions import Self
 
 
-@dataclass
+class ModelField(NamedTuple):
+    name: str
+    # resolved type annotation of the field
+    annotation: Any
+    # `dataclasses.MISSING` if field has no default value
+    default: Any = MISSING
+    default_factory: Callable[[], Any] | None = None
+
+    @property
+    def required(self) -> bool:
+        return self.default is MISSING and self.default_factory is None
+
+    def get_default(self) -> Any:
+        if self.default_factory is not None:
+            return self.default_factory()
+        return self.default
+
+
 class BaseModel:
+    # model families and their subclasses can be slotted, e.g. `@dataclass(slots=True)`
+    __slots__ = ()
+
     __modapp_path__: ClassVar[str]
 
     __model_config__: ClassVar[dict[str, str | bool | int | float]] = {"camelCase": False}
@@ -24,12 +44,38 @@ class BaseModel:
     def validate_and_construct_from_dict(cls, model_dict: dict[str, Any]) -> Self:
         raise NotImplementedError()
 
+    @classmethod
+    def construct_from_dict(cls, model_dict: dict[str, Any]) -> Self:
+        """Construct model from trusted data, e.g. data decoded from message with strict schema
+        or reply of own server.
+
+        Model families override it to skip validation. By default data is validated.
+        """
+        return cls.validate_and_construct_from_dict(model_dict)
+
     @abstractmethod
     def to_dict(self) -> dict[str, Any]:
         raise NotImplementedError()
 
+    @classmethod
+    @abstractmethod
+    def get_model_fields(cls) -> dict[str, ModelField]:
+        """Get fields of the model by their names. Result is computed once per model class."""
+        raise NotImplementedError()
+
+    @classmethod
+    def validate_field_value(cls, instance: Self, field_name: str, value: Any) -> Any:
+        """Validate value of a single field of already constructed model instance.
+
+        Used when fields are set one by one instead of constructing the whole model at once.
+
+        Returns:
+            Any: validated value
+        """
+        return value
+
 
 ModelType = TypeVar("ModelType", bound=BaseModel)
 
 
-__all__ = ["BaseModel", "ModelType"]
+__all__ = ["BaseModel", "ModelType", "ModelField"]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import traceback
 from abc import ABC
@@ -8,28 +9,42 @@ from typing import (
     TYPE_CHECKING,
     Any,
     AsyncIterator,
-    Callable,
-    Coroutine,
     Optional,
+    Sequence,
     TypedDict,
     Union,
 )
 
 from loguru import logger
+from typing_extensions import NotRequired, override
 
 from modapp.base_converter import BaseConverter
 from modapp.base_model import BaseModel
 from modapp.converter_utils import get_default_converter
-from modapp.errors import InvalidArgumentError, NotFoundError, ServerError
-from modapp.routing import Cardinality, Route
+from modapp.encoded_cache import EncodedModelCache
+from modapp.deadline import Deadline, _current_deadline
+from modapp.errors import (
+    DeadlineExceededError,
+    InvalidArgumentError,
+    NotFoundError,
+    ResourceExhaustedError,
+    ServerError,
+)
+from modapp.routing import Cardinality, ReplyBatch, Route
 from modapp.types import Metadata
 
 if TYPE_CHECKING:
+    from .concurrency_limit import ConcurrencyLimiter
     from .routing import RoutesDict
 
 
 class BaseTransportConfig(TypedDict):
     max_message_size_kb: int
+    # max total size of cached encoded replies, see `modapp.encoded_cache`
+    encoded_cache_size_kb: NotRequired[int]
+
+
+DEFAULT_ENCODED_CACHE_SIZE_KB = 16384
 
 
 class BaseTransport(ABC):
@@ -41,9 +56,36 @@ class BaseTransport(ABC):
         self,
         config: BaseTransportConfig,
         converter: Optional[BaseConverter] = None,
+        converters: Optional[Sequence[BaseConverter]] = None,
     ):
+        """Create transport.
+
+        Args:
+            config (BaseTransportConfig): transport config.
+            converter (Optional[BaseConverter], optional): default converter. Defaults to the
+                first one of `converters`.
+            converters (Optional[Sequence[BaseConverter]], optional): all converters of the
+                transport, transports select one of them per request by content type, e.g.
+                JSON for browsers and protobuf for other clients on the same port. Defaults to
+                None.
+        """
         self.config = config
+        if converter is None and converters:
+            converter = converters[0]
         self.converter = converter if converter is not None else get_default_converter()
+        self.converters: list[BaseConverter] = [self.converter]
+        if converters is not None:
+            self.converters.extend(
+                other_converter
+                for other_converter in converters
+                if other_converter is not self.converter
+            )
+        self.encoded_cache = EncodedModelCache(
+            max_size_bytes=config.get(
+                "encoded_cache_size_kb", DEFAULT_ENCODED_CACHE_SIZE_KB
+            )
+            * 1024
+        )
 
     async def start(self, routes: RoutesDict) -> None:
         raise NotImplementedError()
@@ -57,10 +99,109 @@ class BaseTransport(ABC):
         route: Route,
         raw_data: bytes,
         meta: Metadata,
+        converter: Optional[BaseConverter] = None,
+        reply_converter: Optional[BaseConverter] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Union[bytes, AsyncIterator[bytes]]:
+        """Handle request.
+
+        Args:
+            route (Route): route of request.
+            raw_data (bytes): raw request data.
+            meta (Metadata): metadata of request.
+            converter (Optional[BaseConverter], optional): converter of request selected by
+                transport. Defaults to None, default converter is used then.
+            reply_converter (Optional[BaseConverter], optional): converter of reply. Defaults
+                to None, converter of request is used then.
+            deadline (Optional[Deadline], optional): deadline of request from client timeout.
+                Handling is cancelled if it is exceeded. For streams it limits only start of
+                the stream. Defaults to None.
+
+        Raises:
+            DeadlineExceededError: deadline is exceeded.
+            ResourceExhaustedError: concurrency limit of route is reached, see
+                `Route.concurrency_limiters`.
+        """
+        if deadline is None:
+            return await self._handle_limited_request(
+                route, raw_data, meta, converter, reply_converter
+            )
+
+        if deadline.expired:
+            # client doesn't wait for reply anymore, don't start handling at all
+            logger.warning(f"Deadline of request to {route.path} exceeded before start")
+            raise DeadlineExceededError()
+        deadline_token = _current_deadline.set(deadline)
+        try:
+            return await asyncio.wait_for(
+                self._handle_limited_request(
+                    route, raw_data, meta, converter, reply_converter
+                ),
+                # time in queue of concurrency limit counts too
+                timeout=deadline.time_remaining(),
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Deadline of request to {route.path} exceeded, cancelled")
+            raise DeadlineExceededError()
+        finally:
+            _current_deadline.reset(deadline_token)
+
+    async def _handle_limited_request(
+        self,
+        route: Route,
+        raw_data: bytes,
+        meta: Metadata,
+        converter: Optional[BaseConverter],
+        reply_converter: Optional[BaseConverter],
     ) -> Union[bytes, AsyncIterator[bytes]]:
+        limiters = route.concurrency_limiters
+        if not limiters:
+            return await self._handle_request(
+                route, raw_data, meta, converter, reply_converter
+            )
+
+        # (limiter, time of acquiring)
+        acquired_limiters: list[tuple[ConcurrencyLimiter, float]] = []
+        try:
+            for limiter in limiters:
+                acquired_limiters.append((limiter, await limiter.acquire()))
+            reply = await self._handle_request(
+                route, raw_data, meta, converter, reply_converter
+            )
+        except BaseException:
+            _release_limiters(acquired_limiters)
+            raise
+
+        if isinstance(reply, bytes):
+            _release_limiters(acquired_limiters)
+            return reply
+        # stream holds slots until it is finished or closed
+        return _StreamHoldingLimiters(reply, acquired_limiters)
+
+    async def _handle_request(
+        self,
+        route: Route,
+        raw_data: bytes,
+        meta: Metadata,
+        converter: Optional[BaseConverter],
+        reply_converter: Optional[BaseConverter],
+    ) -> Union[bytes, AsyncIterator[bytes]]:
+        # converters selected by transport for this request, default converter otherwise
+        if converter is None:
+            converter = self.converter
+        if reply_converter is None:
+            reply_converter = converter
+
+        if route.process_pool is not None:
+            return await _handle_process_pool_request(
+                route, raw_data, meta, converter, reply_converter
+            )
+
         # request body
         try:
-            request_data = self.converter.raw_to_model(raw_data, route.request_type)
+            request_data = converter.raw_to_model(
+                raw_data, route.request_type, route.trust_level
+            )
         except InvalidArgumentError as error:
             logger.error(
                 f"Failed to convert request data to model: '{str(raw_data)}' for route"
@@ -78,12 +219,12 @@ class BaseTransport(ABC):
         stack = AsyncExitStack()
 
         try:
-            handler = await route.get_request_handler(request_data, meta, stack)
+            handler_args = await route.solve_handler_args(meta, stack)
             if route.proto_cardinality == Cardinality.UNARY_UNARY:
-                reply = await handler()
+                reply = await route.call_handler(request_data, handler_args)
                 assert isinstance(reply, BaseModel)
                 # modapp validates request handlers, trust it
-                proto_reply = self.converter.model_to_raw(reply)
+                proto_reply = self.encoded_cache.model_to_raw(reply_converter, reply)
                 logger.opt(lazy=True).debug(
                     f"Response on {route.path}: {{reply_str}}",
                     reply_str=lambda: json.dumps(
@@ -92,30 +233,24 @@ class BaseTransport(ABC):
                 )
                 return proto_reply
             elif route.proto_cardinality == Cardinality.UNARY_STREAM:
-
-                async def handle_request(
-                    handler: Callable[
-                        ..., Coroutine[Any, Any, AsyncIterator[BaseModel]]
-                    ],
-                    converter: BaseConverter,
-                    route: Route,
-                ) -> AsyncIterator[bytes]:
-                    response_iterator = await handler()
-                    logger.debug(f"Response stream on {route.path} ready")
-                    assert isinstance(
-                        response_iterator, AsyncIterator
-                    ), "Reply stream expected to be async iterator"
-                    async for reply in response_iterator:
-                        proto_reply = converter.model_to_raw(reply)
-                        yield proto_reply
-                        logger.trace(
-                            f"Response stream message on {route.path}: {reply}"
-                        )
-                    logger.debug(f"Response stream on {route.path} finished")
-
-                return handle_request(handler, self.converter, route)
-        except (NotFoundError, InvalidArgumentError, ServerError) as error:
+                return _handle_stream_request(
+                    route,
+                    request_data,
+                    handler_args,
+                    reply_converter,
+                    self.encoded_cache,
+                )
+        except (
+            NotFoundError,
+            InvalidArgumentError,
+            ServerError,
+            DeadlineExceededError,
+            ResourceExhaustedError,
+        ) as error:
             raise error
+        except asyncio.CancelledError:
+            # e.g. deadline is exceeded, it is not a server error
+            raise
         except BaseException as error:  # this should be in handler runner?
             logger.critical(f"Unhandled server error {error}")
             traceback.print_exc()
@@ -128,4 +263,108 @@ class BaseTransport(ABC):
         raise Exception()
 
 
+async def _handle_process_pool_request(
+    route: Route,
+    raw_data: bytes,
+    meta: Metadata,
+    converter: BaseConverter,
+    reply_converter: BaseConverter,
+) -> bytes:
+    assert route.process_pool is not None
+    # request is decoded and reply is encoded in worker process
+    try:
+        # only metadata values, handlers in process pool have no dependencies
+        async with AsyncExitStack() as stack:
+            handler_args = await route.solve_handler_args(meta, stack)
+        return await route.process_pool.handle_request(
+            raw_data, handler_args, converter, reply_converter
+        )
+    except (
+        NotFoundError,
+        InvalidArgumentError,
+        ServerError,
+        DeadlineExceededError,
+        ResourceExhaustedError,
+    ) as error:
+        raise error
+    except asyncio.CancelledError:
+        raise
+    except BaseException as error:
+        logger.critical(f"Unhandled server error {error}")
+        traceback.print_exc()
+        raise ServerError("Internal server error")
+
+
+async def _handle_stream_request(
+    route: Route,
+    request_data: BaseModel,
+    handler_args: dict[str, Any],
+    converter: BaseConverter,
+    encoded_cache: EncodedModelCache,
+) -> AsyncIterator[bytes]:
+    response_iterator = await route.call_handler(request_data, handler_args)
+    logger.debug(f"Response stream on {route.path} ready")
+    assert isinstance(
+        response_iterator, AsyncIterator
+    ), "Reply stream expected to be async iterator"
+    async for reply in response_iterator:
+        if isinstance(reply, ReplyBatch):
+            # messages which are ready at once are converted in one call
+            for proto_reply in encoded_cache.models_to_raw_many(converter, reply.messages):
+                yield proto_reply
+        else:
+            proto_reply = encoded_cache.model_to_raw(converter, reply)
+            yield proto_reply
+        logger.trace(f"Response stream message on {route.path}: {reply}")
+    logger.debug(f"Response stream on {route.path} finished")
+
+
+def _release_limiters(
+    acquired_limiters: Sequence[tuple[ConcurrencyLimiter, float]],
+) -> None:
+    for limiter, acquired_at in reversed(acquired_limiters):
+        limiter.release(acquired_at)
+
+
+class _StreamHoldingLimiters(AsyncIterator[bytes]):
+    """Reply stream which holds slots of concurrency limiters until it is exhausted, fails or
+    is closed, even if transport closes it before the first message. Stream which is
+    dropped without closing releases slots on garbage collection.
+    """
+
+    def __init__(
+        self,
+        stream: AsyncIterator[bytes],
+        acquired_limiters: Sequence[tuple[ConcurrencyLimiter, float]],
+    ) -> None:
+        self.stream = stream
+        self.acquired_limiters = acquired_limiters
+        self.released = False
+
+    @override
+    async def __anext__(self) -> bytes:
+        if self.released:
+            raise StopAsyncIteration
+        try:
+            return await self.stream.__anext__()
+        except BaseException:
+            # StopAsyncIteration on exhaustion too
+            self.release()
+            raise
+
+    async def aclose(self) -> None:
+        self.release()
+        aclose = getattr(self.stream, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+    def release(self) -> None:
+        if not self.released:
+            self.released = True
+            _release_limiters(self.acquired_limiters)
+
+    def __del__(self) -> None:
+        self.release()
+
+
 __all__ = ["BaseTransportConfig", "BaseTransport"]
@@ -9,6 +9,8 @@ from typing_extensions import override
 from modapp.base_converter import BaseConverter
 from modapp.base_model import BaseModel
 from modapp.client import BaseChannel, Stream
+from modapp.deadline import TIMEOUT_HEADER, encode_timeout
+from modapp.transports.utils.compression import decompress
 
 T = TypeVar("T", bound=BaseModel)
 StreamClosedMessage = object()
@@ -19,9 +21,24 @@ class AioHttpChannel(BaseChannel):
     NOTE: aiohttp conflicts with web_socketify, requests cannot be sent in web_socketify transport
     """
 
-    def __init__(self, converter: BaseConverter, server_address: str) -> None:
+    def __init__(
+        self,
+        converter: BaseConverter,
+        server_address: str,
+        stream_compression: str | None = None,
+    ) -> None:
+        """Create aiohttp channel.
+
+        Args:
+            converter (BaseConverter): converter of messages.
+            server_address (str): address of server, e.g. `http://127.0.0.1:3000`.
+            stream_compression (str | None, optional): content coding of stream messages
+                requested from server: `gzip` or `deflate`. Replies on unary requests are
+                compressed if server supports it anyway. Defaults to None.
+        """
         super().__init__(converter)
         self.server_address = server_address
+        self.stream_compression = stream_compression
         self._session: aiohttp.ClientSession | None = None
         self._ws: aiohttp.ClientWebSocketResponse | None = None
         self._ws_connection_id: str | None = None
@@ -45,6 +62,15 @@ class AioHttpChannel(BaseChannel):
                 self.server_address + route_path.replace(".", "/").lower(),
                 data=raw_data,
                 timeout=aiohttp.ClientTimeout(total=timeout),
+                headers={
+                    **self._get_content_headers(),
+                    # server stops handling when client doesn't wait for reply anymore
+                    **(
+                        {TIMEOUT_HEADER: encode_timeout(timeout)}
+                        if timeout is not None
+                        else {}
+                    ),
+                },
             ) as response:
                 raw_reply = await response.read()
 
@@ -73,7 +99,10 @@ class AioHttpChannel(BaseChannel):
                 self.server_address + route_path.replace(".", "/").lower(),
                 data=raw_data,
                 timeout=aiohttp.ClientTimeout(),
-                headers={"Connection-Id": self._ws_connection_id},
+                headers={
+                    **self._get_content_headers(),
+                    "Connection-Id": self._ws_connection_id,
+                },
             ) as response:
                 stream_id = response.headers.get("Stream-Id")
 
@@ -85,12 +114,22 @@ class AioHttpChannel(BaseChannel):
         
         async def generator():
             while True:
-                raw_message = await stream_queue.get()
-                if raw_message == StreamClosedMessage:
+                raw_messages = [await stream_queue.get()]
+                # convert all messages that are already received in one batch
+                while not stream_queue.empty():
+                    raw_messages.append(stream_queue.get_nowait())
+
+                stream_closed = raw_messages[-1] is StreamClosedMessage
+                if stream_closed:
+                    raw_messages.pop()
+                for message in self.converter.raw_to_models_many(
+                    raw_messages, reply_cls
+                ):
+                    yield message
+
+                if stream_closed:
                     del self._msg_queue_by_stream_id[stream_id]
                     break
-                message = self.converter.raw_to_model(raw_message, reply_cls)
-                yield message
         
         async def on_end():
             assert self._ws is not None
@@ -113,6 +152,15 @@ class AioHttpChannel(BaseChannel):
     async def __aexit__(self, exc_type, exc, tb) -> None:
         await self._close_ws(exc_type, exc, tb)
 
+    def _get_content_headers(self) -> dict[str, str]:
+        # server can support several converters, request the same one as channel uses
+        if self.converter.CONTENT_TYPE == "":
+            return {}
+        return {
+            "Content-Type": self.converter.CONTENT_TYPE,
+            "Accept": self.converter.CONTENT_TYPE,
+        }
+
     async def _connect_to_ws(self):
         if self._session is not None and self._ws is not None:
             logger.debug("Already connected to websocket")
@@ -120,9 +168,10 @@ class AioHttpChannel(BaseChannel):
 
         # TODO: handle timeout
         self._session = await aiohttp.ClientSession().__aenter__()
-        self._ws = await self._session.ws_connect(
-            f"{self.server_address}/ws"
-        ).__aenter__()
+        ws_url = f"{self.server_address}/ws"
+        if self.stream_compression is not None:
+            ws_url += f"?compression={self.stream_compression}"
+        self._ws = await self._session.ws_connect(ws_url).__aenter__()
 
         # TODO: catch timeout
         first_message = await asyncio.wait_for(anext(self._ws), timeout=10)
@@ -154,6 +203,10 @@ class AioHttpChannel(BaseChannel):
     async def process_ws_messages(self):
         assert self._ws is not None
         async for msg in self._ws:
+            if msg.type == aiohttp.WSMsgType.BINARY:
+                await self._process_binary_ws_message(msg.data)
+                continue
+
             msg_json = json.loads(msg.data)
             try:
                 stream_id = msg_json["streamId"]
@@ -190,3 +243,18 @@ class AioHttpChannel(BaseChannel):
             elif msg.type == aiohttp.WSMsgType.ERROR:
                 await stream_queue.put(StreamClosedMessage)
                 break
+
+    async def _process_binary_ws_message(self, data: bytes) -> None:
+        # binary message: JSON header, new line, message data
+        header, _, stream_msg = data.partition(b"\n")
+        header_json = json.loads(header)
+        try:
+            stream_queue = self._msg_queue_by_stream_id[header_json["streamId"]]
+        except KeyError:
+            logger.error("No queue found for binary ws message, skip it")
+            return
+
+        content_encoding = header_json.get("contentEncoding")
+        if content_encoding is not None:
+            stream_msg = decompress(stream_msg, content_encoding)
+        await stream_queue.put(stream_msg)
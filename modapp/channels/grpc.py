@@ -11,8 +11,10 @@ from modapp.base_model import BaseModel
 from modapp.client import BaseChannel, Stream
 from modapp.errors import (
     BaseModappError,
+    DeadlineExceededError,
     InvalidArgumentError,
     NotFoundError,
+    ResourceExhaustedError,
     ServerError,
 )
 from modapp.multi_with import MultiWith
@@ -74,7 +76,8 @@ class GrpcChannel(BaseChannel):
             None,  # type: ignore
         )
         try:
-            raw_reply = await method(raw_data)
+            # grpclib sends timeout to server in `grpc-timeout` header
+            raw_reply = await method(raw_data, timeout=timeout)
         except GRPCError as grpc_error:
             raise self.__grpc_error_to_modapp(grpc_error)
         return self.converter.raw_to_model(raw_reply, reply_cls)
@@ -135,5 +138,9 @@ class GrpcChannel(BaseChannel):
         elif grpc_error.status == GrpcStatus.INVALID_ARGUMENT:
             # TODO: add method in converter to convert proto to error obj payload
             return InvalidArgumentError({})
+        elif grpc_error.status == GrpcStatus.DEADLINE_EXCEEDED:
+            return DeadlineExceededError()
+        elif grpc_error.status == GrpcStatus.RESOURCE_EXHAUSTED:
+            return ResourceExhaustedError()
         else:
             return ServerError(grpc_error.message)
@@ -5,6 +5,7 @@ from typing_extensions import override
 from modapp.base_converter import BaseConverter
 from modapp.base_model import BaseModel
 from modapp.client import BaseChannel, Stream
+from modapp.deadline import Deadline
 from modapp.transports.inmemory import InMemoryTransport
 
 T = TypeVar("T", bound=BaseModel)
@@ -25,7 +26,11 @@ class InMemoryChannel(BaseChannel):
         timeout: float | None = 5,
     ) -> BaseModel:
         raw_data = self.converter.model_to_raw(request)
-        raw_reply = await self.transport.handle_request(route_path, raw_data)
+        raw_reply = await self.transport.handle_request(
+            route_path,
+            raw_data,
+            deadline=Deadline.from_timeout(timeout) if timeout is not None else None,
+        )
         assert isinstance(
             raw_reply, bytes
         ), "Reply on unary-unary request should be bytes"
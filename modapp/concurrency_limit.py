@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+
+from loguru import logger
+
+from modapp.errors import ResourceExhaustedError
+
+
+class ConcurrencyLimiter:
+    """Limit of requests handled at once.
+
+    Requests over the limit wait in a bounded queue in order of arrival. If the queue is full
+    or a request waits longer than `max_queue_time`, it is rejected with
+    `ResourceExhaustedError` (RESOURCE_EXHAUSTED in gRPC, 503 in HTTP), so that clients can
+    retry on other instance instead of waiting for overloaded one.
+
+    In adaptive mode limit is changed by latency of requests: while latency grows compared
+    to the lowest one, limit decreases, otherwise it grows (gradient algorithm). It lets to
+    find limit automatically when capacity of server is not known in advance.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        max_queue_size: int = 0,
+        max_queue_time: float | None = None,
+        adaptive: bool = False,
+        min_limit: int = 1,
+        max_limit: int | None = None,
+        latency_tolerance: float = 2.0,
+    ) -> None:
+        """Create concurrency limiter.
+
+        Args:
+            limit (int): max number of requests handled at once, initial one in adaptive
+                mode.
+            max_queue_size (int, optional): max number of requests waiting for handling.
+                Defaults to 0, requests over limit are rejected immediately.
+            max_queue_time (float | None, optional): max time in seconds a request waits in
+                queue. Defaults to None, no limit, but deadline of request still applies.
+            adaptive (bool, optional): change limit by latency of requests. Defaults to False.
+            min_limit (int, optional): min limit in adaptive mode. Defaults to 1.
+            max_limit (int | None, optional): max limit in adaptive mode. Defaults to None,
+                10 times initial limit.
+            latency_tolerance (float, optional): in adaptive mode, how many times latency can
+                exceed the lowest one before limit is decreased. Defaults to 2.0.
+        """
+        if limit < 1:
+            raise ValueError("Concurrency limit should be at least 1")
+        self.limit = limit
+        self.max_queue_size = max_queue_size
+        self.max_queue_time = max_queue_time
+        self.adaptive = adaptive
+        self.min_limit = min_limit
+        self.max_limit = max_limit if max_limit is not None else limit * 10
+        self.latency_tolerance = latency_tolerance
+
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        # adaptive mode: limit as float to change it smoothly
+        self._estimated_limit = float(limit)
+        self._min_latency: float | None = None
+        self._smoothed_latency: float | None = None
+
+    @property
+    def queue_size(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> float:
+        """Wait for free slot.
+
+        Returns:
+            float: time of acquiring by `time.monotonic` clock, pass it to `release`.
+
+        Raises:
+            ResourceExhaustedError: queue is full or max queue time is exceeded.
+        """
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return time.monotonic()
+
+        if len(self._waiters) >= self.max_queue_size:
+            logger.warning(
+                f"Concurrency limit {self.limit} reached and queue is full, reject request"
+            )
+            raise ResourceExhaustedError()
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # waiter is not cancelled by timeout, slot can be passed to it at the same time
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=self.max_queue_time)
+        except BaseException as error:
+            if waiter.done() and not waiter.cancelled():
+                # slot was passed to this request, but it doesn't need it anymore
+                self._release_slot()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            if isinstance(error, asyncio.TimeoutError):
+                logger.warning("Max queue time of concurrency limit exceeded, reject request")
+                raise ResourceExhaustedError()
+            raise
+        # slot is passed by `release`, in_flight is not decreased there
+        return time.monotonic()
+
+    def release(self, acquired_at: float) -> None:
+        """Free slot acquired with `acquire`.
+
+        Args:
+            acquired_at (float): time of acquiring returned by `acquire`.
+        """
+        if self.adaptive:
+            self._update_limit(time.monotonic() - acquired_at)
+        self._release_slot()
+
+    def _release_slot(self) -> None:
+        if self.in_flight <= self.limit:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                if not waiter.done():
+                    # pass slot to the next request in queue
+                    waiter.set_result(None)
+                    return
+        self.in_flight -= 1
+
+    def _update_limit(self, latency: float) -> None:
+        if self._min_latency is None or latency < self._min_latency:
+            self._min_latency = latency
+        if self._smoothed_latency is None:
+            self._smoothed_latency = latency
+        else:
+            self._smoothed_latency = 0.9 * self._smoothed_latency + 0.1 * latency
+        if self._smoothed_latency <= 0:
+            return
+
+        gradient = max(
+            0.5,
+            min(
+                1.0,
+                self.latency_tolerance * self._min_latency / self._smoothed_latency,
+            ),
+        )
+        # square root of limit lets limit grow while latency is not affected
+        new_limit = self._estimated_limit * gradient + math.sqrt(self._estimated_limit)
+        self._estimated_limit = min(
+            float(self.max_limit),
+            max(float(self.min_limit), 0.8 * self._estimated_limit + 0.2 * new_limit),
+        )
+        new_int_limit = int(self._estimated_limit)
+        if new_int_limit > self.limit:
+            self.limit = new_int_limit
+            # wake requests in queue which fit in the new limit
+            while self.in_flight < self.limit and self._waiters:
+                waiter = self._waiters.popleft()
+                if not waiter.done():
+                    self.in_flight += 1
+                    waiter.set_result(None)
+        else:
+            self.limit = new_int_limit
+
+
+__all__ = ["ConcurrencyLimiter"]
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Sequence
 
 if TYPE_CHECKING:
     from .base_converter import BaseConverter
@@ -8,3 +8,102 @@ if TYPE_CHECKING:
 
 def get_default_converter() -> BaseConverter:
     raise NotImplementedError()
+
+
+def select_converter(
+    converters: Sequence[BaseConverter], content_type: str | None
+) -> BaseConverter | None:
+    """Select converter of request data by value of `Content-Type` header.
+
+    Args:
+        converters (Sequence[BaseConverter]): converters of transport, the first one is
+            default.
+        content_type (str | None): value of `Content-Type` header.
+
+    Returns:
+        BaseConverter | None: default converter if content type is not set or there is only
+            one converter, None if no converter supports content type.
+    """
+    if content_type is None or len(converters) == 1:
+        return converters[0]
+    media_type = _parse_media_type(content_type)
+    if media_type == "":
+        return converters[0]
+    for converter in converters:
+        if _supports_media_type(converter, media_type):
+            return converter
+    return None
+
+
+def select_reply_converter(
+    converters: Sequence[BaseConverter], accept: str | None, default: BaseConverter
+) -> BaseConverter:
+    """Select converter of reply data by value of `Accept` header.
+
+    Args:
+        converters (Sequence[BaseConverter]): converters of transport.
+        accept (str | None): value of `Accept` header.
+        default (BaseConverter): converter used if `Accept` header is not set or no converter
+            matches it, usually converter of request.
+    """
+    if accept is None or len(converters) == 1:
+        return default
+
+    media_ranges: list[tuple[float, str]] = []
+    for accept_item in accept.split(","):
+        media_range, *parameters = accept_item.split(";")
+        quality = 1.0
+        for parameter in parameters:
+            name, _, value = parameter.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            media_ranges.append((quality, media_range.strip().lower()))
+    # stable sort keeps order of client for the same quality
+    media_ranges.sort(key=lambda media_range: -media_range[0])
+
+    for _, media_range in media_ranges:
+        if media_range == "*/*":
+            return default
+        if media_range.endswith("/*"):
+            media_type_prefix = media_range[:-1]
+            if default.CONTENT_TYPE.startswith(media_type_prefix):
+                return default
+            for converter in converters:
+                if converter.CONTENT_TYPE.startswith(media_type_prefix):
+                    return converter
+            continue
+        if _supports_media_type(default, media_range):
+            return default
+        for converter in converters:
+            if _supports_media_type(converter, media_range):
+                return converter
+    return default
+
+
+def select_grpc_converter(
+    converters: Sequence[BaseConverter], content_subtype: str | None
+) -> BaseConverter | None:
+    """Select converter by gRPC content subtype, e.g. `json` in `application/grpc+json`.
+    Default converter is selected if subtype is not set."""
+    if not content_subtype:
+        return converters[0]
+    for converter in converters:
+        if converter.GRPC_CONTENT_SUBTYPE == content_subtype:
+            return converter
+    return None
+
+
+def _parse_media_type(content_type: str) -> str:
+    # parameters like charset are ignored
+    return content_type.split(";", maxsplit=1)[0].strip().lower()
+
+
+def _supports_media_type(converter: BaseConverter, media_type: str) -> bool:
+    return (
+        media_type == converter.CONTENT_TYPE
+        or media_type in converter.CONTENT_TYPE_ALIASES
+    )
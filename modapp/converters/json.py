@@ -1,34 +1,119 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Type
+import dataclasses
+from typing import TYPE_CHECKING, Any, Sequence, Type, cast
 
 import orjson
 from typing_extensions import override
 
-from ..base_converter import BaseConverter
+from ..base_converter import BaseConverter, TrustLevel
 from ..base_model import BaseModel, ModelType
-from ..errors import InvalidArgumentError, ServerError, NotFoundError
+from ..errors import (
+    DeadlineExceededError,
+    InvalidArgumentError,
+    ServerError,
+    NotFoundError,
+    ResourceExhaustedError,
+)
+from ..model_utils import get_camel_case_key_table
+from ..models.dataclass import DataclassModel
+from ..models.pydantic import PydanticModel
+from ..packed import is_packed_array, packed_to_list
 
 if TYPE_CHECKING:
     from ..errors import BaseModappError
 
 
 class JsonConverter(BaseConverter):
-    def __init__(self) -> None:
-        super().__init__()
+    CONTENT_TYPE = "application/json"
+    GRPC_CONTENT_SUBTYPE = "json"
+
+    def __init__(
+        self,
+        trust_level: TrustLevel = TrustLevel.VALIDATE,
+        native_serialization: bool = False,
+    ) -> None:
+        """Create JSON converter.
+
+        Args:
+            trust_level (TrustLevel, optional): trust level of converted data.
+                Defaults to TrustLevel.VALIDATE.
+            native_serialization (bool, optional): serialize models to JSON directly without
+                intermediate dict from `model.to_dict()`: dataclass models are serialized by
+                orjson, pydantic models by pydantic-core. Output can differ in details, e.g.
+                pydantic formats datetimes and bytes in its own way, and overridden `to_dict`
+                is not used. Defaults to False.
+        """
+        super().__init__(trust_level=trust_level)
+        self.native_serialization = native_serialization
 
     @override
-    def raw_to_model(self, raw: bytes, model_cls: Type[ModelType]) -> ModelType:
-        return model_cls.validate_and_construct_from_dict(
-            model_dict=(orjson.loads(raw) if len(raw) > 0 else {})
-        )
+    def raw_to_model(
+        self,
+        raw: bytes,
+        model_cls: Type[ModelType],
+        trust_level: TrustLevel | None = None,
+    ) -> ModelType:
+        construct = self.get_model_constructor(model_cls, trust_level)
+        return construct(orjson.loads(raw) if len(raw) > 0 else {})
 
     @override
     def model_to_raw(self, model: BaseModel) -> bytes:
-        return orjson.dumps(model.to_dict())
+        if self.native_serialization:
+            return self.__model_to_raw_natively(model)
+        return orjson.dumps(
+            model.to_dict(), default=_serialize_default, option=orjson.OPT_SERIALIZE_NUMPY
+        )
+
+    @override
+    def raw_to_models_many(
+        self,
+        raws: Sequence[bytes],
+        model_cls: Type[ModelType],
+        trust_level: TrustLevel | None = None,
+    ) -> list[ModelType]:
+        construct = self.get_model_constructor(model_cls, trust_level)
+        loads = orjson.loads
+        models: list[ModelType | None] = [None] * len(raws)
+        for idx, raw in enumerate(raws):
+            models[idx] = construct(loads(raw) if len(raw) > 0 else {})
+        return cast(list[ModelType], models)
+
+    @override
+    def models_to_raw_many(self, models: Sequence[BaseModel]) -> list[bytes]:
+        model_to_raw = self.model_to_raw
+        raws: list[bytes] = [b""] * len(models)
+        for idx, model in enumerate(models):
+            raws[idx] = model_to_raw(model)
+        return raws
+
+    def __model_to_raw_natively(self, model: BaseModel) -> bytes:
+        # lazy models decode fields on access, but native serializers read them directly
+        materialize = getattr(model, "modapp_materialize", None)
+        if materialize is not None:
+            materialize()
+
+        if isinstance(model, PydanticModel):
+            return model.__pydantic_serializer__.to_json(model, **model.__dump_options__)
+        if isinstance(model, DataclassModel):
+            if model.__model_config__.get("camelCase", False):
+                # orjson cannot rename keys of dataclasses, pass them to `default`
+                return orjson.dumps(
+                    model,
+                    default=_serialize_camel_case_default,
+                    option=orjson.OPT_SERIALIZE_NUMPY
+                    | orjson.OPT_PASSTHROUGH_DATACLASS,
+                )
+            return orjson.dumps(
+                model, default=_serialize_default, option=orjson.OPT_SERIALIZE_NUMPY
+            )
+        return orjson.dumps(
+            model.to_dict(), default=_serialize_default, option=orjson.OPT_SERIALIZE_NUMPY
+        )
 
     @override
     def error_to_raw(self, error: BaseModappError) -> bytes:
+        error_details: dict[str, str] | str
         if isinstance(error, InvalidArgumentError):
             error_details = error.errors_by_fields
         elif isinstance(error, NotFoundError):
@@ -38,6 +123,34 @@ class JsonConverter(BaseConverter):
                 error_details = "Not found"
         elif isinstance(error, ServerError):
             error_details = "Server error"
+        elif isinstance(error, DeadlineExceededError):
+            error_details = "Deadline exceeded"
+        elif isinstance(error, ResourceExhaustedError):
+            error_details = "Resource exhausted"
         else:
             error_details = "Internal error"
         return orjson.dumps({"error": error_details})
+
+
+def _serialize_default(value: Any) -> Any:
+    # NumPy arrays are serialized by orjson natively
+    if is_packed_array(value):
+        return packed_to_list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _serialize_camel_case_default(value: Any) -> Any:
+    if isinstance(value, DataclassModel):
+        # values are serialized by orjson, nested dataclasses come here again
+        return {
+            camel_key: getattr(value, field_name)
+            for field_name, camel_key in get_camel_case_key_table(
+                type(value)
+            ).camel_keys.items()
+        }
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        # plain dataclasses are not models, their keys are not renamed like in `to_dict`
+        return {
+            field.name: getattr(value, field.name) for field in dataclasses.fields(value)
+        }
+    return _serialize_default(value)
@@ -1,8 +1,20 @@
 from __future__ import annotations
 
+import array
 from datetime import datetime, timezone
 from enum import Enum
-from typing import TYPE_CHECKING, Any, Type, cast
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterable,
+    Mapping,
+    NamedTuple,
+    Sequence,
+    Type,
+    cast,
+)
 
 import google.protobuf.descriptor as protobuf_descriptor
 from google.protobuf import message as protobuf_message
@@ -12,9 +24,20 @@ from google.rpc.error_details_pb2 import BadRequest  # type: ignore
 from loguru import logger
 from typing_extensions import override
 
-from modapp.base_converter import BaseConverter
+from modapp.base_converter import BaseConverter, TrustLevel
 from modapp.base_model import BaseModel, ModelType
-from modapp.errors import InvalidArgumentError, NotFoundError, ServerError, Status
+from modapp.errors import (
+    DeadlineExceededError,
+    InvalidArgumentError,
+    NotFoundError,
+    ResourceExhaustedError,
+    ServerError,
+    Status,
+)
+from modapp.model_utils import get_camel_case_key_table
+from modapp.packed import PackedField, get_packed_fields, is_packed_array, to_little_endian_bytes
+
+from .protobuf_lazy import LazyModelFactory
 
 if TYPE_CHECKING:
     from modapp.errors import BaseModappError
@@ -59,25 +82,320 @@ def model_field_type_matches_proto_field(
     )
 
 
-PyValue = (
-    str
-    | int
-    | bool
-    | float
-    | list[str | int | bool | float]
-    | dict[str, str | int | bool | float]
-)
-PyValueOrProtoMessage = protobuf_message.Message | str | int | bool | float
+TIMESTAMP_FULL_NAME = "google.protobuf.Timestamp"
+
+ValueDecoder = Callable[[Any], Any]
+
+
+class _FieldDecoder(NamedTuple):
+    proto_name: str
+    # key in model dict: name of oneof for fields in oneof, otherwise name of the field
+    model_key: str
+    has_presence: bool
+    # None if proto value can be passed to the model as is
+    decode: ValueDecoder | None
+
+
+# flat list of field handlers of one message type
+DecodePlan = list[_FieldDecoder]
+
+
+def _run_decode_plan(
+    proto_obj: protobuf_message.Message, plan: DecodePlan
+) -> dict[str, Any]:
+    model_dict: dict[str, Any] = {}
+    for proto_name, model_key, has_presence, decode in plan:
+        # skip fields with default values
+        if has_presence and not proto_obj.HasField(proto_name):
+            continue
+        value = getattr(proto_obj, proto_name)
+        model_dict[model_key] = value if decode is None else decode(value)
+    return model_dict
+
+
+def _decode_repeated(items: Iterable[Any], item_decoder: ValueDecoder) -> list[Any]:
+    return [item_decoder(item) for item in items]
+
+
+def _decode_map(
+    proto_map: Mapping[Any, Any], value_decoder: ValueDecoder
+) -> dict[Any, Any]:
+    return {key: value_decoder(value) for key, value in proto_map.items()}
+
+
+def _timestamp_to_datetime(timestamp_obj: Timestamp) -> datetime:
+    return datetime.fromtimestamp(
+        timestamp_obj.seconds + (timestamp_obj.nanos / 1_000_000_000),
+        tz=timezone.utc,
+    )
+
+
+def _is_map_entry(message_descriptor: protobuf_descriptor.Descriptor) -> bool:
+    # maps in proto descriptor are repeated messages with `map_entry` option
+    return cast(bool, message_descriptor.GetOptions().map_entry)
+
+
+# packed repeated fields of these types are little-endian values of fixed size in wire format:
+# type -> (typecode of packed array, size of value)
+FIXED_SIZE_TYPECODES = {
+    protobuf_descriptor.FieldDescriptor.TYPE_DOUBLE: ("d", 8),
+    protobuf_descriptor.FieldDescriptor.TYPE_FLOAT: ("f", 4),
+    protobuf_descriptor.FieldDescriptor.TYPE_FIXED64: ("Q", 8),
+    protobuf_descriptor.FieldDescriptor.TYPE_SFIXED64: ("q", 8),
+    protobuf_descriptor.FieldDescriptor.TYPE_FIXED32: ("I", 4),
+    protobuf_descriptor.FieldDescriptor.TYPE_SFIXED32: ("i", 4),
+}
+WIRE_TYPE_VARINT = 0
+WIRE_TYPE_FIXED64 = 1
+WIRE_TYPE_LENGTH_DELIMITED = 2
+WIRE_TYPE_FIXED32 = 5
+
+
+def _is_bulk_packed_field(
+    field: protobuf_descriptor.FieldDescriptor, packed_field: PackedField
+) -> bool:
+    """Whether packed field can be converted from and to wire format in bulk."""
+    if field.label != field.LABEL_REPEATED or not field.is_packed:
+        return False
+    typecode, value_size = FIXED_SIZE_TYPECODES.get(field.type, (None, 0))
+    return (
+        typecode == packed_field.typecode
+        and array.array(typecode).itemsize == value_size
+    )
+
+
+def _encode_varint(value: int) -> bytes:
+    result = bytearray()
+    while value > 0x7F:
+        result.append((value & 0x7F) | 0x80)
+        value >>= 7
+    result.append(value)
+    return bytes(result)
+
+
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _find_packed_chunks(
+    raw: bytes, field_numbers: Mapping[int, Any]
+) -> dict[int, list[memoryview]] | None:
+    """Find payloads of packed fields in serialized message.
+
+    Only top-level fields of the message are scanned, values of packed fields are not decoded.
+    Packed fields can be split into several chunks in one message.
+
+    Returns:
+        dict[int, list[memoryview]] | None: chunks by field number. None if some of the fields
+            is not packed, then they need to be read from parsed message.
+    """
+    raw_view = memoryview(raw)
+    chunks: dict[int, list[memoryview]] = {}
+    pos = 0
+    raw_len = len(raw)
+    while pos < raw_len:
+        key, pos = _read_varint(raw, pos)
+        field_number = key >> 3
+        wire_type = key & 0x07
+        if wire_type == WIRE_TYPE_LENGTH_DELIMITED:
+            length, pos = _read_varint(raw, pos)
+            end = pos + length
+            if field_number in field_numbers:
+                chunks.setdefault(field_number, []).append(raw_view[pos:end])
+            pos = end
+            continue
+
+        if field_number in field_numbers:
+            # repeated value is not packed, e.g. sent by old client
+            return None
+        if wire_type == WIRE_TYPE_VARINT:
+            _, pos = _read_varint(raw, pos)
+        elif wire_type == WIRE_TYPE_FIXED64:
+            pos += 8
+        elif wire_type == WIRE_TYPE_FIXED32:
+            pos += 4
+        else:
+            # deprecated groups
+            return None
+    return chunks
+
+
+def _decode_packed_fields(
+    raw: bytes,
+    model_dict: dict[str, Any],
+    packed_decoders: dict[int, tuple[str, PackedField]],
+) -> None:
+    chunks_by_field_number = _find_packed_chunks(raw, packed_decoders)
+    if chunks_by_field_number is None:
+        # values from parsed message are converted by the model
+        return
+    for field_number, (model_key, packed_field) in packed_decoders.items():
+        chunks = chunks_by_field_number.get(field_number)
+        if chunks is None:
+            data: bytes | memoryview = b""
+        elif len(chunks) == 1:
+            data = chunks[0]
+        else:
+            data = b"".join(chunks)
+        model_dict[model_key] = packed_field.from_little_endian_bytes(data)
+
+
+def _add_packed_chunk(packed_chunks: list[bytes], key: bytes, value: Any) -> None:
+    if len(value) == 0:
+        # empty repeated fields are not serialized
+        return
+    payload = to_little_endian_bytes(value)
+    packed_chunks.append(key)
+    packed_chunks.append(_encode_varint(len(payload)))
+    packed_chunks.append(payload)
+
+
+# converts value from model dict to proto value. Gets also value from model instance, because
+# model dict doesn't contain model classes of nested models
+FieldEncoder = Callable[[Any, Any], Any]
+
+
+class _OneofEncoder:
+    """Resolves field of 'oneof' by python type of the model value."""
+
+    def __init__(
+        self,
+        oneof_descriptor: protobuf_descriptor.OneofDescriptor,
+        fields: list[tuple[protobuf_descriptor.FieldDescriptor, FieldEncoder | None]],
+    ) -> None:
+        self.oneof_descriptor = oneof_descriptor
+        self.fields = fields
+        self.dispatch: dict[type, tuple[str, FieldEncoder | None]] = {}
+
+    def resolve(
+        self, dict_value: Any, model_value: Any
+    ) -> tuple[str, FieldEncoder | None]:
+        try:
+            return self.dispatch[type(model_value)]
+        except KeyError:
+            pass
+
+        # prefer exact type match, e.g. bool value in oneof { int64, bool }
+        matching_fields = [
+            (field, encoder)
+            for (field, encoder) in self.fields
+            if field.type != field.TYPE_MESSAGE
+            and PRIMITIVE_TYPE_PROTO_TO_PY_MAP.get(field.type) is type(dict_value)
+        ]
+        if len(matching_fields) == 0:
+            matching_fields = [
+                (field, encoder)
+                for (field, encoder) in self.fields
+                if model_field_type_matches_proto_field(
+                    dict_field_value=dict_value,
+                    model_field_value=model_value,
+                    proto_field=field,
+                )
+            ]
+        if len(matching_fields) == 0:
+            raise Exception(
+                f"Field not found in oneof {self.oneof_descriptor.name} in message"
+                f" {self.oneof_descriptor.containing_type.full_name} for value"
+                f" {dict_value}"
+            )
+
+        field, encoder = matching_fields[0]
+        resolved = (field.name, encoder)
+        self.dispatch[type(model_value)] = resolved
+        return resolved
+
+
+class _EncodePlan:
+    def __init__(
+        self,
+        proto_cls: Type[protobuf_message.Message],
+        attr_names: dict[str, str] | None = None,
+    ) -> None:
+        self.proto_cls = proto_cls
+        # key in model dict -> name of model attribute. Keys missing here are used as is
+        self.attr_names: dict[str, str] = attr_names if attr_names is not None else {}
+        # encoders of fields that cannot be passed to proto as is
+        self.encoders: dict[str, FieldEncoder] = {}
+        # all fields except fields in oneofs, in order of proto descriptor
+        self.fields: list[tuple[str, FieldEncoder | None]] = []
+        self.oneofs: dict[str, _OneofEncoder] = {}
+        # proto field name -> encoded key of packed field, which is serialized in bulk
+        self.packed_keys: dict[str, bytes] = {}
+
+
+def _encode_enum(value: Any, model_value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+
+def _encode_repeated_enum(values: list[Any], model_values: Any) -> list[Any]:
+    return [value.value if isinstance(value, Enum) else value for value in values]
+
+
+def _encode_timestamp(datetime_value: datetime, model_value: Any) -> Timestamp:
+    return Timestamp(
+        seconds=int(datetime_value.replace(tzinfo=timezone.utc).timestamp()),
+        nanos=datetime_value.microsecond * 1000,
+    )
 
 
 class ProtobufConverter(BaseConverter):
-    def __init__(self, protos: dict[str, Type[protobuf_message.Message]]) -> None:
-        super().__init__()
+    CONTENT_TYPE = "application/octet-stream"
+    CONTENT_TYPE_ALIASES = ("application/x-protobuf", "application/protobuf")
+    GRPC_CONTENT_SUBTYPE = "proto"
+
+    def __init__(
+        self,
+        protos: Mapping[str, Type[protobuf_message.Message]],
+        direct_encode: bool = False,
+        lazy_models: bool = False,
+        trust_level: TrustLevel = TrustLevel.VALIDATE,
+    ) -> None:
+        """Create protobuf converter.
+
+        Args:
+            protos (Mapping[str, Type[protobuf_message.Message]]): proto classes by full
+                name. Use `LazyProtoRegistry` to import generated modules on first use.
+            direct_encode (bool, optional): read values directly from model attributes in
+                `model_to_raw` instead of building intermediate dict with `model.to_dict()`.
+                Custom serialization of models (e.g. pydantic serializers) is not applied in
+                this mode. Defaults to False.
+            lazy_models (bool, optional): return lazy model views from `raw_to_model`: fields
+                are decoded and validated on first access instead of eagerly. Validation errors
+                are raised on access to the invalid field then. Defaults to False.
+            trust_level (TrustLevel, optional): trust level of converted data. Trusted data is
+                not validated, types of its fields are already guaranteed by proto schema. Lazy
+                models validate values on access regardless of trust level.
+                Defaults to TrustLevel.VALIDATE.
+        """
+        super().__init__(trust_level=trust_level)
         self.protos = protos
+        self.direct_encode = direct_encode
         # self.resolved_protos: dict[str, Type[protobuf_message.Message]] = {}
+        self._decode_plans: dict[str, DecodePlan] = {}
+        self._encode_plans: dict[Type[BaseModel], _EncodePlan] = {}
+        # model class -> packed fields by proto field number, which are decoded in bulk
+        self._packed_decoders: dict[
+            Type[BaseModel], dict[int, tuple[str, PackedField]]
+        ] = {}
+        self._lazy_model_factory: LazyModelFactory | None = (
+            LazyModelFactory(self) if lazy_models else None
+        )
 
     @override
-    def raw_to_model(self, raw: bytes, model_cls: Type[ModelType]) -> ModelType:
+    def raw_to_model(
+        self,
+        raw: bytes,
+        model_cls: Type[ModelType],
+        trust_level: TrustLevel | None = None,
+    ) -> ModelType:
         try:
             proto_cls = self.protos[model_cls.__modapp_path__]
         except KeyError:
@@ -86,17 +404,65 @@ class ProtobufConverter(BaseConverter):
             #     self.resolved_protos[model_cls.__modapp_path__] = proto_request_type
 
         proto_instance = proto_cls.FromString(raw)
-        model_dict = self.__proto_obj_to_dict(proto_instance)
-        return model_cls.validate_and_construct_from_dict(model_dict=model_dict)
+        if self._lazy_model_factory is not None:
+            return self._lazy_model_factory.create(
+                model_cls, proto_instance, trust_level
+            )
+        return self._decode_eagerly(proto_instance, model_cls, trust_level, raw=raw)
 
     @override
     def model_to_raw(self, model: BaseModel) -> bytes:
-        model_dict = model.to_dict()
-        proto_obj = self.__dict_to_proto_obj(
-            model_dict=model_dict,
-            model_obj=model,
-        )
-        return proto_obj.SerializeToString()
+        plan = self._encode_plans.get(type(model))
+        if plan is None:
+            plan = self._get_encode_plan(type(model))
+        # serialized packed fields, they are appended to serialized message. Repeated fields
+        # can be in any place of the message
+        packed_chunks: list[bytes] | None = [] if plan.packed_keys else None
+
+        if self.direct_encode:
+            proto_obj = self.__model_to_proto_obj(model, packed_chunks)
+        else:
+            model_dict = model.to_dict()
+            proto_obj = self.__dict_to_proto_obj(
+                model_dict=model_dict,
+                model_obj=model,
+                packed_chunks=packed_chunks,
+            )
+        raw = cast(bytes, proto_obj.SerializeToString())
+        if packed_chunks:
+            return b"".join([raw, *packed_chunks])
+        return raw
+
+    @override
+    def raw_to_models_many(
+        self,
+        raws: Sequence[bytes],
+        model_cls: Type[ModelType],
+        trust_level: TrustLevel | None = None,
+    ) -> list[ModelType]:
+        try:
+            proto_cls = self.protos[model_cls.__modapp_path__]
+        except KeyError:
+            raise ServerError(f"Proto for {model_cls} not found")
+
+        if self._lazy_model_factory is not None:
+            create = self._lazy_model_factory.create
+            return [
+                create(model_cls, proto_cls.FromString(raw), trust_level) for raw in raws
+            ]
+
+        # all messages in batch have the same type, resolve it only once
+        plan = self._get_decode_plan(proto_cls.DESCRIPTOR)
+        from_string = proto_cls.FromString
+        construct = self.get_model_constructor(model_cls, trust_level)
+        packed_decoders = self._get_packed_decoders(model_cls, proto_cls.DESCRIPTOR)
+        models: list[ModelType | None] = [None] * len(raws)
+        for idx, raw in enumerate(raws):
+            model_dict = _run_decode_plan(from_string(raw), plan)
+            if packed_decoders:
+                _decode_packed_fields(raw, model_dict, packed_decoders)
+            models[idx] = construct(model_dict)
+        return cast(list[ModelType], models)
 
     @override
     def error_to_raw(self, error: BaseModappError) -> bytes:
@@ -106,6 +472,10 @@ class ProtobufConverter(BaseConverter):
             return self.__not_found_to_raw(error)
         elif isinstance(error, ServerError):
             return self.__server_error_to_raw(error)
+        elif isinstance(error, DeadlineExceededError):
+            return self.__deadline_exceeded_to_raw(error)
+        elif isinstance(error, ResourceExhaustedError):
+            return self.__resource_exhausted_to_raw(error)
         raise NotImplementedError()
 
     def __invalid_argument_to_raw(self, error: InvalidArgumentError) -> bytes:
@@ -140,6 +510,18 @@ class ProtobufConverter(BaseConverter):
         status_proto = status_pb2.Status(code=Status.INTERNAL.value, message=message)
         return cast(bytes, status_proto.SerializeToString())
 
+    def __deadline_exceeded_to_raw(self, error: DeadlineExceededError) -> bytes:
+        status_proto = status_pb2.Status(
+            code=Status.DEADLINE_EXCEEDED.value, message="Deadline exceeded."
+        )
+        return cast(bytes, status_proto.SerializeToString())
+
+    def __resource_exhausted_to_raw(self, error: ResourceExhaustedError) -> bytes:
+        status_proto = status_pb2.Status(
+            code=Status.RESOURCE_EXHAUSTED.value, message="Resource exhausted."
+        )
+        return cast(bytes, status_proto.SerializeToString())
+
     def resolve_proto(self, model_path: str) -> Type[protobuf_message.Message] | None:
         try:
             return self.protos[model_path]
@@ -147,184 +529,295 @@ class ProtobufConverter(BaseConverter):
             logger.error(f"Proto for model {model_path} not found")
             return None
 
-    def __proto_obj_to_dict(
-        self, proto_obj: protobuf_message.Message
-    ) -> dict[str, Any]:
-        model_dict: dict[str, Any] = {}
+    def _decode_eagerly(
+        self,
+        proto_obj: protobuf_message.Message,
+        model_cls: Type[ModelType],
+        trust_level: TrustLevel | None = None,
+        raw: bytes | None = None,
+    ) -> ModelType:
+        model_dict = _run_decode_plan(
+            proto_obj, self._get_decode_plan(proto_obj.DESCRIPTOR)
+        )
+        if raw is not None:
+            packed_decoders = self._get_packed_decoders(
+                model_cls, proto_obj.DESCRIPTOR
+            )
+            if packed_decoders:
+                _decode_packed_fields(raw, model_dict, packed_decoders)
+        return self.get_model_constructor(model_cls, trust_level)(model_dict)
+
+    def _get_packed_decoders(
+        self, model_cls: Type[BaseModel], descriptor: protobuf_descriptor.Descriptor
+    ) -> dict[int, tuple[str, PackedField]]:
+        try:
+            return self._packed_decoders[model_cls]
+        except KeyError:
+            pass
+
+        packed_decoders: dict[int, tuple[str, PackedField]] = {}
+        for field_name, packed_field in get_packed_fields(model_cls).items():
+            field = descriptor.fields_by_name.get(field_name)
+            if field is not None and _is_bulk_packed_field(field, packed_field):
+                packed_decoders[field.number] = (field_name, packed_field)
+        self._packed_decoders[model_cls] = packed_decoders
+        return packed_decoders
+
+    def _get_decode_plan(
+        self, descriptor: protobuf_descriptor.Descriptor
+    ) -> DecodePlan:
+        """Get decode plan of the message, build and cache it on first use.
+
+        Everything that `raw_to_model` needs to know about message fields depends only on
+        message type, so it is resolved once per message type and reused on each request.
+        """
+        try:
+            return self._decode_plans[descriptor.full_name]
+        except KeyError:
+            pass
+
+        plan: DecodePlan = []
+        # register plan before filling it, messages can reference themselves recursively
+        self._decode_plans[descriptor.full_name] = plan
+        for field in descriptor.fields:
+            plan.append(
+                _FieldDecoder(
+                    proto_name=field.name,
+                    # field in oneof: set value to oneof field
+                    model_key=(
+                        field.containing_oneof.name
+                        if field.containing_oneof is not None
+                        else field.name
+                    ),
+                    # fields with presence are skipped if they are not set
+                    has_presence=field.has_presence,
+                    decode=self._build_field_decoder(field),
+                )
+            )
+        return plan
+
+    def _build_field_decoder(
+        self, field: protobuf_descriptor.FieldDescriptor
+    ) -> ValueDecoder | None:
+        if field.type != field.TYPE_MESSAGE:
+            # scalars, enums and repeated scalars are used as is
+            return None
+
+        if field.label == field.LABEL_REPEATED:
+            # It is a repeated message or map
+            if _is_map_entry(field.message_type):
+                map_value_decoder = self.__build_value_decoder(
+                    field.message_type.fields_by_name["value"]
+                )
+                if map_value_decoder is None:
+                    return dict
+                return partial(_decode_map, value_decoder=map_value_decoder)
 
-        for field in proto_obj.DESCRIPTOR.fields:
-            # skip fields with default values
-            if not (not field.has_presence or proto_obj.HasField(field.name)):
-                continue
+            item_decoder = self.__build_value_decoder(field)
+            assert item_decoder is not None
+            return partial(_decode_repeated, item_decoder=item_decoder)
+
+        return self.__build_value_decoder(field)
+
+    def __build_value_decoder(
+        self, field: protobuf_descriptor.FieldDescriptor
+    ) -> ValueDecoder | None:
+        if field.type != field.TYPE_MESSAGE:
+            return None
+        if field.message_type.full_name == TIMESTAMP_FULL_NAME:
+            return _timestamp_to_datetime
+        # nested message: convert
+        return partial(
+            _run_decode_plan, plan=self._get_decode_plan(field.message_type)
+        )
 
+    def _get_encode_plan(self, model_cls: Type[BaseModel]) -> _EncodePlan:
+        """Get encode plan of the model class, build and cache it on first use.
+
+        Proto class of the model is resolved by its `__modapp_path__`, so one plan per model
+        class covers (model class, proto class) pair.
+        """
+        try:
+            return self._encode_plans[model_cls]
+        except KeyError:
+            pass
+
+        try:
+            proto_cls = self.protos[model_cls.__modapp_path__]
+        except KeyError:
+            raise ServerError(f"Proto for {model_cls.__modapp_path__} not found")
+
+        if model_cls.__model_config__.get("camelCase", False) is True:
+            # pydantic doesn't support changing `camelCase` option dynamically, so we need a
+            # workaround to transform camelCase back to snake case
+            plan = _EncodePlan(
+                proto_cls=proto_cls,
+                attr_names=get_camel_case_key_table(model_cls).field_names,
+            )
+        else:
+            plan = _EncodePlan(proto_cls=proto_cls)
+
+        oneof_fields: dict[
+            str, list[tuple[protobuf_descriptor.FieldDescriptor, FieldEncoder | None]]
+        ] = {}
+        for field in proto_cls.DESCRIPTOR.fields:
+            encoder = self.__build_field_encoder(field)
             if field.containing_oneof is not None:
-                # field in oneof: set value to oneof field
-                # it can be message as well, convert it if so
-                if field.type == field.TYPE_MESSAGE:
-                    model_dict[field.containing_oneof.name] = self.__proto_obj_to_dict(
-                        proto_obj.__getattribute__(field.name)
-                    )
-                else:
-                    model_dict[field.containing_oneof.name] = (
-                        proto_obj.__getattribute__(field.name)
-                    )
-            elif (
-                field.label == field.LABEL_REPEATED and field.type == field.TYPE_MESSAGE
-            ):
-                proto_map = proto_obj.__getattribute__(field.name)
-                # It is a repeated message or map
-                if hasattr(proto_map, "GetEntryClass"):
-                    # map
-                    model_dict[field.name] = {
-                        key: self.__proto_value_to_py_value(value)
-                        for key, value in proto_map.items()
-                    }
-                else:
-                    # repeated message
-                    model_dict[field.name] = [
-                        self.__proto_obj_to_dict(item) for item in proto_map
-                    ]
-            elif field.type == field.TYPE_MESSAGE:
-                if field.message_type.full_name == "google.protobuf.Timestamp":
-                    timestamp_obj = proto_obj.__getattribute__(field.name)
-                    model_dict[field.name] = datetime.fromtimestamp(
-                        timestamp_obj.seconds + (timestamp_obj.nanos / 1_000_000_000),
-                        tz=timezone.utc,
-                    )
-                else:
-                    # nested message: convert
-                    model_dict[field.name] = self.__proto_obj_to_dict(
-                        proto_obj.__getattribute__(field.name)
-                    )
+                oneof_fields.setdefault(field.containing_oneof.name, []).append(
+                    (field, encoder)
+                )
             else:
-                # e.g. repeated scalar
-                model_dict[field.name] = proto_obj.__getattribute__(field.name)
-        return model_dict
-
-    def __proto_value_to_py_value(self, value: PyValueOrProtoMessage) -> PyValue:
-        if (
-            isinstance(value, str)
-            or isinstance(value, int)
-            or isinstance(value, float)
-            or isinstance(value, bool)
-        ):
-            return value
-        elif isinstance(value, protobuf_message.Message):
-            return self.__proto_obj_to_dict(value)
-        else:
-            raise Exception(f"Unknown data type: {type(value)}")
+                plan.fields.append((field.name, encoder))
+                if encoder is not None:
+                    plan.encoders[field.name] = encoder
+        for oneof_name, fields in oneof_fields.items():
+            plan.oneofs[oneof_name] = _OneofEncoder(
+                proto_cls.DESCRIPTOR.oneofs_by_name[oneof_name], fields
+            )
+        for field_name, packed_field in get_packed_fields(model_cls).items():
+            field = proto_cls.DESCRIPTOR.fields_by_name.get(field_name)
+            if field is not None and _is_bulk_packed_field(field, packed_field):
+                plan.packed_keys[field_name] = _encode_varint(
+                    (field.number << 3) | WIRE_TYPE_LENGTH_DELIMITED
+                )
+
+        self._encode_plans[model_cls] = plan
+        return plan
+
+    def __build_field_encoder(
+        self, field: protobuf_descriptor.FieldDescriptor
+    ) -> FieldEncoder | None:
+        if field.type == field.TYPE_ENUM:
+            # python enum to integer
+            if field.label == field.LABEL_REPEATED:
+                return _encode_repeated_enum
+            return _encode_enum
+        elif field.type == field.TYPE_MESSAGE:
+            if field.message_type.full_name == TIMESTAMP_FULL_NAME:
+                return _encode_timestamp
+            elif field.label == field.LABEL_REPEATED:
+                if _is_map_entry(field.message_type):
+                    value_field = field.message_type.fields_by_name["value"]
+                    if value_field.message_type is not None:
+                        if self.direct_encode:
+                            return self.__encode_model_map
+                        return self.__encode_message_map
+                    # map with scalar values can be passed as is
+                    return None
+                # repeated with nested message
+                if self.direct_encode:
+                    return self.__encode_model_list
+                return self.__encode_message_list
+            # nested message
+            if self.direct_encode:
+                return self.__encode_model
+            return self.__dict_to_proto_obj
+        return None
+
+    def __encode_model(self, value: BaseModel, model_value: BaseModel) -> Any:
+        return self.__model_to_proto_obj(model_value)
+
+    def __encode_model_list(
+        self, value: list[BaseModel], model_items: list[BaseModel]
+    ) -> list[protobuf_message.Message]:
+        return [self.__model_to_proto_obj(item) for item in model_items]
+
+    def __encode_model_map(
+        self, value: dict[Any, BaseModel], model_map: dict[Any, BaseModel]
+    ) -> dict[Any, protobuf_message.Message]:
+        return {
+            key: self.__model_to_proto_obj(item) for (key, item) in model_map.items()
+        }
+
+    def __encode_message_list(
+        self, model_dict_items: list[dict[str, Any]], model_items: list[BaseModel]
+    ) -> list[protobuf_message.Message]:
+        return [
+            self.__dict_to_proto_obj(item_dict, model_items[idx])
+            for (idx, item_dict) in enumerate(model_dict_items)
+        ]
+
+    def __encode_message_map(
+        self,
+        model_dict_map: dict[Any, dict[str, Any]],
+        model_map: dict[Any, BaseModel],
+    ) -> dict[Any, protobuf_message.Message]:
+        return {
+            key: self.__dict_to_proto_obj(value, model_map[key])
+            for (key, value) in model_dict_map.items()
+        }
 
     def __dict_to_proto_obj(
         self,
         model_dict: dict[str, Any],
         model_obj: BaseModel,
+        packed_chunks: list[bytes] | None = None,
     ) -> protobuf_message.Message:
-        try:
-            proto_cls = self.protos[model_obj.__modapp_path__]
-        except KeyError:
-            raise ServerError(f"Proto for {model_obj.__modapp_path__} not found")
-
-        if model_obj.__model_config__.get("camelCase", False) is True:
-            # pydantic doesn't support changing `camelCase` option dynamically, so we need a
-            # workaround to transform camelCase back to snake case
-            import humps
-
-            model_dict: dict[str, Any] = {
-                humps.decamelize(key): value for key, value in model_dict.items()
-            }
-
-        # serialize 'oneof' fields
-        for oneof_name, oneof_descriptor in proto_cls.DESCRIPTOR.oneofs_by_name.items():
-            if oneof_name in model_dict:
-                try:
-                    proto_field_name = next(
-                        field.name
-                        for field in oneof_descriptor.fields
-                        if model_field_type_matches_proto_field(
-                            dict_field_value=model_dict[oneof_name],
-                            model_field_value=model_obj.__getattribute__(oneof_name),
-                            proto_field=field,
-                        )
-                    )
-                except StopIteration:
-                    raise Exception(
-                        f"Field not found in oneof {oneof_name} in message"
-                        f" {proto_cls.DESCRIPTOR.full_name} for value"
-                        f" {model_dict[oneof_name]}"
+        plan = self._encode_plans.get(type(model_obj))
+        if plan is None:
+            plan = self._get_encode_plan(type(model_obj))
+
+        proto_kwargs: dict[str, Any] = {}
+        for key, value in model_dict.items():
+            attr_name = plan.attr_names.get(key, key)
+
+            oneof_encoder = plan.oneofs.get(attr_name)
+            if oneof_encoder is not None:
+                # serialize 'oneof' fields
+                proto_field_name, encoder = oneof_encoder.resolve(
+                    value, getattr(model_obj, attr_name)
+                )
+            else:
+                proto_field_name = attr_name
+                encoder = plan.encoders.get(attr_name)
+
+            if encoder is not None:
+                value = encoder(value, getattr(model_obj, attr_name))
+            elif packed_chunks is not None and proto_field_name in plan.packed_keys:
+                if is_packed_array(value):
+                    _add_packed_chunk(
+                        packed_chunks, plan.packed_keys[proto_field_name], value
                     )
-                model_dict[proto_field_name] = model_dict[oneof_name]
-                del model_dict[oneof_name]
+                    continue
+            proto_kwargs[proto_field_name] = value
 
-        # python enum to integer
-        for field in proto_cls.DESCRIPTOR.fields:
-            if field.name not in model_dict:
+        return plan.proto_cls(**proto_kwargs)
+
+    def __model_to_proto_obj(
+        self, model_obj: BaseModel, packed_chunks: list[bytes] | None = None
+    ) -> protobuf_message.Message:
+        plan = self._encode_plans.get(type(model_obj))
+        if plan is None:
+            plan = self._get_encode_plan(type(model_obj))
+
+        proto_kwargs: dict[str, Any] = {}
+        # model attributes have the same names as proto fields, no intermediate dict and no
+        # key translation are needed
+        for field_name, encoder in plan.fields:
+            value = getattr(model_obj, field_name, None)
+            if value is None:
+                continue
+            if (
+                packed_chunks is not None
+                and field_name in plan.packed_keys
+                and is_packed_array(value)
+            ):
+                _add_packed_chunk(packed_chunks, plan.packed_keys[field_name], value)
                 continue
+            proto_kwargs[field_name] = (
+                value if encoder is None else encoder(value, value)
+            )
 
-            if field.type == field.TYPE_ENUM:
-                model_dict[field.name] = (
-                    model_dict[field.name].value
-                    if isinstance(model_dict[field.name], Enum)
-                    else model_dict[field.name]
-                )
-            elif field.type == field.TYPE_MESSAGE:
-                if field.message_type.full_name == "google.protobuf.Timestamp":
-                    datetime_value = model_dict[field.name]
-                    model_dict[field.name] = Timestamp(
-                        seconds=int(
-                            datetime_value.replace(tzinfo=timezone.utc).timestamp()
-                        ),
-                        nanos=datetime_value.microsecond * 1000,
-                    )
-                elif field.label == field.LABEL_REPEATED:
-                    # maps with messages as values in proto descriptor are repeated messages with
-                    # automatically generated name <FieldNamePascal>Entry. This name cannot be used
-                    # for own messages, so it is unambiguous identifier of a map. At the same time
-                    # it means user cannot create own repeated list of messages with such pattern
-                    # in the name and (key, value) fields inside.
-                    if (
-                        field.message_type.name
-                        == f"{field.camelcase_name[0].upper()}{field.camelcase_name[1:]}Entry"
-                    ):
-                        map_proto_type = field.message_type
-                        if (
-                            "key" in map_proto_type.fields_by_name
-                            and "value" in map_proto_type.fields_by_name
-                        ):
-                            value_message_type = map_proto_type.fields_by_name["value"]
-                            if value_message_type.message_type is not None:
-                                model_dict[field.name] = {
-                                    key: self.__dict_to_proto_obj(
-                                        model_dict=value,
-                                        model_obj=model_obj.__getattribute__(
-                                            field.name
-                                        )[key],
-                                    )
-                                    for (key, value) in model_dict[field.name].items()
-                                }
-                    else:
-                        # repeated with nested message
-                        # value_proto_type_identifier = field.message_type.full_name
-                        model_dict[field.name] = [
-                            self.__dict_to_proto_obj(
-                                model_dict=item_dict,
-                                model_obj=model_obj.__getattribute__(field.name)[idx],
-                                # modapp_path=value_proto_type_identifier,
-                            )
-                            for (idx, item_dict) in enumerate(model_dict[field.name])
-                        ]
-                else:
-                    # nested message
-                    field_name_in_obj = (
-                        field.containing_oneof.name
-                        if field.containing_oneof is not None
-                        else field.name
-                    )
-                    model_dict[field.name] = self.__dict_to_proto_obj(
-                        model_dict=model_dict[field.name],
-                        model_obj=model_obj.__getattribute__(field_name_in_obj),
-                    )
+        for oneof_name, oneof_encoder in plan.oneofs.items():
+            value = getattr(model_obj, oneof_name, None)
+            if value is None:
+                continue
+            proto_field_name, encoder = oneof_encoder.resolve(value, value)
+            proto_kwargs[proto_field_name] = (
+                value if encoder is None else encoder(value, value)
+            )
 
-        return proto_cls(**model_dict)
+        return plan.proto_cls(**proto_kwargs)
 
 
 __all__ = ["ProtobufConverter"]
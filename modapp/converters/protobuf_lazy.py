@@ -0,0 +1,263 @@
+"""Lazily decoded models backed by parsed protobuf messages.
+
+Lazy model view is an instance of dynamically created subclass of the model class. It wraps parsed
+proto message and decodes and validates each field only on first access to it. Nested messages are
+wrapped in lazy views as well, so that handlers which only forward big nested payloads don't pay
+for their conversion.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Type, cast
+
+import google.protobuf.descriptor as protobuf_descriptor
+from google.protobuf import message as protobuf_message
+from typing_extensions import override
+
+from modapp.base_model import BaseModel, ModelField, ModelType
+from modapp.errors import InvalidArgumentError
+from modapp.model_utils import find_model_classes
+from modapp.models.pydantic import PydanticModel
+
+if TYPE_CHECKING:
+    from modapp.base_converter import TrustLevel
+
+    from .protobuf import ProtobufConverter, ValueDecoder
+
+
+ProtoFieldLoader = Callable[[protobuf_message.Message], Any]
+
+
+class LazyProtoModelMixin:
+    __slots__ = ()
+
+    __modapp_model_cls__: ClassVar[Type[BaseModel]]
+    __modapp_lazy_fields__: ClassVar[tuple[str, ...]]
+    __modapp_proto__: protobuf_message.Message
+
+    def modapp_materialize(self) -> None:
+        """Decode all fields including fields of nested models, which were not accessed yet."""
+        for field_name in self.__modapp_lazy_fields__:
+            _materialize_value(getattr(self, field_name))
+
+    def to_dict(self) -> dict[str, Any]:
+        self.modapp_materialize()
+        return cast(dict[str, Any], super().to_dict())  # type: ignore[misc]
+
+    @override
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, self.__modapp_model_cls__):
+            return NotImplemented
+        return all(
+            getattr(self, field_name) == getattr(other, field_name)
+            for field_name in self.__modapp_lazy_fields__
+        )
+
+    def __repr_args__(self) -> Any:
+        # pydantic builds repr from instance `__dict__`
+        self.modapp_materialize()
+        return super().__repr_args__()  # type: ignore[misc]
+
+
+class _LazyField:
+    """Non-data descriptor: after first access value is stored in instance `__dict__` and
+    next accesses don't call descriptor anymore."""
+
+    __slots__ = ("name", "load")
+
+    def __init__(self, name: str, load: ProtoFieldLoader) -> None:
+        self.name = name
+        self.load = load
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        if instance is None:
+            return self
+        value = instance.__modapp_model_cls__.validate_field_value(
+            instance, self.name, self.load(instance.__modapp_proto__)
+        )
+        instance.__dict__[self.name] = value
+        return value
+
+
+class LazyModelFactory:
+    def __init__(self, converter: ProtobufConverter) -> None:
+        self.converter = converter
+        # None if model class doesn't support lazy views
+        self._lazy_classes: dict[type, type | None] = {}
+
+    def create(
+        self,
+        model_cls: Type[ModelType],
+        proto_obj: protobuf_message.Message,
+        trust_level: TrustLevel | None = None,
+    ) -> ModelType:
+        try:
+            lazy_cls = self._lazy_classes[model_cls]
+        except KeyError:
+            lazy_cls = self.__build_lazy_cls(model_cls, proto_obj.DESCRIPTOR)
+
+        if lazy_cls is None:
+            return self.converter._decode_eagerly(proto_obj, model_cls, trust_level)
+
+        model_view: object = object.__new__(lazy_cls)
+        if issubclass(model_cls, PydanticModel):
+            object.__setattr__(
+                model_view, "__pydantic_fields_set__", set(model_cls.model_fields)
+            )
+            object.__setattr__(model_view, "__pydantic_extra__", None)
+            object.__setattr__(model_view, "__pydantic_private__", None)
+        object.__setattr__(model_view, "__modapp_proto__", proto_obj)
+        return cast(ModelType, model_view)
+
+    def __build_lazy_cls(
+        self, model_cls: Type[BaseModel], descriptor: protobuf_descriptor.Descriptor
+    ) -> type | None:
+        if issubclass(model_cls, PydanticModel) and model_cls.model_config.get(
+            "frozen", False
+        ):
+            # field values of frozen pydantic models cannot be validated one by one
+            self._lazy_classes[model_cls] = None
+            return None
+
+        model_fields = model_cls.get_model_fields()
+        slots: tuple[str, ...] = ("__modapp_proto__",)
+        if model_cls.__dictoffset__ == 0:
+            # slotted model: decoded values are stored in `__dict__`
+            slots += ("__dict__",)
+        lazy_cls = type(
+            f"Lazy{model_cls.__name__}",
+            (LazyProtoModelMixin, model_cls),
+            {
+                "__module__": model_cls.__module__,
+                "__qualname__": f"Lazy{model_cls.__qualname__}",
+                "__slots__": slots,
+                "__modapp_model_cls__": model_cls,
+                "__modapp_lazy_fields__": tuple(model_fields.keys()),
+                # defining __eq__ in mixin resets __hash__
+                "__hash__": model_cls.__hash__,
+            },
+        )
+        # register class before building loaders, models can reference themselves recursively
+        self._lazy_classes[model_cls] = lazy_cls
+
+        for field_name, model_field in model_fields.items():
+            # set fields after class creation, pydantic would consider them as field defaults
+            setattr(
+                lazy_cls,
+                field_name,
+                _LazyField(
+                    field_name, self.__build_field_loader(model_field, descriptor)
+                ),
+            )
+        return lazy_cls
+
+    def __build_field_loader(
+        self, model_field: ModelField, descriptor: protobuf_descriptor.Descriptor
+    ) -> ProtoFieldLoader:
+        field_name = model_field.name
+
+        if field_name in descriptor.oneofs_by_name:
+            value_loaders = {
+                field.name: self.__build_value_loader(field, model_field)
+                for field in descriptor.oneofs_by_name[field_name].fields
+            }
+
+            def load_oneof(proto_obj: protobuf_message.Message) -> Any:
+                proto_field_name = proto_obj.WhichOneof(field_name)
+                if proto_field_name is None:
+                    return _get_default(model_field)
+                return value_loaders[proto_field_name](
+                    getattr(proto_obj, proto_field_name)
+                )
+
+            return load_oneof
+
+        if field_name in descriptor.fields_by_name:
+            field = descriptor.fields_by_name[field_name]
+            value_loader = self.__build_value_loader(field, model_field)
+
+            if field.has_presence:
+
+                def load_field_with_presence(
+                    proto_obj: protobuf_message.Message,
+                ) -> Any:
+                    if not proto_obj.HasField(field_name):
+                        return _get_default(model_field)
+                    return value_loader(getattr(proto_obj, field_name))
+
+                return load_field_with_presence
+
+            def load_field(proto_obj: protobuf_message.Message) -> Any:
+                return value_loader(getattr(proto_obj, field_name))
+
+            return load_field
+
+        # model field is not in proto
+        def load_default(proto_obj: protobuf_message.Message) -> Any:
+            return _get_default(model_field)
+
+        return load_default
+
+    def __build_value_loader(
+        self, field: protobuf_descriptor.FieldDescriptor, model_field: ModelField
+    ) -> ValueDecoder:
+        model_cls_by_path = {
+            model_cls.__modapp_path__: model_cls
+            for model_cls in find_model_classes(model_field.annotation)
+            if hasattr(model_cls, "__modapp_path__")
+        }
+        message_type = field.message_type
+        if field.label == field.LABEL_REPEATED and message_type is not None:
+            if message_type.GetOptions().map_entry:
+                message_type = message_type.fields_by_name["value"].message_type
+                value_cls = (
+                    model_cls_by_path.get(message_type.full_name)
+                    if message_type is not None
+                    else None
+                )
+                if value_cls is not None:
+                    return lambda proto_map: {
+                        key: self.create(value_cls, value)
+                        for key, value in proto_map.items()
+                    }
+            else:
+                item_cls = model_cls_by_path.get(message_type.full_name)
+                if item_cls is not None:
+                    return lambda items: [self.create(item_cls, item) for item in items]
+        elif message_type is not None:
+            nested_cls = model_cls_by_path.get(message_type.full_name)
+            if nested_cls is not None:
+                return lambda value: self.create(nested_cls, value)
+
+        # not a model: decode value completely
+        decoder = self.converter._build_field_decoder(field)
+        if decoder is not None:
+            return decoder
+        if field.label == field.LABEL_REPEATED:
+            # don't expose proto containers, they are bound to the message
+            return list
+        return _identity
+
+
+def _materialize_value(value: Any) -> None:
+    if isinstance(value, LazyProtoModelMixin):
+        value.modapp_materialize()
+    elif isinstance(value, list):
+        for item in value:
+            _materialize_value(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _materialize_value(item)
+
+
+def _get_default(model_field: ModelField) -> Any:
+    if model_field.required:
+        raise InvalidArgumentError({model_field.name: "Field required"})
+    return model_field.get_default()
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+__all__ = ["LazyProtoModelMixin", "LazyModelFactory"]
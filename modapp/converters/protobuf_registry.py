@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import importlib
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Type
+
+from google.protobuf import descriptor_pool, message_factory
+from google.protobuf import message as protobuf_message
+from loguru import logger
+from typing_extensions import override
+
+
+class LazyProtoRegistry(Mapping[str, Type[protobuf_message.Message]]):
+    """Proto classes by full name, resolved on first use.
+
+    Can be passed to `ProtobufConverter` instead of dict with all proto classes, so that
+    generated modules are imported only when messages from them are converted.
+
+    Message is resolved in the following order:
+    1. Module from `modules` mapping is imported. Keys are full names of messages or proto
+       packages, the most specific key is used.
+    2. Message is searched in descriptor pool. It contains all messages from already imported
+       modules.
+    """
+
+    def __init__(
+        self,
+        modules: Mapping[str, str] | None = None,
+        pool: descriptor_pool.DescriptorPool | None = None,
+        preload: Iterable[str] = (),
+    ) -> None:
+        """Create lazy proto registry.
+
+        Args:
+            modules (Mapping[str, str] | None, optional): names of generated python modules
+                by full names of messages or packages, e.g.
+                `{"myservice.v1": "myservice.v1.api_pb2"}`. Defaults to None.
+            pool (descriptor_pool.DescriptorPool | None, optional): descriptor pool to search
+                messages in. Defaults to the default pool, to which generated modules are
+                added.
+            preload (Iterable[str], optional): full names of messages to resolve right away,
+                e.g. messages of hot routes. Defaults to ().
+        """
+        self.modules: dict[str, str] = dict(modules) if modules is not None else {}
+        self.pool = pool if pool is not None else descriptor_pool.Default()
+        self._resolved_protos: dict[str, Type[protobuf_message.Message]] = {}
+
+        for full_name in preload:
+            self[full_name]
+
+    @override
+    def __getitem__(self, full_name: str) -> Type[protobuf_message.Message]:
+        try:
+            return self._resolved_protos[full_name]
+        except KeyError:
+            pass
+
+        proto_cls = self.__resolve(full_name)
+        self._resolved_protos[full_name] = proto_cls
+        return proto_cls
+
+    @override
+    def __iter__(self) -> Iterator[str]:
+        # only already resolved protos are known
+        return iter(self._resolved_protos)
+
+    @override
+    def __len__(self) -> int:
+        return len(self._resolved_protos)
+
+    @override
+    def __contains__(self, full_name: object) -> bool:
+        if not isinstance(full_name, str):
+            return False
+        try:
+            self[full_name]
+        except KeyError:
+            return False
+        return True
+
+    def __resolve(self, full_name: str) -> Type[protobuf_message.Message]:
+        module_name = self.__find_module_name(full_name)
+        if module_name is not None:
+            logger.trace(f"Import module {module_name} for proto {full_name}")
+            try:
+                importlib.import_module(module_name)
+            except ImportError as error:
+                logger.error(f"Failed to import module of proto {full_name}: {error}")
+                raise KeyError(full_name) from error
+
+        # KeyError if message is not found
+        message_descriptor = self.pool.FindMessageTypeByName(full_name)
+        return message_factory.GetMessageClass(message_descriptor)
+
+    def __find_module_name(self, full_name: str) -> str | None:
+        name_prefix = full_name
+        while True:
+            module_name = self.modules.get(name_prefix)
+            if module_name is not None:
+                return module_name
+            if "." not in name_prefix:
+                return None
+            name_prefix = name_prefix.rsplit(".", maxsplit=1)[0]
+
+
+__all__ = ["LazyProtoRegistry"]
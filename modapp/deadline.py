@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import re
+import time
+from contextvars import ContextVar
+
+from loguru import logger
+from typing_extensions import override
+
+# header with timeout of request in web transports, value has the same format as
+# `grpc-timeout` header in gRPC, e.g. `500m` for 500 milliseconds
+TIMEOUT_HEADER = "Request-Timeout"
+
+_TIMEOUT_RE = re.compile(r"^(\d{1,8})([HMSmun])$")
+_TIMEOUT_UNITS = {
+    "H": 60 * 60,
+    "M": 60,
+    "S": 1,
+    "m": 10**-3,
+    "u": 10**-6,
+    "n": 10**-9,
+}
+
+
+class Deadline:
+    """Point in time after which client doesn't wait for reply on request anymore."""
+
+    __slots__ = ("time",)
+
+    def __init__(self, time: float) -> None:
+        """Create deadline.
+
+        Args:
+            time (float): time of deadline by `time.monotonic` clock.
+        """
+        self.time = time
+
+    @classmethod
+    def from_timeout(cls, timeout: float) -> Deadline:
+        return cls(time.monotonic() + timeout)
+
+    def time_remaining(self) -> float:
+        """Time until deadline in seconds, 0 if deadline is expired."""
+        return max(0.0, self.time - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.time
+
+    @override
+    def __repr__(self) -> str:
+        return f"Deadline(time_remaining={self.time_remaining():.3f})"
+
+
+def encode_timeout(timeout: float) -> str:
+    """Encode timeout in seconds in format of `grpc-timeout` header."""
+    if timeout > 10:
+        return f"{int(timeout)}S"
+    elif timeout > 0.01:
+        return f"{int(timeout * 10**3)}m"
+    elif timeout > 0.00001:
+        return f"{int(timeout * 10**6)}u"
+    return f"{max(0, int(timeout * 10**9))}n"
+
+
+def decode_timeout(value: str) -> float:
+    """Decode timeout in format of `grpc-timeout` header to seconds.
+
+    Raises:
+        ValueError: value has invalid format.
+    """
+    match = _TIMEOUT_RE.match(value)
+    if match is None:
+        raise ValueError(f"Invalid timeout: {value}")
+    timeout, unit = match.groups()
+    return int(timeout) * _TIMEOUT_UNITS[unit]
+
+
+def deadline_from_header(value: str | None) -> Deadline | None:
+    """Get deadline of request from value of timeout header, None if there is no valid
+    timeout."""
+    if value is None:
+        return None
+    try:
+        return Deadline.from_timeout(decode_timeout(value))
+    except ValueError:
+        logger.warning(f"Invalid value of {TIMEOUT_HEADER} header: '{value}', ignore it")
+        return None
+
+
+_current_deadline: ContextVar[Deadline | None] = ContextVar(
+    "modapp_deadline", default=None
+)
+
+
+def get_deadline() -> Deadline | None:
+    """Get deadline of the current request, None if client has no timeout.
+
+    It is available in handlers and dependencies directly or as dependency:
+    `deadline: Deadline | None = Depends(get_deadline)`.
+    """
+    return _current_deadline.get()
+
+
+__all__ = [
+    "TIMEOUT_HEADER",
+    "Deadline",
+    "encode_timeout",
+    "decode_timeout",
+    "deadline_from_header",
+    "get_deadline",
+]
@@ -1,11 +1,30 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Callable, Coroutine
+import asyncio
+from contextlib import (
+    AbstractAsyncContextManager,
+    AbstractContextManager,
+    AsyncExitStack,
+    asynccontextmanager,
+    contextmanager,
+)
+from inspect import (
+    Parameter,
+    isasyncgenfunction,
+    iscoroutinefunction,
+    isgeneratorfunction,
+    signature,
+)
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Coroutine, NamedTuple
 
-if TYPE_CHECKING:
-    from typing import Sequence, Type
+from typing_extensions import override
+
+from .background.concurrency import run_in_request_thread
+from .params import Depends, Meta
 
-    from .params import Depends
+if TYPE_CHECKING:
+    from types import TracebackType
+    from typing import Mapping, Sequence, Type
 
 
 DependencyOverrides = dict[Callable[..., Any], Callable[..., Any]]
@@ -18,20 +37,443 @@ class Dependant:
         callable: DependencyFunc,
         name: str | None = None,
         dependencies: Sequence[Dependant] | None = None,
+        use_cache: bool = True,
+        meta_names: Sequence[str] | None = None,
     ) -> None:
         self.callable = callable
         self.name = name
         self.dependencies = dependencies
+        # False: dependency is solved separately for each dependant instead of being shared
+        # in request
+        self.use_cache = use_cache
+        # names of arguments with values from request metadata
+        self.meta_names = meta_names
 
     @classmethod
     def from_depends_list(
         cls: Type[Dependant],
         callable: DependencyFunc,
         depends_map: dict[str, Depends],
+        dependency_overrides: DependencyOverrides | None = None,
     ) -> Dependant:
         return cls(
             callable=callable,
             dependencies=[
-                Dependant(dep.dependency, name) for name, dep in depends_map.items()
+                cls.from_depends(name, dep, dependency_overrides)
+                for name, dep in depends_map.items()
             ],
         )
+
+    @classmethod
+    def from_depends(
+        cls: Type[Dependant],
+        name: str,
+        depends: Depends,
+        dependency_overrides: DependencyOverrides | None = None,
+        _dependency_path: tuple[DependencyFunc, ...] = (),
+    ) -> Dependant:
+        """Create dependant with sub-dependencies from arguments of dependency function.
+
+        Args:
+            name (str): name of argument of dependant which gets value of dependency.
+            depends (Depends): dependency declaration.
+            dependency_overrides (DependencyOverrides | None, optional): overrides of
+                dependency functions, they are applied to sub-dependencies as well. Defaults
+                to None.
+
+        Raises:
+            TypeError: dependency function has argument without value or dependencies are
+                cyclic.
+        """
+        dependency = depends.dependency
+        if dependency_overrides is not None:
+            dependency = dependency_overrides.get(dependency, dependency)
+        if dependency in _dependency_path:
+            raise TypeError(f"Cyclic dependency {dependency}")
+        dependency_path = (*_dependency_path, dependency)
+
+        sub_dependencies: list[Dependant] = []
+        meta_names: list[str] = []
+        for parameter_name, parameter in signature(dependency).parameters.items():
+            if isinstance(parameter.default, Depends):
+                sub_dependencies.append(
+                    cls.from_depends(
+                        parameter_name,
+                        parameter.default,
+                        dependency_overrides,
+                        dependency_path,
+                    )
+                )
+            elif isinstance(parameter.default, Meta):
+                meta_names.append(parameter_name)
+            elif parameter.default is Parameter.empty and parameter.kind not in (
+                Parameter.VAR_POSITIONAL,
+                Parameter.VAR_KEYWORD,
+            ):
+                raise TypeError(
+                    f"Argument '{parameter_name}' of dependency {dependency} has neither"
+                    " Depends nor Meta nor default value"
+                )
+
+        return cls(
+            callable=dependency,
+            name=name,
+            dependencies=sub_dependencies,
+            use_cache=depends.use_cache,
+            meta_names=meta_names,
+        )
+
+
+class _DependencyNode(NamedTuple):
+    callable: DependencyFunc
+    # (argument name, index of dependency node)
+    dependency_args: tuple[tuple[str, int], ...]
+    meta_names: tuple[str, ...]
+    is_async: bool
+
+
+class DependencyPlan:
+    """Dependencies of handler flattened to nodes, each of them is solved once per request.
+
+    Cached dependencies (`use_cache=True`, default) used by several dependants share one
+    node, so that they are entered once per request and the same value is passed to all
+    dependants. Dependencies with `use_cache=False` get own node for each dependant.
+
+    Nodes are grouped in levels: dependencies of a node are in previous levels. Levels are
+    entered one by one, so that dependencies are exited after their dependants, async
+    dependencies of the same level are independent and are entered concurrently.
+    """
+
+    def __init__(
+        self,
+        dependant: Dependant,
+        scoped_values: Mapping[DependencyFunc, Any] | None = None,
+        sync_in_threadpool: bool = False,
+    ) -> None:
+        """Create plan of solving dependencies.
+
+        Args:
+            dependant (Dependant): dependant with dependencies to solve, e.g. handler.
+            scoped_values (Mapping[DependencyFunc, Any] | None, optional): values of
+                dependencies which are solved already in a wider scope, e.g. application
+                dependencies. They and their dependencies are not entered per request.
+                Defaults to None.
+            sync_in_threadpool (bool, optional): enter sync dependencies in worker thread
+                of request instead of event loop, see `WorkerThreads`. Defaults to False.
+        """
+        self.sync_in_threadpool = sync_in_threadpool
+        self.nodes: list[_DependencyNode] = []
+        # -1 for scoped nodes, they are not entered
+        node_levels: list[int] = []
+        cached_nodes: dict[DependencyFunc, int] = {}
+        # values of scoped nodes, list of values of request is copied from it
+        self.initial_values: list[Any] = []
+
+        def add_node(dependant: Dependant) -> int:
+            if dependant.use_cache and dependant.callable in cached_nodes:
+                return cached_nodes[dependant.callable]
+
+            if scoped_values is not None and dependant.callable in scoped_values:
+                self.nodes.append(
+                    _DependencyNode(
+                        callable=dependant.callable,
+                        dependency_args=(),
+                        meta_names=(),
+                        is_async=False,
+                    )
+                )
+                node_levels.append(-1)
+                self.initial_values.append(scoped_values[dependant.callable])
+                cached_nodes[dependant.callable] = len(self.nodes) - 1
+                return len(self.nodes) - 1
+
+            dependency_args = tuple(
+                (str(sub_dependant.name), add_node(sub_dependant))
+                for sub_dependant in dependant.dependencies or ()
+            )
+            node_levels.append(
+                max((node_levels[index] + 1 for _, index in dependency_args), default=0)
+            )
+            self.nodes.append(
+                _DependencyNode(
+                    callable=dependant.callable,
+                    dependency_args=dependency_args,
+                    meta_names=tuple(dependant.meta_names or ()),
+                    is_async=isasyncgenfunction(dependant.callable)
+                    or iscoroutinefunction(dependant.callable),
+                )
+            )
+            self.initial_values.append(None)
+            node_index = len(self.nodes) - 1
+            if dependant.use_cache:
+                cached_nodes[dependant.callable] = node_index
+            return node_index
+
+        # (argument name of handler, index of dependency node)
+        self.handler_args: tuple[tuple[str, int], ...] = tuple(
+            (str(sub_dependant.name), add_node(sub_dependant))
+            for sub_dependant in dependant.dependencies or ()
+        )
+
+        # (indexes of sync nodes, indexes of async nodes) by level
+        levels: list[tuple[list[int], list[int]]] = [
+            ([], []) for _ in range(max(node_levels, default=-1) + 1)
+        ]
+        for node_index, node in enumerate(self.nodes):
+            if node_levels[node_index] >= 0:
+                levels[node_levels[node_index]][int(node.is_async)].append(node_index)
+        self.levels: tuple[tuple[tuple[int, ...], tuple[int, ...]], ...] = tuple(
+            (tuple(sync_nodes), tuple(async_nodes)) for sync_nodes, async_nodes in levels
+        )
+        self.has_sync_nodes = any(sync_nodes for sync_nodes, _ in self.levels)
+
+    async def solve(
+        self, meta: Mapping[str, Any], stack: AsyncExitStack
+    ) -> dict[str, Any]:
+        """Enter dependencies and get values of handler arguments.
+
+        Args:
+            meta (Mapping[str, Any]): metadata of request.
+            stack (AsyncExitStack): stack of request, dependencies are exited on its close.
+        """
+        # per-request cache: value of each node, node of cached dependency is shared by all
+        # its dependants
+        values = self.initial_values.copy()
+        for sync_nodes, async_nodes in self.levels:
+            for node_index in sync_nodes:
+                node = self.nodes[node_index]
+                dependency_kwargs = self._get_dependency_kwargs(node, values, meta)
+                if not self.sync_in_threadpool:
+                    if isgeneratorfunction(node.callable):
+                        values[node_index] = stack.enter_context(
+                            contextmanager(node.callable)(**dependency_kwargs)
+                        )
+                    else:
+                        values[node_index] = node.callable(**dependency_kwargs)  # type: ignore
+                elif isgeneratorfunction(node.callable):
+                    values[node_index] = await _enter_context_in_threadpool(
+                        contextmanager(node.callable)(**dependency_kwargs), stack
+                    )
+                else:
+                    values[node_index] = await run_in_request_thread(
+                        node.callable, **dependency_kwargs  # type: ignore
+                    )
+
+            if len(async_nodes) == 1:
+                node_index = async_nodes[0]
+                values[node_index] = await stack.enter_async_context(
+                    self._get_async_context(self.nodes[node_index], values, meta)
+                )
+            elif len(async_nodes) > 1:
+                level_values = await enter_async_contexts_concurrently(
+                    [
+                        self._get_async_context(self.nodes[node_index], values, meta)
+                        for node_index in async_nodes
+                    ],
+                    stack,
+                )
+                for node_index, value in zip(async_nodes, level_values):
+                    values[node_index] = value
+
+        return {name: values[node_index] for name, node_index in self.handler_args}
+
+    @staticmethod
+    def _get_dependency_kwargs(
+        node: _DependencyNode, values: list[Any], meta: Mapping[str, Any]
+    ) -> dict[str, Any]:
+        dependency_kwargs = {name: values[index] for name, index in node.dependency_args}
+        for meta_name in node.meta_names:
+            try:
+                dependency_kwargs[meta_name] = meta[meta_name]
+            except KeyError as error:
+                raise Exception(error)  # TODO: correct exception
+        return dependency_kwargs
+
+    @classmethod
+    def _get_async_context(
+        cls, node: _DependencyNode, values: list[Any], meta: Mapping[str, Any]
+    ) -> AbstractAsyncContextManager[Any]:
+        dependency_kwargs = cls._get_dependency_kwargs(node, values, meta)
+        assert callable(node.callable)
+        if isasyncgenfunction(node.callable):
+            return asynccontextmanager(node.callable)(**dependency_kwargs)
+        return _CoroutineFunctionContext(node.callable, dependency_kwargs)
+
+
+class AppDependencyScope:
+    """Application dependencies: they are entered once on application start, shared by all
+    requests and exited on application stop, e.g. connection pools or HTTP sessions.
+
+    Handlers and request dependencies get them with `Depends` like request dependencies.
+    """
+
+    def __init__(
+        self,
+        dependencies: Sequence[DependencyFunc],
+        dependency_overrides: DependencyOverrides | None = None,
+    ) -> None:
+        """Create application dependency scope.
+
+        Args:
+            dependencies (Sequence[DependencyFunc]): dependency functions, they can depend on
+                other dependencies, but not on request metadata.
+            dependency_overrides (DependencyOverrides | None, optional): overrides of
+                dependency functions. Defaults to None.
+        """
+        self.dependency_overrides = dependency_overrides
+        dependants: list[Dependant] = []
+        for index, dependency in enumerate(dependencies):
+            if not callable(dependency):
+                raise TypeError(f"Application dependency should be callable: {dependency}")
+            dependants.append(
+                Dependant.from_depends(
+                    f"dependency_{index}", Depends(dependency), dependency_overrides
+                )
+            )
+        self.dependant = Dependant(callable=type(self), dependencies=dependants)
+        # values by dependency function, both declared and overridden one
+        self.values: dict[DependencyFunc, Any] = {}
+        self._stack: AsyncExitStack | None = None
+
+    async def enter(self) -> None:
+        if self._stack is not None:
+            raise RuntimeError("Application dependencies are entered already")
+
+        stack = AsyncExitStack()
+        plan = DependencyPlan(self.dependant)
+        try:
+            values = await plan.solve({}, stack)
+        except BaseException:
+            await stack.aclose()
+            raise
+        self._stack = stack
+
+        for name, node_index in plan.handler_args:
+            self.values[plan.nodes[node_index].callable] = values[name]
+        if self.dependency_overrides is not None:
+            for dependency, override_func in self.dependency_overrides.items():
+                if override_func in self.values:
+                    self.values[dependency] = self.values[override_func]
+
+    async def close(self) -> None:
+        self.values = {}
+        if self._stack is not None:
+            stack = self._stack
+            self._stack = None
+            await stack.aclose()
+
+
+class _CoroutineFunctionContext(AbstractAsyncContextManager[Any]):
+    """Context of async dependency function without teardown."""
+
+    def __init__(
+        self,
+        function: Callable[..., Awaitable[Any]],
+        kwargs: dict[str, Any],
+    ) -> None:
+        self.function = function
+        self.kwargs = kwargs
+
+    @override
+    async def __aenter__(self) -> Any:
+        return await self.function(**self.kwargs)
+
+    @override
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+
+async def _enter_context_in_threadpool(
+    context_manager: AbstractContextManager[Any], stack: AsyncExitStack
+) -> Any:
+    # enter and exit run in the same thread, if request has leased one
+    value = await run_in_request_thread(context_manager.__enter__)
+
+    async def exit_in_threadpool(
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> bool | None:
+        return await run_in_request_thread(
+            context_manager.__exit__, exc_type, exc, traceback
+        )
+
+    stack.push_async_exit(exit_in_threadpool)
+    return value
+
+
+async def enter_async_contexts_concurrently(
+    context_managers: Sequence[AbstractAsyncContextManager[Any]], stack: AsyncExitStack
+) -> list[Any]:
+    """Enter independent async context managers concurrently and push them to the stack in
+    the given order, so that they are exited in reverse order like entered one by one.
+
+    If some of them fail to enter, successfully entered ones are still pushed to the stack and
+    are exited on its close, then the first error in the given order is raised. Each context
+    manager is entered and exited in its own task, so that e.g. cancel scopes opened on enter
+    can be closed on exit. Context variables set on enter are not visible to the caller.
+    """
+    contexts = [_ContextInTask(context_manager) for context_manager in context_managers]
+    entered_futures = [context.entered for context in contexts]
+    try:
+        await asyncio.wait(entered_futures)
+    except BaseException:
+        # e.g. request is cancelled: stop entering, but exit already entered ones
+        for context in contexts:
+            if not context.entered.done():
+                context.task.cancel()
+        await asyncio.gather(*entered_futures, return_exceptions=True)
+        _push_entered_contexts(contexts, stack)
+        raise
+
+    _push_entered_contexts(contexts, stack)
+    errors = [
+        asyncio.CancelledError() if future.cancelled() else future.exception()
+        for future in entered_futures
+    ]
+    for error in errors:
+        if error is not None:
+            raise error
+    return [future.result() for future in entered_futures]
+
+
+class _ContextInTask:
+    """Async context manager entered and exited in a separate task, which waits for exit
+    after enter."""
+
+    def __init__(self, context_manager: AbstractAsyncContextManager[Any]) -> None:
+        loop = asyncio.get_running_loop()
+        self.context_manager = context_manager
+        self.entered: asyncio.Future[Any] = loop.create_future()
+        self._exit_info: asyncio.Future[
+            tuple[type[BaseException] | None, BaseException | None, TracebackType | None]
+        ] = loop.create_future()
+        self.task = loop.create_task(self._run())
+
+    async def _run(self) -> bool | None:
+        try:
+            value = await self.context_manager.__aenter__()
+        except asyncio.CancelledError:
+            self.entered.cancel()
+            raise
+        except BaseException as error:
+            self.entered.set_exception(error)
+            return None
+        self.entered.set_result(value)
+        exc_type, exc, traceback = await self._exit_info
+        return await self.context_manager.__aexit__(exc_type, exc, traceback)
+
+    async def exit(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> bool | None:
+        self._exit_info.set_result((exc_type, exc, traceback))
+        return await self.task
+
+
+def _push_entered_contexts(contexts: Sequence[_ContextInTask], stack: AsyncExitStack) -> None:
+    for context in contexts:
+        if not context.entered.cancelled() and context.entered.exception() is None:
+            stack.push_async_exit(context.exit)
@@ -0,0 +1,152 @@
+"""Cache of encoded immutable models.
+
+Immutable shared replies, e.g. configuration snapshots or state broadcasted to many stream
+subscribers, are encoded only once per converter. Caching is opt-in per model class:
+
+    @dataclass(frozen=True)
+    class ConfigSnapshot(DataclassModel):
+        version: int
+        flags: tuple[str, ...]
+
+        __model_config__ = {"cacheEncoded": True}
+
+Encoded bytes are reused only for the same model instance and the same converter. Model classes
+which are not deeply immutable (not frozen or having fields with mutable values like lists) are
+never cached, even if they opt in, because their encoded bytes could become outdated.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import inspect
+from collections import OrderedDict
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple, Type, get_args, get_origin
+
+from loguru import logger
+
+from .base_model import BaseModel
+from .model_utils import _IMMUTABLE_TYPES, _UNION_TYPES
+
+if TYPE_CHECKING:
+    from typing import Sequence
+
+    from .base_converter import BaseConverter
+
+
+_cacheable_model_classes: dict[type, bool] = {}
+
+
+class _CacheEntry(NamedTuple):
+    # references keep ids in the key valid while entry is in cache
+    model: BaseModel
+    converter: BaseConverter
+    raw: bytes
+
+
+class EncodedModelCache:
+    """LRU cache of encoded models, bounded by total size of encoded bytes."""
+
+    def __init__(self, max_size_bytes: int) -> None:
+        self.max_size_bytes = max_size_bytes
+        self.size_bytes = 0
+        self._entries: OrderedDict[tuple[int, int], _CacheEntry] = OrderedDict()
+
+    def model_to_raw(self, converter: BaseConverter, model: BaseModel) -> bytes:
+        """Encode model with converter, reuse already encoded bytes of cacheable models."""
+        if not is_model_cacheable(type(model)):
+            return converter.model_to_raw(model)
+
+        key = (id(model), id(converter))
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry.raw
+
+        raw = converter.model_to_raw(model)
+        if len(raw) <= self.max_size_bytes:
+            self._entries[key] = _CacheEntry(model=model, converter=converter, raw=raw)
+            self.size_bytes += len(raw)
+            while self.size_bytes > self.max_size_bytes:
+                _, evicted_entry = self._entries.popitem(last=False)
+                self.size_bytes -= len(evicted_entry.raw)
+        return raw
+
+    def models_to_raw_many(
+        self, converter: BaseConverter, models: Sequence[BaseModel]
+    ) -> list[bytes]:
+        if any(is_model_cacheable(type(model)) for model in models):
+            return [self.model_to_raw(converter, model) for model in models]
+        return converter.models_to_raw_many(models)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size_bytes = 0
+
+
+def is_model_cacheable(model_cls: Type[BaseModel]) -> bool:
+    """Check whether encoded bytes of model instances can be cached: model class opted in with
+    `cacheEncoded` option and it is deeply immutable. Result is computed once per class."""
+    try:
+        return _cacheable_model_classes[model_cls]
+    except KeyError:
+        pass
+
+    is_cacheable = False
+    if model_cls.__model_config__.get("cacheEncoded", False):
+        is_cacheable = _is_immutable_model(model_cls, set())
+        if not is_cacheable:
+            logger.warning(
+                f"Model {model_cls.__qualname__} has 'cacheEncoded' option, but it is not"
+                " immutable: it should be frozen and all field values should be immutable."
+                " Encoded values of it are not cached"
+            )
+    _cacheable_model_classes[model_cls] = is_cacheable
+    return is_cacheable
+
+
+def _is_immutable_model(model_cls: Type[BaseModel], checked_classes: set[type]) -> bool:
+    if model_cls in checked_classes:
+        # recursive model, immutability is decided by other fields
+        return True
+    checked_classes.add(model_cls)
+
+    if dataclasses.is_dataclass(model_cls):
+        is_frozen = model_cls.__dataclass_params__.frozen
+    else:
+        model_config = getattr(model_cls, "model_config", {})
+        is_frozen = model_config.get("frozen", False)
+    if not is_frozen:
+        return False
+    return all(
+        _is_immutable_annotation(model_field.annotation, checked_classes)
+        for model_field in model_cls.get_model_fields().values()
+    )
+
+
+def _is_immutable_annotation(annotation: Any, checked_classes: set[type]) -> bool:
+    if annotation is None or annotation in _IMMUTABLE_TYPES:
+        return True
+
+    origin = get_origin(annotation)
+    if origin is None:
+        if not inspect.isclass(annotation):
+            return False
+        if issubclass(annotation, Enum):
+            return True
+        if issubclass(annotation, BaseModel):
+            return _is_immutable_model(annotation, checked_classes)
+        return False
+
+    if origin is Literal:
+        return True
+    if origin in _UNION_TYPES or origin in (tuple, frozenset):
+        return all(
+            type_arg is Ellipsis or _is_immutable_annotation(type_arg, checked_classes)
+            for type_arg in get_args(annotation)
+        )
+    # lists, dicts, sets, packed arrays, etc.
+    return False
+
+
+__all__ = ["EncodedModelCache", "is_model_cacheable"]
@@ -1,6 +1,8 @@
 from enum import Enum, unique
 from typing import Dict
 
+from typing_extensions import override
+
 
 class BaseModappError(Exception):
     def __str__(self) -> str:
@@ -25,6 +27,18 @@ class ServerError(BaseModappError):
         return 'ServerError'
 
 
+class DeadlineExceededError(BaseModappError):
+    @override
+    def __repr__(self) -> str:
+        return 'DeadlineExceededError'
+
+
+class ResourceExhaustedError(BaseModappError):
+    @override
+    def __repr__(self) -> str:
+        return 'ResourceExhaustedError'
+
+
 # TODO: different base exceptions external and internal errors
 class PersistanceError(BaseModappError): ...
 
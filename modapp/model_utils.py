@@ -0,0 +1,396 @@
+from __future__ import annotations
+
+import inspect
+import sys
+import types
+import uuid
+from collections.abc import Mapping, Sequence
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from enum import Enum
+from functools import partial
+from types import ModuleType
+from typing import (
+    Annotated,
+    Any,
+    Callable,
+    Literal,
+    NamedTuple,
+    Type,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from loguru import logger
+
+from .base_model import BaseModel
+from .packed import find_packed_field
+
+humps: ModuleType | None
+try:
+    import humps
+except ImportError:
+    humps = None
+
+# converts value from trusted model dict to value of model attribute
+TrustedValueConstructor = Callable[[Any], Any]
+# constructors of fields which values need conversion, other values are used as is
+TrustedConstructPlan = list[tuple[str, TrustedValueConstructor]]
+
+_TRUSTED_SCALAR_TYPES = (int, float, str, bytes, bool)
+_UNION_TYPES: tuple[Any, ...] = (Union,)
+if sys.version_info >= (3, 10):
+    _UNION_TYPES += (types.UnionType,)
+
+# values of these types are immutable, they can be used as they are without copying
+_IMMUTABLE_TYPES: frozenset[type] = frozenset(
+    {
+        str,
+        int,
+        float,
+        bool,
+        bytes,
+        complex,
+        type(None),
+        datetime,
+        date,
+        time,
+        timedelta,
+        uuid.UUID,
+        Decimal,
+    }
+)
+
+_trusted_construct_plans: dict[type, TrustedConstructPlan | None] = {}
+
+
+class CamelCaseKeyTable(NamedTuple):
+    # field name -> camelCase key in model dict
+    camel_keys: dict[str, str]
+    # camelCase key or field name -> field name
+    field_names: dict[str, str]
+    # field name -> (container kind: "model", "list" or "dict", nested model class)
+    nested_models: dict[str, tuple[str, Type[BaseModel]]]
+
+
+_camel_case_key_tables: dict[type, CamelCaseKeyTable] = {}
+
+
+class _NotTrustedConstructible(Exception):
+    pass
+
+
+def find_model_classes(annotation: Any) -> list[Type[BaseModel]]:
+    """Find model classes in type annotation.
+
+    Arguments of generic types and unions are searched recursively, e.g. for
+    `list[User] | dict[str, Address] | None` result is `[User, Address]`.
+    """
+    if inspect.isclass(annotation) and issubclass(annotation, BaseModel):
+        return [annotation]
+
+    model_classes: list[Type[BaseModel]] = []
+    for type_arg in get_args(annotation):
+        for model_cls in find_model_classes(type_arg):
+            if model_cls not in model_classes:
+                model_classes.append(model_cls)
+    return model_classes
+
+
+def get_camel_case_key_table(model_cls: Type[BaseModel]) -> CamelCaseKeyTable:
+    """Get translation table between model field names and camelCase keys of model dict.
+
+    Table is computed once per model class, so that keys of each request and reply are
+    translated with dict lookups instead of string transformations.
+    """
+    try:
+        return _camel_case_key_tables[model_cls]
+    except KeyError:
+        pass
+
+    if humps is None:
+        raise Exception("Extra 'case_change' is required to use 'camelCase' model option")
+
+    key_table = CamelCaseKeyTable(camel_keys={}, field_names={}, nested_models={})
+    for field_name, model_field in model_cls.get_model_fields().items():
+        camel_key = humps.camelize(field_name)
+        key_table.camel_keys[field_name] = camel_key
+        key_table.field_names[camel_key] = field_name
+        nested_model = _find_nested_model(model_field.annotation)
+        if nested_model is not None:
+            key_table.nested_models[field_name] = nested_model
+    for field_name in key_table.camel_keys:
+        # data with snake_case keys is accepted as well
+        key_table.field_names.setdefault(field_name, field_name)
+    _camel_case_key_tables[model_cls] = key_table
+    return key_table
+
+
+def decamelize_model_dict(
+    data_dict: dict[str, Any], model_cls: Type[BaseModel]
+) -> dict[str, Any]:
+    """Translate camelCase keys of model dict and dicts of nested models to field names.
+
+    Keys, which are not fields of the model, are skipped.
+    """
+    # NOTE: that data_dict is not validated yet, it can include wrong keys or some keys can be
+    # missing
+    key_table = get_camel_case_key_table(model_cls)
+    decamelized_data_dict: dict[str, Any] = {}
+    for key, value in data_dict.items():
+        try:
+            field_name = key_table.field_names[key]
+        except KeyError:
+            logger.trace(
+                f"Skip key {key} in data, because its type was not found in model"
+            )
+            continue
+
+        nested_model = key_table.nested_models.get(field_name)
+        if nested_model is not None:
+            value = _translate_nested_value(value, nested_model, decamelize_model_dict)
+        decamelized_data_dict[field_name] = value
+    return decamelized_data_dict
+
+
+def camelize_model_dict(
+    data_dict: dict[str, Any], model_cls: Type[BaseModel]
+) -> dict[str, Any]:
+    """Translate field names in model dict and dicts of nested models to camelCase keys."""
+    key_table = get_camel_case_key_table(model_cls)
+    camelized_data_dict: dict[str, Any] = {}
+    for key, value in data_dict.items():
+        nested_model = key_table.nested_models.get(key)
+        if nested_model is not None:
+            value = _translate_nested_value(value, nested_model, camelize_model_dict)
+        camelized_data_dict[key_table.camel_keys.get(key, key)] = value
+    return camelized_data_dict
+
+
+def _translate_nested_value(
+    value: Any,
+    nested_model: tuple[str, Type[BaseModel]],
+    translate: Callable[[dict[str, Any], Type[BaseModel]], dict[str, Any]],
+) -> Any:
+    kind, model_cls = nested_model
+    if kind == "model":
+        if isinstance(value, dict):
+            return translate(value, model_cls)
+    elif kind == "list":
+        if isinstance(value, (list, tuple)):
+            return [
+                translate(item, model_cls) if isinstance(item, dict) else item
+                for item in value
+            ]
+    elif isinstance(value, dict):
+        # user keys of dict are not translated, only dicts of models in values
+        return {
+            dict_key: (
+                translate(dict_value, model_cls)
+                if isinstance(dict_value, dict)
+                else dict_value
+            )
+            for dict_key, dict_value in value.items()
+        }
+    return value
+
+
+def _find_nested_model(annotation: Any) -> tuple[str, Type[BaseModel]] | None:
+    origin = get_origin(annotation)
+    if origin is Annotated:
+        return _find_nested_model(get_args(annotation)[0])
+    if origin in _UNION_TYPES:
+        value_type_args = [
+            type_arg for type_arg in get_args(annotation) if type_arg is not type(None)
+        ]
+        # only optional values, model type of union of models cannot be determined by dict
+        return (
+            _find_nested_model(value_type_args[0]) if len(value_type_args) == 1 else None
+        )
+
+    if origin is None:
+        if inspect.isclass(annotation) and issubclass(annotation, BaseModel):
+            return ("model", annotation)
+        return None
+
+    type_args = get_args(annotation)
+    if not inspect.isclass(origin) or len(type_args) == 0:
+        return None
+    if issubclass(origin, Mapping):
+        kind, item_type = "dict", type_args[-1]
+    elif issubclass(origin, (Sequence, set, frozenset)):
+        kind, item_type = "list", type_args[0]
+    else:
+        return None
+    if inspect.isclass(item_type) and issubclass(item_type, BaseModel):
+        return (kind, item_type)
+    return None
+
+
+def get_trusted_construct_plan(
+    model_cls: Type[BaseModel],
+) -> TrustedConstructPlan | None:
+    """Get plan for construction of the model from trusted data without validation.
+
+    Data is trusted, but it is still in the form of model dict: nested models are dicts, enums
+    are their values and datetimes can be ISO strings, so these fields need conversion. Plan is
+    computed once per model class.
+
+    Returns:
+        TrustedConstructPlan | None: None if some of field types cannot be constructed without
+            validation, e.g. unions of several models.
+    """
+    try:
+        return _trusted_construct_plans[model_cls]
+    except KeyError:
+        pass
+
+    plan: TrustedConstructPlan | None
+    try:
+        field_constructors: TrustedConstructPlan = []
+        for field_name, model_field in model_cls.get_model_fields().items():
+            value_constructor = _build_trusted_value_constructor(model_field.annotation)
+            if value_constructor is not None:
+                field_constructors.append((field_name, value_constructor))
+        plan = field_constructors
+    except _NotTrustedConstructible:
+        plan = None
+    _trusted_construct_plans[model_cls] = plan
+    return plan
+
+
+def apply_trusted_construct_plan(
+    model_dict: dict[str, Any], plan: TrustedConstructPlan
+) -> dict[str, Any]:
+    if len(plan) == 0:
+        return model_dict
+
+    # don't change input dict
+    constructed_dict = dict(model_dict)
+    for field_name, construct_value in plan:
+        if field_name in constructed_dict:
+            constructed_dict[field_name] = construct_value(constructed_dict[field_name])
+    return constructed_dict
+
+
+def _build_trusted_value_constructor(annotation: Any) -> TrustedValueConstructor | None:
+    if annotation is Any or annotation is None or annotation is type(None):
+        return None
+
+    if inspect.isclass(annotation) and get_origin(annotation) is None:
+        if issubclass(annotation, BaseModel):
+            return partial(_construct_model, model_cls=annotation)
+        if issubclass(annotation, Enum):
+            return partial(_construct_enum, enum_cls=annotation)
+        # datetime is subclass of date, check it first
+        if issubclass(annotation, datetime):
+            return partial(_construct_from_iso_format, value_type=datetime)
+        if issubclass(annotation, date):
+            return partial(_construct_from_iso_format, value_type=date)
+        if issubclass(annotation, _TRUSTED_SCALAR_TYPES):
+            return None
+        raise _NotTrustedConstructible()
+
+    origin = get_origin(annotation)
+    type_args = get_args(annotation)
+    if origin is Annotated:
+        packed_field = find_packed_field(annotation)
+        if packed_field is not None:
+            return packed_field.coerce
+        return _build_trusted_value_constructor(type_args[0])
+    if origin is Literal:
+        return None
+    if origin in _UNION_TYPES:
+        constructors = [
+            _build_trusted_value_constructor(type_arg)
+            for type_arg in type_args
+            if type_arg is not type(None)
+        ]
+        if all(constructor is None for constructor in constructors):
+            return None
+        if len(constructors) == 1:
+            # optional value
+            return partial(_construct_optional, value_constructor=constructors[0])
+        # value type cannot be determined without validation
+        raise _NotTrustedConstructible()
+    if origin is tuple and not (len(type_args) == 2 and type_args[1] is Ellipsis):
+        if all(
+            _build_trusted_value_constructor(type_arg) is None for type_arg in type_args
+        ):
+            return tuple
+        raise _NotTrustedConstructible()
+    if inspect.isclass(origin) and issubclass(origin, Mapping):
+        if len(type_args) == 2:
+            if _build_trusted_value_constructor(type_args[0]) is not None:
+                raise _NotTrustedConstructible()
+            value_constructor = _build_trusted_value_constructor(type_args[1])
+            if value_constructor is not None:
+                return partial(_construct_dict, value_constructor=value_constructor)
+        return None
+    if inspect.isclass(origin) and issubclass(origin, (Sequence, set, frozenset)):
+        item_constructor = (
+            _build_trusted_value_constructor(type_args[0]) if type_args else None
+        )
+        collection_type = origin if origin in (tuple, set, frozenset) else list
+        if item_constructor is None and collection_type is list:
+            return None
+        return partial(
+            _construct_collection,
+            collection_type=collection_type,
+            item_constructor=item_constructor,
+        )
+    raise _NotTrustedConstructible()
+
+
+def _construct_model(value: Any, model_cls: Type[BaseModel]) -> Any:
+    if isinstance(value, dict):
+        return model_cls.construct_from_dict(value)
+    return value
+
+
+def _construct_enum(value: Any, enum_cls: Type[Enum]) -> Any:
+    if isinstance(value, enum_cls):
+        return value
+    return enum_cls(value)
+
+
+def _construct_from_iso_format(value: Any, value_type: Type[date]) -> Any:
+    if isinstance(value, str):
+        return value_type.fromisoformat(value)
+    return value
+
+
+def _construct_optional(
+    value: Any, value_constructor: TrustedValueConstructor | None
+) -> Any:
+    if value is None or value_constructor is None:
+        return value
+    return value_constructor(value)
+
+
+def _construct_dict(
+    value: Mapping[Any, Any], value_constructor: TrustedValueConstructor
+) -> dict[Any, Any]:
+    return {key: value_constructor(item) for key, item in value.items()}
+
+
+def _construct_collection(
+    value: Any,
+    collection_type: Callable[[Any], Any],
+    item_constructor: TrustedValueConstructor | None,
+) -> Any:
+    if item_constructor is None:
+        return collection_type(value)
+    return collection_type(item_constructor(item) for item in value)
+
+
+__all__ = [
+    "find_model_classes",
+    "CamelCaseKeyTable",
+    "get_camel_case_key_table",
+    "camelize_model_dict",
+    "decamelize_model_dict",
+    "get_trusted_construct_plan",
+    "apply_trusted_construct_plan",
+]
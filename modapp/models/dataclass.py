@@ -1,103 +1,148 @@
-import inspect
-from dataclasses import asdict
-from typing import Any, Self, Type
+import dataclasses
+import sys
+from typing import Any, Callable, TypeVar, cast, get_type_hints
+
+if sys.version_info >= (3, 11, 0):
+    from typing import Self
+else:
+    from typing_extensions import Self
 
-from loguru import logger
 from typing_extensions import override
 
-try:
-    import humps
-except ImportError:
-    humps = None
+from modapp.base_model import BaseModel, ModelField
+from modapp.model_utils import (
+    decamelize_model_dict,
+    apply_trusted_construct_plan,
+    get_trusted_construct_plan,
+)
+
+from .dataclass_decoder import get_dataclass_decoder
+from .dataclass_encoder import get_dataclass_to_dict
 
-from modapp.base_model import BaseModel
-from modapp.errors import InvalidArgumentError
+_model_fields_by_cls: dict[type, dict[str, ModelField]] = {}
+
+_ModelClsType = TypeVar("_ModelClsType", bound=type)
 
 
 class DataclassModel(BaseModel):
+    # subclasses without `__slots__` still have `__dict__`, see `slotted_dataclass`
+    __slots__ = ()
+
     @override
     @classmethod
     def validate_and_construct_from_dict(cls, model_dict: dict[str, Any]) -> Self:
         data_as_dict = model_dict
         if cls.__model_config__.get("camelCase", False):
-            if humps is None:
-                raise Exception(
-                    "Extra 'case_change' is required to use 'camelCase' model option"
-                )
-            data_as_dict = _decamelize_model_dict(model_dict, cls)
-        try:
-            return cls(**data_as_dict)
-        except Exception as error:  # TODO
-            # TODO: field name should follow camelCase option
-            raise InvalidArgumentError(
-                {}
-                # errors_by_fields=# {str(error["loc"][0]): error["msg"] for error in error.errors()}
-            )
+            data_as_dict = decamelize_model_dict(model_dict, cls)
+        # TODO: field name should follow camelCase option
+        return cast(Self, get_dataclass_decoder(cls).decode(data_as_dict))
+
+    @override
+    @classmethod
+    def construct_from_dict(cls, model_dict: dict[str, Any]) -> Self:
+        data_as_dict = model_dict
+        if cls.__model_config__.get("camelCase", False):
+            data_as_dict = decamelize_model_dict(model_dict, cls)
+
+        construct_plan = get_trusted_construct_plan(cls)
+        if construct_plan is None:
+            return cls.validate_and_construct_from_dict(model_dict)
+        data_as_dict = apply_trusted_construct_plan(data_as_dict, construct_plan)
+        return cls(**data_as_dict)
+
+    @override
+    @classmethod
+    def validate_field_value(cls, instance: Self, field_name: str, value: Any) -> Any:
+        return get_dataclass_decoder(cls).validate_field_value(field_name, value)
 
     @override
     def to_dict(self) -> dict[str, Any]:
-        data_as_dict = asdict(self)
-        if self.__model_config__.get("camelCase", False):
-            if humps is None:
-                raise Exception(
-                    "Extra 'case_change' is required to use 'camelCase' model option"
-                )
-            data_as_dict = _camelize_model_dict(data_as_dict, self)
-        return data_as_dict
-
-
-def _camelize_model_dict(
-    data_dict: dict[str, Any], model_instance: DataclassModel
-) -> dict[str, Any]:
-    assert humps is not None
-    camelized_data_dict: dict[str, Any] = {}
-    for key, value in data_dict.items():
-        # camelize all keys and values that are also model instances
-        model_attr_value = getattr(model_instance, key)
-        if isinstance(model_attr_value, DataclassModel):
-            camelized_value = _camelize_model_dict(value, model_attr_value)
-        elif isinstance(value, list):
-            # TODO: support all iterables: set etc.
-            list_result: list[Any] = []
-            for idx, dict_item in enumerate(value):
-                if isinstance(model_attr_value[idx], DataclassModel):
-                    list_result.append(_camelize_model_dict(dict_item, model_attr_value[idx]))
-                else:
-                    list_result.append(dict_item)
-            camelized_value = list_result
-        elif isinstance(value, dict):
-            # TODO: check whether user dicts are supported
-            dict_result: dict[Any, Any] = {}
-            for dict_key, dict_value in value.items():
-                if isinstance(value, DataclassModel):
-                    dict_result[dict_key] = _camelize_model_dict(dict_value, model_attr_value[key])
-                else:
-                    dict_result[dict_key] = dict_value
-            camelized_value = dict_result
-        else:
-            camelized_value = value
-        camelized_data_dict[humps.camelize(key)] = camelized_value
-    return camelized_data_dict
-
-
-def _decamelize_model_dict(
-    data_dict: dict[str, Any], model_cls: Type[DataclassModel]
-) -> dict[str, Any]:
-    # NOTE: that data_dict is not validated yet, it can include wrong keys or some keys can be missing
-    assert humps is not None
-    decamelized_data_dict: dict[str, Any] = {}
-    for key, value in data_dict.items():
-        decamelized_key = humps.decamelize(key)
-        # decamelize all keys and values that are also model instances
+        return get_dataclass_to_dict(
+            type(self), bool(self.__model_config__.get("camelCase", False))
+        )(self)
+
+    @override
+    @classmethod
+    def get_model_fields(cls) -> dict[str, ModelField]:
         try:
-            model_attr_type = model_cls.__annotations__[decamelized_key]
+            return _model_fields_by_cls[cls]
         except KeyError:
-            logger.trace(f"Skip key {decamelized_key} in data, because its type was not found in model")
-            continue
-
-        if inspect.isclass(model_attr_type) and issubclass(model_attr_type, DataclassModel):
-            decamelized_value = _decamelize_model_dict(value, model_attr_type)
-        else:
-            decamelized_value = value
-        decamelized_data_dict[decamelized_key] = decamelized_value
-    return decamelized_data_dict
+            pass
+
+        # resolve annotations lazily, models can reference models defined later. Keep
+        # `Annotated` metadata, it defines e.g. packed fields
+        type_hints = get_type_hints(cls, include_extras=True)
+        # `DataclassModel` itself is used as empty model, e.g. in requests without data
+        dataclass_fields: tuple[dataclasses.Field[Any], ...] = (
+            dataclasses.fields(cls) if dataclasses.is_dataclass(cls) else ()
+        )
+        model_fields: dict[str, ModelField] = {
+            field.name: ModelField(
+                name=field.name,
+                annotation=type_hints.get(field.name, field.type),
+                default=field.default,
+                default_factory=(
+                    field.default_factory
+                    if field.default_factory is not dataclasses.MISSING
+                    else None
+                ),
+            )
+            for field in dataclass_fields
+        }
+        _model_fields_by_cls[cls] = model_fields
+        return model_fields
+
+
+def slotted_dataclass(
+    cls: _ModelClsType | None = None, /, *, frozen: bool = False, **dataclass_options: Any
+) -> Any:
+    """Create dataclass without per-instance `__dict__`, optionally frozen.
+
+    The same as `@dataclass(slots=True)` on Python 3.10+, but works on Python 3.9 as well.
+    Slotted models take noticeably less memory, which matters for models created in large
+    numbers, e.g. messages of streams.
+
+    Usage:
+        @slotted_dataclass(frozen=True)
+        class Tick(DataclassModel):
+            price: float
+
+    Note that slotted dataclass is a new class, so that methods of it cannot use `super()`
+    without arguments.
+
+    Args:
+        cls (_ModelClsType | None, optional): class to decorate. Defaults to None.
+        frozen (bool, optional): make instances immutable. Defaults to False.
+        **dataclass_options: other options of `dataclasses.dataclass`.
+    """
+
+    def wrap(cls: _ModelClsType) -> _ModelClsType:
+        if sys.version_info >= (3, 10):
+            return cast(
+                _ModelClsType,
+                dataclasses.dataclass(
+                    cls, frozen=frozen, slots=True, **dataclass_options
+                ),
+            )
+        return _add_slots(
+            dataclasses.dataclass(cls, frozen=frozen, **dataclass_options)
+        )
+
+    if cls is None:
+        return cast(Callable[[_ModelClsType], _ModelClsType], wrap)
+    return wrap(cls)
+
+
+def _add_slots(cls: _ModelClsType) -> _ModelClsType:
+    # the same as `slots=True` of dataclasses in Python 3.10+: class is created again with
+    # `__slots__`, defaults of fields are already in generated `__init__`
+    field_names = tuple(field.name for field in dataclasses.fields(cls))
+    cls_dict = dict(cls.__dict__)
+    cls_dict["__slots__"] = field_names
+    for field_name in field_names:
+        cls_dict.pop(field_name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+    slotted_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    slotted_cls.__qualname__ = cls.__qualname__
+    return slotted_cls
@@ -0,0 +1,472 @@
+"""Decoder of dataclass models compiled from their type annotations.
+
+Decoder validates and converts data from model dict (e.g. output of `orjson.loads`) and creates
+fully typed model instances, including nested models, in one pass. Validators of fields are built
+once per model class, so that decoding doesn't inspect annotations anymore.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import inspect
+import uuid
+from collections.abc import Mapping, Sequence
+from datetime import date, datetime, timezone
+from decimal import Decimal, InvalidOperation
+from enum import Enum
+from typing import (
+    TYPE_CHECKING,
+    Annotated,
+    Any,
+    Callable,
+    Literal,
+    Type,
+    get_args,
+    get_origin,
+)
+
+from modapp.base_model import BaseModel
+from modapp.errors import InvalidArgumentError
+from modapp.model_utils import _UNION_TYPES
+from modapp.packed import find_packed_field
+
+if TYPE_CHECKING:
+    from .dataclass import DataclassModel
+
+# validates value and returns converted value. Raises `DecodeError`
+ValueValidator = Callable[[Any], Any]
+
+_decoders_by_cls: dict[type, DataclassDecoder] = {}
+
+
+class DecodeError(Exception):
+    def __init__(self, message: str, location: tuple[str | int, ...] = ()) -> None:
+        super().__init__(message)
+        self.message = message
+        # path to invalid value inside of the field value, e.g. index in list
+        self.location = location
+
+
+class DataclassDecoder:
+    def __init__(self, model_cls: Type[DataclassModel]) -> None:
+        self.model_cls = model_cls
+        self.field_validators: dict[str, ValueValidator] = {}
+        self.required_fields: list[str] = []
+        for field_name, model_field in model_cls.get_model_fields().items():
+            self.field_validators[field_name] = build_value_validator(
+                model_field.annotation
+            )
+            if model_field.required:
+                self.required_fields.append(field_name)
+
+    def decode(self, model_dict: Any) -> DataclassModel:
+        """Validate model dict and create model instance.
+
+        Raises:
+            InvalidArgumentError: model dict is invalid. Errors are collected for all fields,
+                keys are paths of invalid values, e.g. `addresses.0.postal_code`.
+        """
+        if not isinstance(model_dict, dict):
+            raise InvalidArgumentError({"": "Input should be a valid dictionary"})
+
+        field_values: dict[str, Any] = {}
+        errors_by_fields: dict[str, str] = {}
+        for field_name, validate in self.field_validators.items():
+            try:
+                value = model_dict[field_name]
+            except KeyError:
+                # defaults are set by dataclass
+                continue
+            try:
+                field_values[field_name] = validate(value)
+            except DecodeError as error:
+                errors_by_fields[_format_location(field_name, error.location)] = (
+                    error.message
+                )
+
+        if len(field_values) + len(errors_by_fields) < len(self.field_validators):
+            for field_name in self.required_fields:
+                if field_name not in model_dict:
+                    errors_by_fields[field_name] = "Field required"
+        if errors_by_fields:
+            raise InvalidArgumentError(errors_by_fields)
+
+        try:
+            return self.model_cls(**field_values)
+        except (TypeError, ValueError) as error:
+            # e.g. validation in `__post_init__`
+            raise InvalidArgumentError({"": str(error)})
+
+    def validate_field_value(self, field_name: str, value: Any) -> Any:
+        try:
+            return self.field_validators[field_name](value)
+        except DecodeError as error:
+            raise InvalidArgumentError(
+                {_format_location(field_name, error.location): error.message}
+            )
+
+
+def get_dataclass_decoder(model_cls: Type[DataclassModel]) -> DataclassDecoder:
+    """Get decoder of dataclass model, compile it on first use."""
+    try:
+        return _decoders_by_cls[model_cls]
+    except KeyError:
+        pass
+
+    decoder = DataclassDecoder(model_cls)
+    _decoders_by_cls[model_cls] = decoder
+    return decoder
+
+
+def build_value_validator(annotation: Any) -> ValueValidator:
+    if annotation is Any or annotation is object:
+        return _validate_any
+    if annotation is None or annotation is type(None):
+        return _validate_none
+
+    origin = get_origin(annotation)
+    if origin is None:
+        if inspect.isclass(annotation):
+            return _build_class_validator(annotation)
+        # e.g. TypeVar
+        return _validate_any
+
+    type_args = get_args(annotation)
+    if origin is Annotated:
+        packed_field = find_packed_field(annotation)
+        if packed_field is not None:
+            return _wrap_conversion(
+                packed_field.coerce, "Input should be a sequence of numbers"
+            )
+        return build_value_validator(type_args[0])
+    if origin is Literal:
+        return _build_literal_validator(type_args)
+    if origin in _UNION_TYPES:
+        return _build_union_validator(type_args)
+    if origin is tuple:
+        if len(type_args) == 2 and type_args[1] is Ellipsis:
+            return _build_sequence_validator(build_value_validator(type_args[0]), tuple)
+        return _build_tuple_validator(
+            [build_value_validator(type_arg) for type_arg in type_args]
+        )
+    if inspect.isclass(origin) and issubclass(origin, Mapping):
+        key_validator = (
+            build_value_validator(type_args[0]) if type_args else _validate_any
+        )
+        value_validator = (
+            build_value_validator(type_args[1]) if len(type_args) > 1 else _validate_any
+        )
+        return _build_dict_validator(key_validator, value_validator)
+    if inspect.isclass(origin) and issubclass(origin, (Sequence, set, frozenset)):
+        item_validator = (
+            build_value_validator(type_args[0]) if type_args else _validate_any
+        )
+        collection_type = origin if origin in (set, frozenset) else list
+        return _build_sequence_validator(item_validator, collection_type)
+    # other generic types are not validated
+    return _validate_any
+
+
+def _format_location(field_name: str, location: tuple[str | int, ...]) -> str:
+    return ".".join([field_name, *(str(location_item) for location_item in location)])
+
+
+def _validate_any(value: Any) -> Any:
+    return value
+
+
+def _validate_none(value: Any) -> Any:
+    if value is not None:
+        raise DecodeError("Input should be None")
+    return value
+
+
+def _validate_str(value: Any) -> Any:
+    if not isinstance(value, str):
+        raise DecodeError("Input should be a valid string")
+    return value
+
+
+def _validate_int(value: Any) -> Any:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    raise DecodeError("Input should be a valid integer")
+
+
+def _validate_float(value: Any) -> Any:
+    if isinstance(value, float):
+        return value
+    if isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    raise DecodeError("Input should be a valid number")
+
+
+def _validate_bool(value: Any) -> Any:
+    if isinstance(value, bool):
+        return value
+    if value in (0, 1) and not isinstance(value, float):
+        return bool(value)
+    if isinstance(value, str) and value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    raise DecodeError("Input should be a valid boolean")
+
+
+def _validate_bytes(value: Any) -> Any:
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, str):
+        return value.encode("utf-8")
+    raise DecodeError("Input should be a valid bytes")
+
+
+def _validate_datetime(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        return datetime.fromtimestamp(value, tz=timezone.utc)
+    raise DecodeError("Input should be a valid datetime")
+
+
+def _validate_date(value: Any) -> Any:
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            pass
+    raise DecodeError("Input should be a valid date")
+
+
+def _validate_uuid(value: Any) -> Any:
+    if isinstance(value, uuid.UUID):
+        return value
+    if isinstance(value, str):
+        try:
+            return uuid.UUID(value)
+        except ValueError:
+            pass
+    raise DecodeError("Input should be a valid UUID")
+
+
+def _validate_decimal(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+        try:
+            return Decimal(str(value))
+        except InvalidOperation:
+            pass
+    raise DecodeError("Input should be a valid decimal")
+
+
+_VALIDATORS_BY_TYPE: dict[type, ValueValidator] = {
+    str: _validate_str,
+    int: _validate_int,
+    float: _validate_float,
+    bool: _validate_bool,
+    bytes: _validate_bytes,
+    datetime: _validate_datetime,
+    date: _validate_date,
+    uuid.UUID: _validate_uuid,
+    Decimal: _validate_decimal,
+}
+
+
+def _build_class_validator(value_type: type) -> ValueValidator:
+    try:
+        return _VALIDATORS_BY_TYPE[value_type]
+    except KeyError:
+        pass
+
+    if issubclass(value_type, Enum):
+        return _build_enum_validator(value_type)
+    if issubclass(value_type, BaseModel):
+        return _build_model_validator(value_type)
+
+    def validate_instance(value: Any) -> Any:
+        if not isinstance(value, value_type):
+            raise DecodeError(f"Input should be an instance of {value_type.__name__}")
+        return value
+
+    return validate_instance
+
+
+def _build_enum_validator(enum_cls: Type[Enum]) -> ValueValidator:
+    expected_values = ", ".join(repr(member.value) for member in enum_cls)
+
+    def validate_enum(value: Any) -> Any:
+        if isinstance(value, enum_cls):
+            return value
+        try:
+            return enum_cls(value)
+        except ValueError:
+            raise DecodeError(f"Input should be {expected_values}")
+
+    return validate_enum
+
+
+def _build_model_validator(model_cls: Type[BaseModel]) -> ValueValidator:
+    is_dataclass_model = dataclasses.is_dataclass(model_cls)
+
+    def validate_model(value: Any) -> Any:
+        if isinstance(value, model_cls):
+            return value
+        if not isinstance(value, dict):
+            raise DecodeError("Input should be a valid dictionary or instance")
+        try:
+            if is_dataclass_model:
+                # resolved on call, models can reference themselves
+                return get_dataclass_decoder(model_cls).decode(value)  # type: ignore[arg-type]
+            return model_cls.validate_and_construct_from_dict(value)
+        except InvalidArgumentError as error:
+            # report the first error with its location in nested model
+            location, message = next(iter(error.errors_by_fields.items()))
+            raise DecodeError(
+                message,
+                tuple(
+                    location_item
+                    for location_item in location.split(".")
+                    if location_item
+                ),
+            )
+
+    return validate_model
+
+
+def _build_literal_validator(expected_values: tuple[Any, ...]) -> ValueValidator:
+    expected_values_str = ", ".join(repr(value) for value in expected_values)
+
+    def validate_literal(value: Any) -> Any:
+        if value not in expected_values:
+            raise DecodeError(f"Input should be {expected_values_str}")
+        return value
+
+    return validate_literal
+
+
+def _build_union_validator(type_args: tuple[Any, ...]) -> ValueValidator:
+    allows_none = type(None) in type_args
+    validators = [
+        build_value_validator(type_arg)
+        for type_arg in type_args
+        if type_arg is not type(None)
+    ]
+    if len(validators) == 1:
+        validator = validators[0]
+
+        def validate_optional(value: Any) -> Any:
+            if value is None:
+                if not allows_none:
+                    raise DecodeError("Input should not be None")
+                return None
+            return validator(value)
+
+        return validate_optional
+
+    def validate_union(value: Any) -> Any:
+        if value is None and allows_none:
+            return None
+        # the first matching type in the order of union wins
+        for validator in validators:
+            try:
+                return validator(value)
+            except DecodeError:
+                continue
+        raise DecodeError("Input doesn't match any type of union")
+
+    return validate_union
+
+
+def _build_sequence_validator(
+    item_validator: ValueValidator, collection_type: Callable[[Any], Any]
+) -> ValueValidator:
+    def validate_sequence(value: Any) -> Any:
+        # any sequence except strings, e.g. also repeated fields of protobuf
+        if not isinstance(value, (Sequence, set, frozenset)) or isinstance(
+            value, (str, bytes, bytearray)
+        ):
+            raise DecodeError("Input should be a valid list")
+        items = []
+        for idx, item in enumerate(value):
+            try:
+                items.append(item_validator(item))
+            except DecodeError as error:
+                raise DecodeError(error.message, (idx, *error.location))
+        return items if collection_type is list else collection_type(items)
+
+    if item_validator is _validate_any and collection_type is list:
+
+        def validate_list(value: Any) -> Any:
+            if not isinstance(value, list):
+                return validate_sequence(value)
+            return value
+
+        return validate_list
+    return validate_sequence
+
+
+def _build_tuple_validator(item_validators: list[ValueValidator]) -> ValueValidator:
+    def validate_tuple(value: Any) -> Any:
+        if not isinstance(value, (list, tuple)):
+            raise DecodeError("Input should be a valid tuple")
+        if len(value) != len(item_validators):
+            raise DecodeError(f"Tuple should have {len(item_validators)} items")
+        items = []
+        for idx, (item_validator, item) in enumerate(zip(item_validators, value)):
+            try:
+                items.append(item_validator(item))
+            except DecodeError as error:
+                raise DecodeError(error.message, (idx, *error.location))
+        return tuple(items)
+
+    return validate_tuple
+
+
+def _build_dict_validator(
+    key_validator: ValueValidator, value_validator: ValueValidator
+) -> ValueValidator:
+    def validate_dict(value: Any) -> Any:
+        if not isinstance(value, Mapping):
+            raise DecodeError("Input should be a valid dictionary")
+        if key_validator is _validate_any and value_validator is _validate_any:
+            return value if isinstance(value, dict) else dict(value)
+        result: dict[Any, Any] = {}
+        for dict_key, dict_value in value.items():
+            try:
+                result[key_validator(dict_key)] = value_validator(dict_value)
+            except DecodeError as error:
+                raise DecodeError(error.message, (dict_key, *error.location))
+        return result
+
+    return validate_dict
+
+
+def _wrap_conversion(convert: Callable[[Any], Any], message: str) -> ValueValidator:
+    def validate_conversion(value: Any) -> Any:
+        try:
+            return convert(value)
+        except (TypeError, ValueError, OverflowError):
+            raise DecodeError(message)
+
+    return validate_conversion
+
+
+__all__ = ["DataclassDecoder", "DecodeError", "get_dataclass_decoder"]
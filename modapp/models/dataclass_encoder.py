@@ -0,0 +1,239 @@
+"""`to_dict` of dataclass models generated from their type annotations.
+
+`dataclasses.asdict` walks fields through reflection on each call and deep-copies every value,
+which is not a dataclass, list, tuple or dict. Generated function knows fields of the model and
+which of them hold nested models, lists or dicts of models, returns immutable values as they are
+and copies only mutable containers.
+"""
+
+from __future__ import annotations
+
+import copy
+import dataclasses
+import inspect
+from enum import Enum
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Annotated,
+    Any,
+    Callable,
+    Literal,
+    Type,
+    cast,
+    get_args,
+    get_origin,
+)
+
+from modapp.base_model import BaseModel
+from modapp.model_utils import _IMMUTABLE_TYPES, _UNION_TYPES, get_camel_case_key_table
+from modapp.packed import find_packed_field
+
+if TYPE_CHECKING:
+    from .dataclass import DataclassModel
+
+ToDictFunction = Callable[[Any], dict[str, Any]]
+
+# how field value is converted, see `_build_field_expression`
+_LEAF = "leaf"
+_MODEL = "model"
+_LIST_OF_MODELS = "list_of_models"
+_DICT_OF_MODELS = "dict_of_models"
+_LIST_OF_LEAVES = "list_of_leaves"
+_DICT_OF_LEAVES = "dict_of_leaves"
+_TUPLE_OF_LEAVES = "tuple_of_leaves"
+_SHALLOW_COPY = "shallow_copy"
+_ANY = "any"
+
+_to_dict_functions: dict[tuple[type, bool], ToDictFunction] = {}
+
+
+def get_dataclass_to_dict(
+    model_cls: Type[DataclassModel], camel_case: bool = False
+) -> ToDictFunction:
+    """Get `to_dict` function of dataclass model, generate it on first use.
+
+    Args:
+        model_cls (Type[DataclassModel]): dataclass model class.
+        camel_case (bool, optional): use camelCase keys in dicts of the model and its nested
+            models. Defaults to False.
+    """
+    try:
+        return _to_dict_functions[(model_cls, camel_case)]
+    except KeyError:
+        pass
+
+    to_dict = _generate_to_dict(model_cls, camel_case)
+    _to_dict_functions[(model_cls, camel_case)] = to_dict
+    return to_dict
+
+
+def _generate_to_dict(model_cls: Type[DataclassModel], camel_case: bool) -> ToDictFunction:
+    model_fields = model_cls.get_model_fields()
+    keys: dict[str, str] = {field_name: field_name for field_name in model_fields}
+    if camel_case:
+        keys.update(get_camel_case_key_table(model_cls).camel_keys)
+
+    lines = ["def to_dict(model):"]
+    dict_items: list[str] = []
+    for idx, (field_name, model_field) in enumerate(model_fields.items()):
+        value_name = f"value_{idx}"
+        lines.append(f"    {value_name} = model.{field_name}")
+        dict_items.append(
+            f"        {keys[field_name]!r}: "
+            f"{_build_field_expression(_get_value_kind(model_field.annotation), value_name)},"
+        )
+    lines.append("    return {")
+    lines.extend(dict_items)
+    lines.append("    }")
+
+    namespace: dict[str, Any] = {
+        # nested models of known type follow camelCase option of the outer model, like keys
+        # translation with `camelize_model_dict`
+        "convert_model": _build_model_converter(camel_case),
+        "convert_any": partial(_convert_value, camel_case=camel_case),
+        "copy_value": copy.copy,
+        "list": list,
+        "dict": dict,
+        "tuple": tuple,
+        "type": type,
+    }
+    source = "\n".join(lines)
+    code = compile(source, f"<to_dict of {model_cls.__qualname__}>", "exec")
+    exec(code, namespace)
+    return cast(ToDictFunction, namespace["to_dict"])
+
+
+def _build_field_expression(value_kind: str, value_name: str) -> str:
+    # exact type checks: anything unexpected in the field falls back to generic conversion
+    if value_kind == _LEAF:
+        return value_name
+    if value_kind == _MODEL:
+        return f"convert_model({value_name})"
+    if value_kind == _LIST_OF_MODELS:
+        return (
+            f"[convert_model(item) for item in {value_name}] "
+            f"if type({value_name}) is list else convert_any({value_name})"
+        )
+    if value_kind == _DICT_OF_MODELS:
+        return (
+            f"{{key: convert_model(item) for key, item in {value_name}.items()}} "
+            f"if type({value_name}) is dict else convert_any({value_name})"
+        )
+    if value_kind == _LIST_OF_LEAVES:
+        return f"list({value_name}) if type({value_name}) is list else convert_any({value_name})"
+    if value_kind == _DICT_OF_LEAVES:
+        return f"dict({value_name}) if type({value_name}) is dict else convert_any({value_name})"
+    if value_kind == _TUPLE_OF_LEAVES:
+        return f"{value_name} if type({value_name}) is tuple else convert_any({value_name})"
+    if value_kind == _SHALLOW_COPY:
+        return f"copy_value({value_name})"
+    return f"convert_any({value_name})"
+
+
+def _get_value_kind(annotation: Any) -> str:
+    if _is_immutable_annotation(annotation):
+        return _LEAF
+
+    origin = get_origin(annotation)
+    if origin is None:
+        if inspect.isclass(annotation) and issubclass(annotation, BaseModel):
+            return _MODEL
+        return _ANY
+
+    type_args = get_args(annotation)
+    if origin is Annotated:
+        if find_packed_field(annotation) is not None:
+            # flat containers of numbers
+            return _SHALLOW_COPY
+        return _get_value_kind(type_args[0])
+    if origin in _UNION_TYPES:
+        not_none_args = [type_arg for type_arg in type_args if type_arg is not type(None)]
+        if len(not_none_args) == 1:
+            # optional value: expressions of all kinds return None as is
+            return _get_value_kind(not_none_args[0])
+        return _ANY
+    if origin is list and len(type_args) == 1:
+        if _is_model_annotation(type_args[0]):
+            return _LIST_OF_MODELS
+        if _is_immutable_annotation(type_args[0]):
+            return _LIST_OF_LEAVES
+    elif origin is dict and len(type_args) == 2 and _is_immutable_annotation(type_args[0]):
+        if _is_model_annotation(type_args[1]):
+            return _DICT_OF_MODELS
+        if _is_immutable_annotation(type_args[1]):
+            return _DICT_OF_LEAVES
+    elif origin is tuple and all(
+        type_arg is Ellipsis or _is_immutable_annotation(type_arg) for type_arg in type_args
+    ):
+        return _TUPLE_OF_LEAVES
+    return _ANY
+
+
+def _is_model_annotation(annotation: Any) -> bool:
+    if get_origin(annotation) is Annotated:
+        return _is_model_annotation(get_args(annotation)[0])
+    return inspect.isclass(annotation) and issubclass(annotation, BaseModel)
+
+
+def _is_immutable_annotation(annotation: Any) -> bool:
+    if annotation is None or annotation in _IMMUTABLE_TYPES:
+        return True
+    origin = get_origin(annotation)
+    if origin is None:
+        return inspect.isclass(annotation) and issubclass(annotation, Enum)
+    if origin is Literal:
+        return True
+    if origin is Annotated:
+        return _is_immutable_annotation(get_args(annotation)[0])
+    if origin in _UNION_TYPES:
+        return all(_is_immutable_annotation(type_arg) for type_arg in get_args(annotation))
+    return False
+
+
+def _build_model_converter(camel_case: bool) -> Callable[[Any], Any]:
+    def convert_model(value: Any) -> Any:
+        if dataclasses.is_dataclass(value) and isinstance(value, BaseModel):
+            # resolved on call: models can reference themselves, values can be subclasses
+            return get_dataclass_to_dict(type(value), camel_case)(value)
+        return _convert_value(value, camel_case)
+
+    return convert_model
+
+
+def _convert_value(value: Any, camel_case: bool = False) -> Any:
+    # the same conversion as in `dataclasses.asdict`, but without copies of immutable values
+    value_type = type(value)
+    if value_type in _IMMUTABLE_TYPES or isinstance(value, Enum):
+        return value
+    if isinstance(value, BaseModel):
+        if dataclasses.is_dataclass(value):
+            return get_dataclass_to_dict(value_type, camel_case)(value)
+        return value.to_dict()
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {
+            field.name: _convert_value(getattr(value, field.name), camel_case)
+            for field in dataclasses.fields(value)
+        }
+    if isinstance(value, tuple) and hasattr(value, "_fields"):
+        # named tuple
+        return value_type(*[_convert_value(item, camel_case) for item in value])
+    if isinstance(value, (list, tuple)):
+        return value_type(_convert_value(item, camel_case) for item in value)
+    if isinstance(value, dict):
+        if hasattr(value_type, "default_factory"):
+            # defaultdict
+            result = value_type(value.default_factory)  # type: ignore[attr-defined]
+            for dict_key, dict_value in value.items():
+                result[_convert_value(dict_key, camel_case)] = _convert_value(
+                    dict_value, camel_case
+                )
+            return result
+        return value_type(
+            (_convert_value(dict_key, camel_case), _convert_value(dict_value, camel_case))
+            for dict_key, dict_value in value.items()
+        )
+    return copy.deepcopy(value)
+
+
+__all__ = ["get_dataclass_to_dict"]
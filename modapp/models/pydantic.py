@@ -1,13 +1,12 @@
-import inspect
+import dataclasses
 import sys
-from typing import Any, Type
+from typing import Any
 
 if sys.version_info >= (3, 11, 0):
     from typing import Self
 else:
     from typing_extensions import Self
 
-from loguru import logger
 from pydantic import BaseModel as PydanticBaseModel, AliasGenerator, ConfigDict
 from pydantic import ValidationError, field_validator
 from pydantic.networks import (
@@ -63,15 +62,18 @@ from pydantic.types import (
     constr,
 )
 from pydantic.alias_generators import to_camel, to_snake, to_pascal
+from pydantic_core import PydanticUndefined
 from typing_extensions import override
 
-try:
-    import humps
-except ImportError:
-    humps = None
-
-from modapp.base_model import BaseModel
+from modapp.base_model import BaseModel, ModelField
 from modapp.errors import InvalidArgumentError
+from modapp.model_utils import (
+    decamelize_model_dict,
+    apply_trusted_construct_plan,
+    get_trusted_construct_plan,
+)
+
+_model_fields_by_cls: dict[type, dict[str, ModelField]] = {}
 
 
 class PydanticModel(PydanticBaseModel, BaseModel):
@@ -98,11 +100,7 @@ class PydanticModel(PydanticBaseModel, BaseModel):
         # we cannot use alias generator from pydantic, see #1 above.
         data_as_dict = model_dict
         if cls.__model_config__.get("camelCase", False):
-            if humps is None:
-                raise Exception(
-                    "Extra 'case_change' is required to use 'camelCase' model option"
-                )
-            data_as_dict = _decamelize_model_dict(model_dict, cls)
+            data_as_dict = decamelize_model_dict(model_dict, cls)
 
         try:
             return cls(**data_as_dict)
@@ -112,38 +110,59 @@ class PydanticModel(PydanticBaseModel, BaseModel):
                 {str(error["loc"][0]): error["msg"] for error in error.errors()}
             )
 
+    @override
+    @classmethod
+    def construct_from_dict(cls, model_dict: dict[str, Any]) -> Self:
+        data_as_dict = model_dict
+        if cls.__model_config__.get("camelCase", False):
+            data_as_dict = decamelize_model_dict(model_dict, cls)
+
+        construct_plan = get_trusted_construct_plan(cls)
+        if construct_plan is None:
+            return cls.validate_and_construct_from_dict(model_dict)
+        data_as_dict = apply_trusted_construct_plan(data_as_dict, construct_plan)
+        # fields are not validated, validators are not called
+        return cls.model_construct(**data_as_dict)
+
     @override
     def to_dict(self) -> dict[str, Any]:
         return self.model_dump(**self.__dump_options__)
 
-
-def _decamelize_model_dict(
-    data_dict: dict[str, Any], model_cls: Type[PydanticModel]
-) -> dict[str, Any]:
-    # NOTE: that data_dict is not validated yet, it can include wrong keys or some keys can be missing
-    assert humps is not None
-    decamelized_data_dict: dict[str, Any] = {}
-    for key, value in data_dict.items():
-        # decamelize all keys and values that are also model instances
-        decamelized_key = humps.decamelize(key)
+    @override
+    @classmethod
+    def get_model_fields(cls) -> dict[str, ModelField]:
         try:
-            model_attr_type = model_cls.model_fields[decamelized_key].annotation
+            return _model_fields_by_cls[cls]
         except KeyError:
-            logger.trace(
-                f"Skip key {key} in data, because its type was not found in model"
+            pass
+
+        model_fields = {
+            field_name: ModelField(
+                name=field_name,
+                annotation=field_info.annotation,
+                default=(
+                    field_info.default
+                    if field_info.default is not PydanticUndefined
+                    else dataclasses.MISSING
+                ),
+                default_factory=field_info.default_factory,
+            )
+            for field_name, field_info in cls.model_fields.items()
+        }
+        _model_fields_by_cls[cls] = model_fields
+        return model_fields
+
+    @override
+    @classmethod
+    def validate_field_value(cls, instance: Self, field_name: str, value: Any) -> Any:
+        try:
+            # validates and sets value of one field including field validators
+            cls.__pydantic_validator__.validate_assignment(instance, field_name, value)
+        except ValidationError as error:
+            raise InvalidArgumentError(
+                {field_name: error_details["msg"] for error_details in error.errors()}
             )
-            continue
-
-        if (
-            model_attr_type is not None
-            and inspect.isclass(model_attr_type)
-            and issubclass(model_attr_type, PydanticModel)
-        ):
-            decamelized_value = _decamelize_model_dict(value, model_attr_type)
-        else:
-            decamelized_value = value
-        decamelized_data_dict[decamelized_key] = decamelized_value
-    return decamelized_data_dict
+        return instance.__dict__[field_name]
 
 
 __all__ = [
@@ -0,0 +1,170 @@
+"""Packed numeric arrays as model field type.
+
+Repeated numeric fields with many values are expensive as lists: each value is a separate
+Python object. Fields annotated with `Packed` are stored in `array.array` or in NumPy array, and
+converters encode and decode them in bulk where the format allows it.
+
+Usage:
+    samples: PackedFloat64Array  # array.array('d')
+    samples: Annotated[numpy.ndarray, Packed("d")]  # if NumPy is installed
+"""
+
+from __future__ import annotations
+
+import array
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Annotated, Any, NamedTuple, Type, cast, get_args, get_origin
+
+from pydantic import GetCoreSchemaHandler
+from pydantic_core import core_schema
+
+from .base_model import BaseModel
+
+numpy: ModuleType | None
+try:
+    import numpy  # type: ignore[import-not-found, no-redef]
+except ImportError:
+    numpy = None
+
+
+@dataclass(frozen=True)
+class Packed:
+    # typecode of `array.array`, the same as NumPy dtype character code
+    typecode: str
+
+    def __get_pydantic_core_schema__(
+        self, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        packed_field = PackedField(typecode=self.typecode, container_type=source_type)
+        return core_schema.no_info_plain_validator_function(
+            packed_field.coerce,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                packed_to_list, when_used="json"
+            ),
+        )
+
+
+PackedFloat64Array = Annotated[array.array, Packed("d")]
+PackedFloat32Array = Annotated[array.array, Packed("f")]
+PackedInt64Array = Annotated[array.array, Packed("q")]
+PackedUInt64Array = Annotated[array.array, Packed("Q")]
+PackedInt32Array = Annotated[array.array, Packed("i")]
+PackedUInt32Array = Annotated[array.array, Packed("I")]
+
+
+class PackedField(NamedTuple):
+    typecode: str
+    # `array.array` or `numpy.ndarray`
+    container_type: type
+
+    @property
+    def is_numpy(self) -> bool:
+        return numpy is not None and self.container_type is numpy.ndarray
+
+    def coerce(self, value: Any) -> Any:
+        """Convert sequence of numbers to packed array, packed arrays of the right type are
+        returned as is."""
+        if self.is_numpy:
+            assert numpy is not None
+            if isinstance(value, numpy.ndarray) and value.dtype.char == self.typecode:
+                return value
+            return numpy.asarray(value, dtype=self.typecode)
+
+        if isinstance(value, array.array) and value.typecode == self.typecode:
+            return value
+        if numpy is not None and isinstance(value, numpy.ndarray):
+            return array.array(self.typecode, value.astype(self.typecode).tobytes())
+        return array.array(self.typecode, value)
+
+    def from_little_endian_bytes(self, data: bytes | memoryview) -> Any:
+        """Create packed array from raw little-endian values without per-value conversion.
+
+        NumPy array is a read-only view on `data`, `array.array` is a copy of it.
+        """
+        if self.is_numpy:
+            assert numpy is not None
+            return numpy.frombuffer(
+                data, dtype=numpy.dtype(self.typecode).newbyteorder("<")
+            )
+        packed_array = array.array(self.typecode)
+        packed_array.frombytes(data)
+        if _BIG_ENDIAN:
+            packed_array.byteswap()
+        return packed_array
+
+
+_BIG_ENDIAN = array.array("H", [1]).tobytes() == b"\x00\x01"
+_packed_fields_by_cls: dict[type, dict[str, PackedField]] = {}
+
+
+def get_packed_fields(model_cls: Type[BaseModel]) -> dict[str, PackedField]:
+    """Get packed fields of the model by their names. Result is computed once per model class."""
+    try:
+        return _packed_fields_by_cls[model_cls]
+    except KeyError:
+        pass
+
+    packed_fields: dict[str, PackedField] = {}
+    for field_name, model_field in model_cls.get_model_fields().items():
+        packed_field = find_packed_field(model_field.annotation)
+        if packed_field is not None:
+            packed_fields[field_name] = packed_field
+    _packed_fields_by_cls[model_cls] = packed_fields
+    return packed_fields
+
+
+def find_packed_field(annotation: Any) -> PackedField | None:
+    if get_origin(annotation) is not Annotated:
+        return None
+    container_type, *metadata = get_args(annotation)
+    for annotation_item in metadata:
+        if isinstance(annotation_item, Packed):
+            return PackedField(
+                typecode=annotation_item.typecode, container_type=container_type
+            )
+    return None
+
+
+def to_little_endian_bytes(packed_array: Any) -> bytes:
+    """Get raw little-endian values of packed array."""
+    if isinstance(packed_array, array.array):
+        if _BIG_ENDIAN:
+            packed_array = array.array(packed_array.typecode, packed_array)
+            packed_array.byteswap()
+        return cast(bytes, packed_array.tobytes())
+
+    assert numpy is not None
+    return cast(
+        bytes,
+        packed_array.astype(
+            packed_array.dtype.newbyteorder("<"), copy=False
+        ).tobytes(),
+    )
+
+
+def is_packed_array(value: Any) -> bool:
+    return isinstance(value, array.array) or (
+        numpy is not None and isinstance(value, numpy.ndarray)
+    )
+
+
+def packed_to_list(packed_array: Any) -> list[Any]:
+    return cast("list[Any]", packed_array.tolist())
+
+
+__all__ = [
+    "Packed",
+    "PackedField",
+    "PackedFloat64Array",
+    "PackedFloat32Array",
+    "PackedInt64Array",
+    "PackedUInt64Array",
+    "PackedInt32Array",
+    "PackedUInt32Array",
+    "get_packed_fields",
+    "find_packed_field",
+    "to_little_endian_bytes",
+    "is_packed_array",
+    "packed_to_list",
+]
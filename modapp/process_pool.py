@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from typing import Mapping, Sequence, Type
+
+    from modapp.base_converter import BaseConverter, TrustLevel
+    from modapp.base_model import BaseModel
+
+
+class _WorkerRoute(NamedTuple):
+    handler: Callable[..., Any]
+    request_type: Type[BaseModel]
+    trust_level: TrustLevel | None
+    # converters of transports, requests refer to them by index
+    converters: tuple[BaseConverter, ...]
+
+
+# routes of worker process by path, they are set by pool initializer
+_worker_routes: dict[str, _WorkerRoute] = {}
+
+
+def _init_worker(
+    route_path: str,
+    handler: Callable[..., Any],
+    request_type: Type[BaseModel],
+    trust_level: TrustLevel | None,
+    converters: tuple[BaseConverter, ...],
+) -> None:
+    _worker_routes[route_path] = _WorkerRoute(
+        handler, request_type, trust_level, converters
+    )
+
+
+def _warm_up_worker() -> None:
+    return None
+
+
+def _handle_request_in_worker(
+    route_path: str,
+    raw_data: bytes,
+    handler_kwargs: dict[str, Any],
+    converter_index: int,
+    reply_converter_index: int,
+) -> bytes:
+    handler, request_type, trust_level, converters = _worker_routes[route_path]
+    request_data = converters[converter_index].raw_to_model(
+        raw_data, request_type, trust_level
+    )
+    reply = handler(request_data, **handler_kwargs)
+    return converters[reply_converter_index].model_to_raw(reply)
+
+
+class RouteProcessPool:
+    """Pool of worker processes running handler of CPU-bound route, so that it doesn't
+    block other requests and can use all CPU cores.
+
+    Only raw request and reply data, route path, metadata values and indexes of converters
+    cross process boundary: request is decoded and reply is encoded in worker process.
+    Handler, type of request and converters are passed to workers once on their start, so
+    that converters with state which cannot be pickled (e.g. caches of protobuf
+    descriptors) are not sent with each request. Handler and types should be importable,
+    e.g. defined on module level. Handler should be sync, it can get metadata values, but
+    not dependencies.
+    """
+
+    def __init__(
+        self,
+        route_path: str,
+        handler: Callable[..., Any],
+        request_type: Type[BaseModel],
+        trust_level: TrustLevel | None,
+        max_workers: int,
+    ) -> None:
+        """Create process pool of route. Worker processes are started in `start`.
+
+        Args:
+            route_path (str): path of route.
+            handler (Callable[..., Any]): sync request handler.
+            request_type (Type[BaseModel]): type of request.
+            trust_level (TrustLevel | None): trust level of request data.
+            max_workers (int): number of worker processes, max number of requests of the
+                route handled at once.
+        """
+        self.route_path = route_path
+        self.handler = handler
+        self.request_type = request_type
+        self.trust_level = trust_level
+        self.max_workers = max_workers
+        self._executor: ProcessPoolExecutor | None = None
+        # converters installed in workers, set on start
+        self._converters: tuple[BaseConverter, ...] = ()
+
+    async def start(self, converters: Sequence[BaseConverter]) -> None:
+        """Start all worker processes, so that first requests don't wait for them.
+
+        Args:
+            converters (Sequence[BaseConverter]): converters of transports, requests can be
+                handled only with them.
+        """
+        if self._executor is not None:
+            return
+
+        self._converters = tuple(converters)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(
+                self.route_path,
+                self.handler,
+                self.request_type,
+                self.trust_level,
+                self._converters,
+            ),
+        )
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *[
+                loop.run_in_executor(self._executor, _warm_up_worker)
+                for _ in range(self.max_workers)
+            ]
+        )
+        logger.debug(
+            f"Process pool of route {self.route_path} started with {self.max_workers}"
+            " workers"
+        )
+
+    def stop(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def handle_request(
+        self,
+        raw_data: bytes,
+        handler_kwargs: Mapping[str, Any],
+        converter: BaseConverter,
+        reply_converter: BaseConverter,
+    ) -> bytes:
+        """Handle request in worker process.
+
+        Args:
+            raw_data (bytes): raw request data.
+            handler_kwargs (Mapping[str, Any]): metadata values of handler arguments.
+            converter (BaseConverter): converter of request, one of converters passed to
+                `start`.
+            reply_converter (BaseConverter): converter of reply, one of converters passed to
+                `start`.
+
+        Returns:
+            bytes: raw reply data.
+        """
+        if self._executor is None:
+            raise RuntimeError(
+                f"Process pool of route {self.route_path} need to be started first"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            _handle_request_in_worker,
+            self.route_path,
+            raw_data,
+            dict(handler_kwargs),
+            self.__get_converter_index(converter),
+            self.__get_converter_index(reply_converter),
+        )
+
+    def __get_converter_index(self, converter: BaseConverter) -> int:
+        for index, worker_converter in enumerate(self._converters):
+            if worker_converter is converter:
+                return index
+        raise RuntimeError(
+            f"Converter {converter} is not installed in process pool of route"
+            f" {self.route_path}"
+        )
+
+
+__all__ = ["RouteProcessPool"]
@@ -3,26 +3,32 @@ from __future__ import annotations
 import types
 from collections import namedtuple
 from collections.abc import AsyncIterator
-from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
+from contextlib import AsyncExitStack
 from enum import Enum, unique
-from inspect import (
-    isasyncgenfunction,
-    iscoroutinefunction,
-    isgeneratorfunction,
-    signature,
-)
+from functools import partial
+from inspect import iscoroutinefunction, signature
 from typing import TYPE_CHECKING, Callable, Coroutine, NamedTuple, ParamSpec
 
 from loguru import logger
 from typing_extensions import Protocol
 
+from modapp.background.concurrency import WorkerThreads, run_in_request_thread
+from modapp.base_converter import TrustLevel
 from modapp.base_model import BaseModel
-from modapp.dependencies import Dependant, DependencyFunc, DependencyOverrides
+from modapp.dependencies import (
+    AppDependencyScope,
+    Dependant,
+    DependencyOverrides,
+    DependencyPlan,
+)
+from modapp.process_pool import RouteProcessPool
 
 from .params import Depends, Meta
 
 if TYPE_CHECKING:
-    from typing import Any, List, Optional, Type
+    from typing import Any, List, Optional, Sequence, Type
+
+    from .concurrency_limit import ConcurrencyLimiter
 
     from .types import DecoratedCallable
 
@@ -52,7 +58,24 @@ class RouteMeta(NamedTuple):
     cardinality: Cardinality
 
 
-RequestResponseType = BaseModel | AsyncIterator[BaseModel]
+class ReplyBatch(NamedTuple):
+    """Messages of reply stream which are ready at once.
+
+    Stream handlers can yield it instead of single messages, so that all messages are converted
+    in one call of `BaseConverter.models_to_raw_many`:
+
+        async def get_ticks(request: TicksRequest) -> AsyncIterator[Tick | ReplyBatch]:
+            async for ticks in ticks_feed:
+                yield ReplyBatch(ticks)
+    """
+
+    messages: Sequence[BaseModel]
+
+
+# worker threads of routes which are not served by application with own ones
+DEFAULT_WORKER_THREADS = WorkerThreads()
+
+RequestResponseType = BaseModel | AsyncIterator[BaseModel | ReplyBatch]
 MetaType = dict[str, int | str | bool]
 P = ParamSpec("P")
 RouteHandlerCallable = (
@@ -72,6 +95,11 @@ class Route:
         proto_cardinality: Cardinality,
         handler_meta_kwargs: dict[str, Meta] | None = None,
         dependencies: dict[str, Depends] | None = None,
+        trust_level: TrustLevel | None = None,
+        dependency_overrides: DependencyOverrides | None = None,
+        sync_in_threadpool: bool = True,
+        process_workers: int | None = None,
+        concurrency_limiter: ConcurrencyLimiter | None = None,
     ) -> None:
         self.path = path
         self.handler = handler
@@ -79,57 +107,137 @@ class Route:
         self.request_type = request_type
         self.reply_type = reply_type
         self.proto_cardinality = proto_cardinality
+        # None: trust level of transport converter is used
+        self.trust_level = trust_level
+        # False: sync handler and sync dependencies are cheap, run them in event loop
+        self.sync_in_threadpool = sync_in_threadpool
+        # one of them is leased per request, see `set_worker_threads`
+        self.worker_threads = DEFAULT_WORKER_THREADS
+        # limit of this route only, see also `concurrency_limiters`
+        self.concurrency_limiter = concurrency_limiter
+        self._concurrency_limiters: tuple[ConcurrencyLimiter, ...] | None = None
 
         self.handler_meta_kwargs: dict[str, Meta] = {}
         if handler_meta_kwargs:
             self.handler_meta_kwargs = handler_meta_kwargs
         self.dependant: Dependant | None = (
-            Dependant.from_depends_list(handler, dependencies) if dependencies else None
+            Dependant.from_depends_list(handler, dependencies, dependency_overrides)
+            if dependencies
+            else None
         )
 
-    async def get_request_handler(
-        self, request: RequestResponseType, meta: MetaType, stack: AsyncExitStack
-    ) -> Callable[..., Coroutine[Any, Any, RequestResponseType]]:
-        handler_args: dict[str, Any] = {}
-        try:
-            handler_args.update(
-                {
-                    meta_key: meta[meta_key]
-                    for meta_key in self.handler_meta_kwargs.keys()
-                }
+        # invocation plan: everything that doesn't depend on request is resolved once
+        self.is_async_handler = iscoroutinefunction(handler)
+        self.meta_keys: tuple[str, ...] = tuple(self.handler_meta_kwargs.keys())
+        self.dependency_plan: DependencyPlan | None = (
+            DependencyPlan(self.dependant, sync_in_threadpool=sync_in_threadpool)
+            if self.dependant is not None
+            else None
+        )
+
+        # CPU-bound handler is run in worker processes, see `modapp.process_pool`
+        self.process_pool: RouteProcessPool | None = None
+        if process_workers is not None:
+            if proto_cardinality != Cardinality.UNARY_UNARY:
+                raise TypeError("Only unary-unary routes can be run in process pool")
+            if self.is_async_handler:
+                raise TypeError("Only sync handlers can be run in process pool")
+            if self.dependant is not None:
+                raise TypeError("Handlers run in process pool cannot have dependencies")
+            self.process_pool = RouteProcessPool(
+                path, handler, request_type, trust_level, max_workers=process_workers
             )
-        except KeyError as error:
-            raise Exception(error)  # TODO: correct exception
-
-        if self.dependant is not None and self.dependant.dependencies is not None:
-            # TODO: solve concurrently
-            async def solve_dependency(
-                dependency: DependencyFunc, stack: AsyncExitStack
-            ) -> Any:
-                if isgeneratorfunction(dependency):
-                    cm = contextmanager(dependency)()  # TODO: dependency args
-                    return stack.enter_context(cm)
-                elif isasyncgenfunction(dependency):
-                    cm = asynccontextmanager(dependency)()  # TODO: dependency args
-                    return await stack.enter_async_context(cm)
-                else:
-                    raise Exception()
-
-            # TODO: recursive resolving with parameters support
-            handler_args.update(
-                {
-                    str(dep.name): await solve_dependency(dep.callable, stack)
-                    for dep in self.dependant.dependencies
-                }
+
+    @property
+    def concurrency_limiters(self) -> tuple[ConcurrencyLimiter, ...]:
+        """Concurrency limiters of request to this route: limiter of route, then limiters of
+        its router and routers which include it, e.g. global limiter of application.
+
+        They are collected on first request, router tree is expected to be complete then.
+        """
+        if self._concurrency_limiters is None:
+            concurrency_limiters: list[ConcurrencyLimiter] = []
+            if self.concurrency_limiter is not None:
+                concurrency_limiters.append(self.concurrency_limiter)
+            routers = [self.router]
+            visited_routers: list[APIRouter] = []
+            while routers:
+                router = routers.pop(0)
+                if router in visited_routers:
+                    continue
+                visited_routers.append(router)
+                if (
+                    router.concurrency_limiter is not None
+                    and router.concurrency_limiter not in concurrency_limiters
+                ):
+                    concurrency_limiters.append(router.concurrency_limiter)
+                routers.extend(router.parent_routers)
+            self._concurrency_limiters = tuple(concurrency_limiters)
+        return self._concurrency_limiters
+
+    def set_app_scope(self, app_scope: AppDependencyScope | None) -> None:
+        """Use values of entered application dependencies instead of entering them per
+        request. None: all dependencies are request ones."""
+        if self.dependant is not None:
+            self.dependency_plan = DependencyPlan(
+                self.dependant,
+                app_scope.values if app_scope is not None else None,
+                sync_in_threadpool=self.sync_in_threadpool,
             )
 
-        async def request_handler() -> RequestResponseType:
-            if iscoroutinefunction(self.handler):
-                return await self.handler(request, **handler_args)
-            else:
-                return self.handler(request, **handler_args)
+    def set_worker_threads(self, worker_threads: WorkerThreads) -> None:
+        """Run sync handler and sync dependencies in threads of `worker_threads`, e.g. of
+        application."""
+        self.worker_threads = worker_threads
+
+    async def solve_handler_args(
+        self, meta: MetaType, stack: AsyncExitStack
+    ) -> dict[str, Any]:
+        """Get meta values and enter dependencies of the handler.
+
+        Args:
+            meta (MetaType): metadata of request.
+            stack (AsyncExitStack): stack of request, dependencies are exited and worker
+                thread is released on its close.
+        """
+        if self.sync_in_threadpool and (
+            not self.is_async_handler
+            or (self.dependency_plan is not None and self.dependency_plan.has_sync_nodes)
+        ):
+            # sync dependencies and handler share one thread: resources like sqlite
+            # connections can be used only in thread which created them
+            await self.worker_threads.lease(stack)
 
-        return request_handler
+        handler_args: dict[str, Any] = {}
+        for meta_key in self.meta_keys:
+            try:
+                handler_args[meta_key] = meta[meta_key]
+            except KeyError as error:
+                raise Exception(error)  # TODO: correct exception
+
+        if self.dependency_plan is not None:
+            handler_args.update(await self.dependency_plan.solve(meta, stack))
+        return handler_args
+
+    async def call_handler(
+        self, request: RequestResponseType, handler_args: dict[str, Any]
+    ) -> RequestResponseType:
+        if self.is_async_handler:
+            return await self.handler(request, **handler_args)  # type: ignore
+        if self.sync_in_threadpool:
+            # blocking handler doesn't block requests of other routes
+            return await run_in_request_thread(
+                self.handler, request, **handler_args  # type: ignore
+            )
+        return self.handler(request, **handler_args)  # type: ignore
+
+    async def get_request_handler(
+        self, request: RequestResponseType, meta: MetaType, stack: AsyncExitStack
+    ) -> Callable[..., Coroutine[Any, Any, RequestResponseType]]:
+        """Get handler of request with resolved arguments. Transports use `solve_handler_args`
+        and `call_handler` directly."""
+        handler_args = await self.solve_handler_args(meta, stack)
+        return partial(self.call_handler, request, handler_args)
 
 
 RoutesDict = dict[str, Route]
@@ -137,26 +245,77 @@ RoutesDict = dict[str, Route]
 
 class APIRouter:
     def __init__(
-        self, dependency_overrides: Optional[DependencyOverrides] = None
+        self,
+        dependency_overrides: Optional[DependencyOverrides] = None,
+        concurrency_limiter: Optional[ConcurrencyLimiter] = None,
     ) -> None:
+        """Create router.
+
+        Args:
+            dependency_overrides (Optional[DependencyOverrides], optional): overrides of
+                dependency functions. Defaults to None.
+            concurrency_limiter (Optional[ConcurrencyLimiter], optional): limit of requests
+                to all routes of this router and its child routers handled at once. Defaults
+                to None.
+        """
         self._routes: RoutesDict = {}
         self.child_routers: List[APIRouter] = []
+        # routers which included this one, their route tables include routes of this router
+        self.parent_routers: List[APIRouter] = []
         self.dependency_overrides = dependency_overrides
+        self.concurrency_limiter = concurrency_limiter
+        # flat table with routes of this router and all child routers, None if it needs to be
+        # rebuilt after change of the router tree
+        self._routes_table: RoutesDict | None = None
 
     def endpoint(
-        self, route_meta: RouteMeta
+        self,
+        route_meta: RouteMeta,
+        trust_level: TrustLevel | None = None,
+        sync_in_threadpool: bool = True,
+        process_workers: int | None = None,
+        concurrency_limiter: ConcurrencyLimiter | None = None,
     ) -> Callable[[DecoratedCallable], DecoratedCallable]:
         def decorator(func: DecoratedCallable) -> DecoratedCallable:
-            self.add_endpoint(route_meta, func)
+            self.add_endpoint(
+                route_meta,
+                func,
+                trust_level=trust_level,
+                sync_in_threadpool=sync_in_threadpool,
+                process_workers=process_workers,
+                concurrency_limiter=concurrency_limiter,
+            )
             return func
 
         return decorator
 
     def add_endpoint(
-        self, route_meta: RouteMeta, handler: RouteHandlerCallable
+        self,
+        route_meta: RouteMeta,
+        handler: RouteHandlerCallable,
+        trust_level: TrustLevel | None = None,
+        sync_in_threadpool: bool = True,
+        process_workers: int | None = None,
+        concurrency_limiter: ConcurrencyLimiter | None = None,
     ) -> None:
+        """Register endpoint.
+
+        Args:
+            route_meta (RouteMeta): path and cardinality of route.
+            handler (RouteHandlerCallable): request handler.
+            trust_level (TrustLevel | None, optional): trust level of request data. Defaults
+                to None, trust level of transport converter is used then.
+            sync_in_threadpool (bool, optional): run sync handler and sync dependencies in
+                thread pool so that they don't block event loop. Disable it for cheap sync
+                handlers to avoid overhead of thread switching. Defaults to True.
+            process_workers (int | None, optional): run CPU-bound handler in pool of this
+                number of worker processes, see `modapp.process_pool.RouteProcessPool`.
+                Defaults to None, handler is run in server process then.
+            concurrency_limiter (ConcurrencyLimiter | None, optional): limit of requests to
+                this route handled at once, limiters of routers apply too. Defaults to None.
+        """
         # TODO: logs only on registering in main router
-        if route_meta.path in self.routes:
+        if self.__has_route(route_meta.path):
             logger.warning(f'Route "{route_meta.path}" reregistered')
         else:
             logger.info(f'Route "{route_meta.path}" registered')
@@ -168,16 +327,8 @@ class APIRouter:
             if isinstance(parameter.default, Meta):
                 meta_kwargs[parameter_name] = parameter.default
             elif isinstance(parameter.default, Depends):
-                # if dependency is overwritten, use overwritten one, else default
-                if (
-                    self.dependency_overrides is not None
-                    and parameter.default.dependency in self.dependency_overrides
-                ):
-                    dependencies[parameter.name] = Depends(
-                        self.dependency_overrides[parameter.default.dependency]
-                    )
-                else:
-                    dependencies[parameter.name] = parameter.default
+                # overrides are applied to dependencies on all levels by Dependant
+                dependencies[parameter.name] = parameter.default
 
         request_type = handler_signature.parameters["request"].annotation
         return_type = handler_signature.return_annotation
@@ -197,18 +348,48 @@ class APIRouter:
             route_meta.cardinality,
             handler_meta_kwargs=meta_kwargs,
             dependencies=dependencies if len(dependencies.keys()) > 0 else None,
+            trust_level=trust_level,
+            dependency_overrides=self.dependency_overrides,
+            sync_in_threadpool=sync_in_threadpool,
+            process_workers=process_workers,
+            concurrency_limiter=concurrency_limiter,
         )
         handler.__modapp_route__ = self._routes[route_meta.path]
+        self._invalidate_routes_table()
 
     def add_route(self, route: Route) -> None:
         self._routes[route.path] = route
+        self._invalidate_routes_table()
 
     def include_router(self, router: APIRouter) -> None:
         self.child_routers.append(router)
+        router.parent_routers.append(self)
+        self._invalidate_routes_table()
 
     @property
     def routes(self) -> dict[str, Route]:
-        all_routes = self._routes.copy()
-        for router in self.child_routers:
-            all_routes.update(router.routes)
-        return all_routes
+        """All routes of this router and its child routers by path.
+
+        Table is built once and cached until the router tree changes. It is shared, don't
+        modify it.
+        """
+        if self._routes_table is None:
+            routes_table = self._routes.copy()
+            for router in self.child_routers:
+                routes_table.update(router.routes)
+            self._routes_table = routes_table
+        return self._routes_table
+
+    def _invalidate_routes_table(self) -> None:
+        if self._routes_table is None:
+            # tables of parents are built from this one, they are invalidated already
+            return
+        self._routes_table = None
+        for router in self.parent_routers:
+            router._invalidate_routes_table()
+
+    def __has_route(self, path: str) -> bool:
+        # doesn't rebuild table of this router, it changes on each registration of endpoint
+        return path in self._routes or any(
+            path in router.routes for router in self.child_routers
+        )
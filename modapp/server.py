@@ -6,14 +6,18 @@ from typing import TYPE_CHECKING, Any, Coroutine, Sequence
 
 from loguru import logger
 
+from modapp.background.concurrency import WorkerThreads
+from modapp.dependencies import AppDependencyScope
 from modapp.routing import APIRouter, Cardinality, RouteMeta
 from modapp.endpoints import keep_running as keep_running_endpoint_handler, health_check
 
 if TYPE_CHECKING:
     from typing import Callable
 
+    from modapp.base_converter import BaseConverter, TrustLevel
     from modapp.base_transport import BaseTransport, BaseTransportConfig
-    from modapp.dependencies import DependencyOverrides
+    from modapp.concurrency_limit import ConcurrencyLimiter
+    from modapp.dependencies import DependencyFunc, DependencyOverrides
     from modapp.types import DecoratedCallable
 
 
@@ -46,13 +50,50 @@ class Modapp:
         dependency_overrides: DependencyOverrides | None = None,
         keep_running_endpoint: bool = False,
         healthcheck_endpoint: bool = False,
+        app_dependencies: Sequence[DependencyFunc] | None = None,
+        threadpool_max_workers: int | None = None,
+        concurrency_limiter: ConcurrencyLimiter | None = None,
     ) -> None:
+        """Create application.
+
+        Args:
+            transports (Sequence[BaseTransport]): transports to serve routes on.
+            config (dict[str, BaseTransportConfig] | None, optional): transport configs by
+                config keys of transports. Defaults to None.
+            dependency_overrides (DependencyOverrides | None, optional): overrides of
+                dependency functions. Defaults to None.
+            keep_running_endpoint (bool, optional): add endpoint which keeps application
+                running until client disconnects. Defaults to False.
+            healthcheck_endpoint (bool, optional): add health check endpoint. Defaults to
+                False.
+            app_dependencies (Sequence[DependencyFunc] | None, optional): dependencies with
+                application lifetime, e.g. connection pools. They are entered before start of
+                transports and exited on stop, handlers and dependencies get them with
+                `Depends` as usual. Defaults to None.
+            threadpool_max_workers (int | None, optional): max number of threads running
+                sync handlers and dependencies of this application at once, see
+                `WorkerThreads`. Defaults to None, default of `ThreadPoolExecutor` is used
+                then.
+            concurrency_limiter (ConcurrencyLimiter | None, optional): global limit of
+                requests handled at once, limits of routes apply too. Defaults to None.
+        """
         self.transports = transports
         self.config: dict[str, BaseTransportConfig] = {}
         if config is not None:
             self.config = config
         self.dependency_overrides = dependency_overrides
-        self.router = APIRouter(dependency_overrides=dependency_overrides)
+        # limit of this application only, threads are shared by its routes
+        self.worker_threads = WorkerThreads(threadpool_max_workers)
+        self.router = APIRouter(
+            dependency_overrides=dependency_overrides,
+            concurrency_limiter=concurrency_limiter,
+        )
+        self.app_scope = AppDependencyScope(
+            app_dependencies or (), dependency_overrides=dependency_overrides
+        )
+        self._app_scope_closing_task: asyncio.Task[None] | None = None
+        # loop of `run`, application dependencies are closed in it after its stop
+        self._loop: asyncio.AbstractEventLoop | None = None
         if keep_running_endpoint:
             self.router.add_endpoint(
                 route_meta=RouteMeta(
@@ -76,6 +117,7 @@ class Modapp:
         except RuntimeError:
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
+        self._loop = loop
 
         loop.run_until_complete(self.run_async())
 
@@ -85,23 +127,85 @@ class Modapp:
             self.stop()
 
     async def run_async(self) -> None:
+        await self.app_scope.enter()
+        for route in self.router.routes.values():
+            route.set_app_scope(self.app_scope)
+            route.set_worker_threads(self.worker_threads)
+        # warm process pools of CPU-bound routes, converters are installed in their workers
+        converters: list[BaseConverter] = []
+        for transport in self.transports:
+            converters.extend(
+                converter
+                for converter in transport.converters
+                if all(converter is not known for known in converters)
+            )
+        await asyncio.gather(
+            *[
+                route.process_pool.start(converters)
+                for route in self.router.routes.values()
+                if route.process_pool is not None
+            ]
+        )
+
         await asyncio.gather(
             *[transport.start(self.router.routes) for transport in self.transports]
         )
         logger.info("Server has started")
 
     def stop(self) -> None:
+        """Stop application started with `run`, e.g. after KeyboardInterrupt.
+
+        If event loop is running, application dependencies are only scheduled to close. Use
+        `stop_async` in async code to wait until they are closed.
+        """
         # run API is async, but stop is sync, because using asyncio in except and finally blocks
         # on app end (e.g. after getting SIGINT) is quite tricky.
+        self.__stop_transports_and_pools()
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # stopped after loop end, e.g. by KeyboardInterrupt in `run`
+            if self._loop is not None and not self._loop.is_closed():
+                self._loop.run_until_complete(self.app_scope.close())
+            else:
+                asyncio.run(self.app_scope.close())
+        else:
+            self._app_scope_closing_task = loop.create_task(self.app_scope.close())
+        logger.info("Server stop")
+
+    async def stop_async(self) -> None:
+        """Stop application started with `run_async` and wait until application dependencies
+        are closed."""
+        self.__stop_transports_and_pools()
+        await self.app_scope.close()
+        logger.info("Server stop")
+
+    def __stop_transports_and_pools(self) -> None:
         for transport in self.transports:
             transport.stop()
-        logger.info("Server stop")
+        for route in self.router.routes.values():
+            if route.process_pool is not None:
+                route.process_pool.stop()
+        self.worker_threads.shutdown()
 
     def endpoint(
-        self, route_meta: RouteMeta
+        self,
+        route_meta: RouteMeta,
+        trust_level: TrustLevel | None = None,
+        sync_in_threadpool: bool = True,
+        process_workers: int | None = None,
+        concurrency_limiter: ConcurrencyLimiter | None = None,
     ) -> Callable[[DecoratedCallable], DecoratedCallable]:
         def decorator(func: DecoratedCallable) -> DecoratedCallable:
-            self.router.add_endpoint(route_meta, func)
+            self.router.add_endpoint(
+                route_meta,
+                func,
+                trust_level=trust_level,
+                sync_in_threadpool=sync_in_threadpool,
+                process_workers=process_workers,
+                concurrency_limiter=concurrency_limiter,
+            )
             return func
 
         return decorator
@@ -109,6 +213,10 @@ class Modapp:
     def include_router(self, router: APIRouter) -> None:
         for route in router.routes.values():
             self.router.add_route(route)
+        # routes are copied, but global concurrency limit of application router applies to
+        # them as to routes of child router
+        if self.router not in router.parent_routers:
+            router.parent_routers.append(self.router)
 
     def update_config(
         self, transport: BaseTransport, config: BaseTransportConfig
@@ -1,7 +1,15 @@
 from __future__ import annotations
 
 from functools import partial
-from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Coroutine, cast
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Coroutine,
+    Sequence,
+    cast,
+)
 
 from grpclib.const import Handler
 from grpclib.const import Status as GrpcStatus
@@ -13,14 +21,17 @@ from typing_extensions import override
 
 from modapp.base_converter import BaseConverter
 from modapp.base_transport import BaseTransport
+from modapp.converter_utils import select_grpc_converter
+from modapp.deadline import Deadline
 from modapp.errors import (
     BaseModappError,
+    DeadlineExceededError,
     InvalidArgumentError,
     NotFoundError,
+    ResourceExhaustedError,
     ServerError,
 )
 from modapp.routing import Cardinality
-from modapp.types import Metadata
 
 from .grpc_config import DEFAULT_CONFIG, GrpcTransportConfig
 
@@ -29,7 +40,13 @@ if TYPE_CHECKING:
 
 
 class RawCodec(CodecBase):
-    __content_subtype__ = "proto"
+    def __init__(self, content_subtype: str = "proto") -> None:
+        self.content_subtype = content_subtype
+
+    @property
+    @override
+    def __content_subtype__(self) -> str:
+        return self.content_subtype
 
     @override
     def encode(self, message: Any, message_type: Any) -> bytes:
@@ -71,6 +88,10 @@ def modapp_error_to_grpc(
         # does the same as return statement below, but shows explicitly mapping of ServerError to
         # GRPCError
         return GRPCError(status=GrpcStatus.INTERNAL)
+    elif isinstance(modapp_error, DeadlineExceededError):
+        return GRPCError(status=GrpcStatus.DEADLINE_EXCEEDED)
+    elif isinstance(modapp_error, ResourceExhaustedError):
+        return GRPCError(status=GrpcStatus.RESOURCE_EXHAUSTED)
     return GRPCError(status=GrpcStatus.INTERNAL)
 
 
@@ -79,8 +100,10 @@ class HandlerStorage:
         self,
         routes: RoutesDict,
         converter: BaseConverter,
+        # (route, raw data, meta, converter, deadline=...)
         request_callback: Callable[
-            [Route, bytes, Metadata], Coroutine[Any, Any, bytes | AsyncIterator[bytes]]
+            ...,
+            Coroutine[Any, Any, bytes | AsyncIterator[bytes]],
         ],
         error_details: bool,
     ) -> None:
@@ -98,8 +121,18 @@ class HandlerStorage:
                     request = await stream.recv_message()
                     assert request is not None
 
+                    # grpclib parses `grpc-timeout` header and cancels handler on deadline
+                    # too, modapp deadline is used to reply with DEADLINE_EXCEEDED and to
+                    # expose it to handlers
+                    deadline = (
+                        Deadline.from_timeout(stream.deadline.time_remaining())
+                        if stream.deadline is not None
+                        else None
+                    )
                     # TODO: pass meta
-                    response = await self.request_callback(route, request, {})
+                    response = await self.request_callback(
+                        route, request, {}, self.converter, deadline=deadline
+                    )
                     if (
                         route.proto_cardinality == Cardinality.UNARY_STREAM
                         or route.proto_cardinality == Cardinality.STREAM_STREAM
@@ -134,9 +167,12 @@ class GrpcTransport(BaseTransport):
     CONFIG_KEY = "grpc"
 
     def __init__(
-        self, config: GrpcTransportConfig, converter: BaseConverter | None = None
+        self,
+        config: GrpcTransportConfig,
+        converter: BaseConverter | None = None,
+        converters: Sequence[BaseConverter] | None = None,
     ) -> None:
-        super().__init__(config, converter)
+        super().__init__(config, converter, converters)
         self.server: Server | None = None
 
     @override
@@ -144,10 +180,18 @@ class GrpcTransport(BaseTransport):
         error_details = self.config.get(
             "error_details", DEFAULT_CONFIG["error_details"]
         )
+        # grpclib server accepts only one content subtype, prefer `proto` which is default
+        # for gRPC clients
+        converter = select_grpc_converter(self.converters, "proto")
+        if converter is None:
+            converter = self.converter
         handler_storage = HandlerStorage(
-            routes, self.converter, self.got_request, error_details
+            routes, converter, self.got_request, error_details
+        )
+        self.server = Server(
+            [handler_storage],
+            codec=RawCodec(converter.GRPC_CONTENT_SUBTYPE or "proto"),
         )
-        self.server = Server([handler_storage], codec=RawCodec())
 
         # listen(self.server, RecvRequest, recv_request)
 
@@ -4,6 +4,7 @@ from typing_extensions import override
 
 from modapp.base_converter import BaseConverter
 from modapp.base_transport import BaseTransport
+from modapp.deadline import Deadline
 from modapp.errors import ServerError
 from modapp.routing import RoutesDict
 
@@ -28,7 +29,10 @@ class InMemoryTransport(BaseTransport):
         self.routes = None
 
     async def handle_request(
-        self, route_path: str, request_data: bytes
+        self,
+        route_path: str,
+        request_data: bytes,
+        deadline: Optional[Deadline] = None,
     ) -> bytes | AsyncIterator[bytes]:
         if self.routes is None:
             raise Exception("Server need to be started first")  # TODO
@@ -38,7 +42,9 @@ class InMemoryTransport(BaseTransport):
             raise ServerError()  # TODO
         # with concurrent.futures.ThreadPoolExecutor() as executor:
         meta: dict[str, str | int | bool] = {}  # TODO
-        data = await self.got_request(route=route, raw_data=request_data, meta=meta)
+        data = await self.got_request(
+            route=route, raw_data=request_data, meta=meta, deadline=deadline
+        )
         return data
         # future = executor.submit(
         #     self.got_request, route, request_data, meta
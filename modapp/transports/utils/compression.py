@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import gzip
+import zlib
+
+# supported content codings in order of preference for the same quality
+SUPPORTED_ENCODINGS = ("gzip", "deflate")
+
+
+def select_encoding(accept_encoding: str | None) -> str | None:
+    """Select content coding of reply by value of `Accept-Encoding` header.
+
+    Returns:
+        str | None: `gzip`, `deflate` or None if reply should not be compressed.
+    """
+    if not accept_encoding:
+        return None
+
+    qualities: dict[str, float] = {}
+    for accept_item in accept_encoding.split(","):
+        coding, *parameters = accept_item.split(";")
+        quality = 1.0
+        for parameter in parameters:
+            name, _, value = parameter.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip().lower()] = quality
+
+    selected_encoding: str | None = None
+    selected_quality = 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > selected_quality:
+            selected_encoding = encoding
+            selected_quality = quality
+    return selected_encoding
+
+
+def compress(data: bytes, encoding: str, level: int = 6) -> bytes:
+    """Compress data with `gzip` or `deflate` (zlib format, as it is defined in HTTP) content
+    coding."""
+    if encoding == "gzip":
+        # fixed mtime: the same data is compressed to the same bytes
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    if encoding == "deflate":
+        return zlib.compress(data, level)
+    raise ValueError(f"Unsupported content coding: {encoding}")
+
+
+def decompress(data: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.decompress(data)
+    if encoding == "deflate":
+        return zlib.decompress(data)
+    raise ValueError(f"Unsupported content coding: {encoding}")
+
+
+def compress_if_needed(
+    data: bytes, encoding: str | None, min_size: int | None, level: int = 6
+) -> tuple[bytes, str | None]:
+    """Compress data if encoding is selected and data is not smaller than `min_size`.
+
+    Returns:
+        tuple[bytes, str | None]: data and its content coding, None if data is not compressed.
+    """
+    if encoding is None or min_size is None or len(data) < min_size:
+        return data, None
+    return compress(data, encoding, level), encoding
+
+
+__all__ = [
+    "SUPPORTED_ENCODINGS",
+    "select_encoding",
+    "compress",
+    "decompress",
+    "compress_if_needed",
+]
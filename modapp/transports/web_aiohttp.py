@@ -4,7 +4,7 @@ import asyncio
 from functools import partial
 import json
 from pathlib import Path
-from typing import TYPE_CHECKING, AsyncIterator
+from typing import TYPE_CHECKING, AsyncIterator, Sequence, cast
 import uuid
 
 from aiohttp import web, WSMsgType
@@ -13,24 +13,23 @@ from typing_extensions import override
 
 from modapp.base_converter import BaseConverter
 from modapp.base_transport import BaseTransport
-
-try:
-    from modapp.converters.json import JsonConverter
-except ImportError:
-    JsonConverter = None
-try:
-    from modapp.converters.protobuf import ProtobufConverter
-except ImportError:
-    ProtobufConverter = None
-
+from modapp.converter_utils import select_converter, select_reply_converter
+from modapp.deadline import TIMEOUT_HEADER, deadline_from_header
 from modapp.errors import (
+    DeadlineExceededError,
     InvalidArgumentError,
     NotFoundError,
+    ResourceExhaustedError,
     ServerError,
 )
 from modapp.routing import Cardinality, Route
 
 from .web_aiohttp_config import DEFAULT_CONFIG, WebAiohttpTransportConfig
+from .utils.compression import (
+    SUPPORTED_ENCODINGS,
+    compress_if_needed,
+    select_encoding,
+)
 from .utils.free_port import get_free_port
 
 if TYPE_CHECKING:
@@ -39,7 +38,9 @@ if TYPE_CHECKING:
 
 def _get_cors_headers(cors_allow: str | None) -> dict[str, str]:
     headers = {
-        "Access-Control-Allow-Headers": "Connection-Id, Content-Type, Stream-Id"
+        "Access-Control-Allow-Headers": (
+            f"Accept, Connection-Id, Content-Type, Stream-Id, {TIMEOUT_HEADER}"
+        )
     }
     if cors_allow is not None:
         headers["Access-Control-Allow-Origin"] = cors_allow
@@ -53,13 +54,13 @@ def _exception_to_response(
         return web.HTTPNotFound(
             headers=_get_cors_headers(cors_allow),
             body=converter.error_to_raw(error),
-            content_type=_get_content_type(converter),
+            content_type=converter.CONTENT_TYPE,
         )
     elif isinstance(error, InvalidArgumentError):
         return web.HTTPUnprocessableEntity(
             headers=_get_cors_headers(cors_allow),
             body=converter.error_to_raw(error),
-            content_type=_get_content_type(converter),
+            content_type=converter.CONTENT_TYPE,
         )
     elif isinstance(error, ServerError):
         # does the same as return statement below, but shows explicitly mapping of ServerError to
@@ -67,22 +68,24 @@ def _exception_to_response(
         return web.HTTPInternalServerError(
             headers=_get_cors_headers(cors_allow),
             body=converter.error_to_raw(error),
-            content_type=_get_content_type(converter),
+            content_type=converter.CONTENT_TYPE,
+        )
+    elif isinstance(error, DeadlineExceededError):
+        return web.HTTPGatewayTimeout(
+            headers=_get_cors_headers(cors_allow),
+            body=converter.error_to_raw(error),
+            content_type=converter.CONTENT_TYPE,
+        )
+    elif isinstance(error, ResourceExhaustedError):
+        return web.HTTPServiceUnavailable(
+            headers=_get_cors_headers(cors_allow),
+            body=converter.error_to_raw(error),
+            content_type=converter.CONTENT_TYPE,
         )
 
     return web.HTTPInternalServerError(headers=_get_cors_headers(cors_allow))
 
 
-def _get_content_type(converter: BaseConverter) -> str:
-    if JsonConverter is not None and isinstance(converter, JsonConverter):
-        content_type = "application/json"
-    elif ProtobufConverter is not None and isinstance(converter, ProtobufConverter):
-        content_type = "application/octet-stream"
-    else:
-        content_type = ""
-    return content_type
-
-
 class WebAiohttpTransport(BaseTransport):
     CONFIG_KEY = "web_aiohttp"
 
@@ -90,13 +93,16 @@ class WebAiohttpTransport(BaseTransport):
         self,
         config: WebAiohttpTransportConfig,
         converter: BaseConverter | None = None,
+        converters: Sequence[BaseConverter] | None = None,
     ) -> None:
-        super().__init__(config, converter)
+        super().__init__(config, converter, converters)
         self.port: int = 0
         self.app: web.Application | None = None
         self._static_dirs: dict[str, Path] = {}
         self._runner: web.AppRunner | None = None
         self._msg_queue_by_conn_id: dict[str, asyncio.Queue] = {}
+        # content coding of stream messages requested by websocket connection
+        self._compression_by_conn_id: dict[str, str | None] = {}
         self._stream_ids: list[str] = []
         self._sending_to_ws_tasks: list[asyncio.Task] = []
 
@@ -172,19 +178,51 @@ class WebAiohttpTransport(BaseTransport):
         data = await request.content.read()
         cors_allow = transport.config.get("cors_allow", DEFAULT_CONFIG["cors_allow"])
 
+        converter = select_converter(
+            transport.converters, request.headers.get("Content-Type")
+        )
+        if converter is None:
+            logger.error(
+                f"No converter for content type {request.headers.get('Content-Type')}"
+            )
+            raise web.HTTPUnsupportedMediaType(headers=_get_cors_headers(cors_allow))
+        reply_converter = select_reply_converter(
+            transport.converters, request.headers.get("Accept"), converter
+        )
+        deadline = deadline_from_header(request.headers.get(TIMEOUT_HEADER))
+
         if route.proto_cardinality == Cardinality.UNARY_UNARY:
             try:
                 result = await transport.got_request(
-                    route=route, raw_data=data, meta={}
+                    route=route,
+                    raw_data=data,
+                    meta={},
+                    converter=converter,
+                    reply_converter=reply_converter,
+                    deadline=deadline,
                 )
             except Exception as error:
-                raise _exception_to_response(error, transport.converter, cors_allow)
+                raise _exception_to_response(error, reply_converter, cors_allow)
+
+            assert isinstance(result, bytes)
+            headers = _get_cors_headers(cors_allow)
+            compression_min_size = self._get_compression_min_size()
+            if compression_min_size is not None:
+                headers["Vary"] = "Accept-Encoding"
+            body, content_encoding = compress_if_needed(
+                result,
+                select_encoding(request.headers.get("Accept-Encoding")),
+                compression_min_size,
+                self._get_compression_level(),
+            )
+            if content_encoding is not None:
+                headers["Content-Encoding"] = content_encoding
 
             return web.Response(
-                body=result,
+                body=body,
                 status=201,
-                headers=_get_cors_headers(cors_allow),
-                content_type=_get_content_type(transport.converter),
+                headers=headers,
+                content_type=reply_converter.CONTENT_TYPE,
             )
         elif route.proto_cardinality == Cardinality.UNARY_STREAM:
             conn_id = request.headers.get("Connection-Id")
@@ -208,19 +246,33 @@ class WebAiohttpTransport(BaseTransport):
             while stream_id in self._stream_ids:
                 stream_id = str(uuid.uuid4())
 
-            response_stream = await self.got_request(
-                route=route, raw_data=data, meta={}
-            )
+            try:
+                response_stream = await self.got_request(
+                    route=route,
+                    raw_data=data,
+                    meta={},
+                    converter=converter,
+                    reply_converter=reply_converter,
+                    deadline=deadline,
+                )
+            except (DeadlineExceededError, ResourceExhaustedError) as error:
+                raise _exception_to_response(error, reply_converter, cors_allow)
             assert isinstance(response_stream, AsyncIterator)
             sending_task = asyncio.create_task(
-                self._send_messages_to_ws(response_stream, conn_id, stream_id)
+                self._send_messages_to_ws(
+                    response_stream,
+                    conn_id,
+                    stream_id,
+                    # only JSON can be embedded in text messages
+                    is_binary=reply_converter.CONTENT_TYPE != "application/json",
+                )
             )
             self._sending_to_ws_tasks.append(sending_task)
 
             return web.Response(
                 status=201,
                 headers={**_get_cors_headers(cors_allow), "Stream-Id": stream_id},
-                content_type=_get_content_type(transport.converter),
+                content_type=reply_converter.CONTENT_TYPE,
             )
 
         # TODO: how to stop on both ends?
@@ -228,13 +280,50 @@ class WebAiohttpTransport(BaseTransport):
         # TODO: other cardinalities
 
     async def _send_messages_to_ws(
-        self, iterator: AsyncIterator[bytes], connection_id: str, stream_id: str
+        self,
+        iterator: AsyncIterator[bytes],
+        connection_id: str,
+        stream_id: str,
+        is_binary: bool,
     ):
         conn_queue = self._msg_queue_by_conn_id[connection_id]
+        compression = self._compression_by_conn_id.get(connection_id)
+        compression_min_size = self._get_compression_min_size()
+        compression_level = self._get_compression_level()
+        # header of binary messages without content coding is the same for all of them
+        binary_msg_header = json.dumps({"streamId": stream_id}).encode() + b"\n"
         async for msg in iterator:
-            await conn_queue.put(json.dumps({ "streamId": stream_id, "message": msg.decode() }))
+            msg, content_encoding = compress_if_needed(
+                msg, compression, compression_min_size, compression_level
+            )
+            if content_encoding is not None:
+                # binary message: JSON header, new line, message data
+                await conn_queue.put(
+                    json.dumps(
+                        {"streamId": stream_id, "contentEncoding": content_encoding}
+                    ).encode()
+                    + b"\n"
+                    + msg
+                )
+            elif is_binary:
+                await conn_queue.put(binary_msg_header + msg)
+            else:
+                await conn_queue.put(
+                    json.dumps({"streamId": stream_id, "message": msg.decode()})
+                )
         await conn_queue.put(json.dumps({ "streamId": stream_id, "end": True }))
 
+    def _get_compression_min_size(self) -> int | None:
+        return cast(
+            "int | None",
+            self.config.get("compression_min_size", DEFAULT_CONFIG["compression_min_size"]),
+        )
+
+    def _get_compression_level(self) -> int:
+        return cast(
+            int, self.config.get("compression_level", DEFAULT_CONFIG["compression_level"])
+        )
+
     async def options_handler(
         self, request: web.Request, cors_allow: str | None
     ) -> web.Response:
@@ -269,6 +358,11 @@ class WebAiohttpTransport(BaseTransport):
 
         conn_queue = asyncio.Queue()
         self._msg_queue_by_conn_id[conn_id] = conn_queue
+        # connection can request compression of stream messages: /ws?compression=gzip
+        compression = request.query.get("compression")
+        self._compression_by_conn_id[conn_id] = (
+            compression if compression in SUPPORTED_ENCODINGS else None
+        )
         conn_id_msg = {"connectionId": conn_id}
         await ws.send_str(data=json.dumps(conn_id_msg))
 
@@ -282,6 +376,7 @@ class WebAiohttpTransport(BaseTransport):
                     ws.exception())
 
         sending_task.cancel()
+        self._compression_by_conn_id.pop(conn_id, None)
         for task in self._sending_to_ws_tasks:
             task.cancel()
         self._sending_to_ws_tasks = []
@@ -292,8 +387,10 @@ class WebAiohttpTransport(BaseTransport):
         while True:
             msg = await connection_queue.get()
             # TODO: allow to end connection
-            # TODO: support of all converters, not only json
-            await ws.send_str(msg)
+            if isinstance(msg, bytes):
+                await ws.send_bytes(msg)
+            else:
+                await ws.send_str(msg)
 
     @override
     def stop(self) -> None:
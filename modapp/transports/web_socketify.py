@@ -9,7 +9,7 @@ from __future__ import annotations
 import secrets
 from functools import partial
 from pathlib import Path
-from typing import TYPE_CHECKING, AsyncIterator
+from typing import TYPE_CHECKING, AsyncIterator, Sequence, cast
 
 from loguru import logger
 from socketify import (
@@ -25,19 +25,18 @@ from typing_extensions import override
 
 from modapp.base_converter import BaseConverter
 from modapp.base_transport import BaseTransport
-
-try:
-    from modapp.converters.json import JsonConverter
-except ImportError:
-    JsonConverter = None
-try:
-    from modapp.converters.protobuf import ProtobufConverter
-except ImportError:
-    ProtobufConverter = None
-
-from modapp.errors import InvalidArgumentError, NotFoundError, ServerError
+from modapp.converter_utils import select_converter, select_reply_converter
+from modapp.deadline import TIMEOUT_HEADER, deadline_from_header
+from modapp.errors import (
+    DeadlineExceededError,
+    InvalidArgumentError,
+    NotFoundError,
+    ResourceExhaustedError,
+    ServerError,
+)
 from modapp.routing import Cardinality, Route
 
+from .utils.compression import compress_if_needed, select_encoding
 from .web_socketify_config import DEFAULT_CONFIG, WebSocketifyTransportConfig
 
 if TYPE_CHECKING:
@@ -61,7 +60,8 @@ def _add_cors_headers_to_response(
     if cors_allow is not None:
         response.write_header("Access-Control-Allow-Origin", cors_allow)
         response.write_header(
-            "Access-Control-Allow-Headers", "Connection-Id, Request-Id, Content-Type"
+            "Access-Control-Allow-Headers",
+            f"Accept, Connection-Id, Request-Id, Content-Type, {TIMEOUT_HEADER}",
         )
     return response
 
@@ -80,8 +80,9 @@ class WebSocketifyTransport(BaseTransport):
         self,
         config: WebSocketifyTransportConfig,
         converter: BaseConverter | None = None,
+        converters: Sequence[BaseConverter] | None = None,
     ) -> None:
-        super().__init__(config, converter)
+        super().__init__(config, converter, converters)
         self.port: int = 0
         self.app: App | None = None
         self._static_dirs: dict[str, Path] = {}
@@ -99,9 +100,16 @@ class WebSocketifyTransport(BaseTransport):
     async def _send_stream_responses_in_ws(
         self, stream: AsyncIterator[bytes], ws: WebSocket, request_id: str
     ) -> None:
+        compression_min_size = self._get_compression_min_size()
         async for message in stream:
             # TODO: build message with metadata like request_id
-            ws.send(message)
+            # permessage-deflate is negotiated per connection, skip it for small messages
+            ws.send(
+                message,
+                OpCode.BINARY,
+                compress=compression_min_size is not None
+                and len(message) >= compression_min_size,
+            )
 
     @override
     async def start(self, routes: RoutesDict) -> None:
@@ -114,6 +122,16 @@ class WebSocketifyTransport(BaseTransport):
 
         @self.app.on_error
         def on_error(error, response: Response, request: Request) -> None:
+            # errors are encoded in the same format as replies would be
+            reply_converter = self.converter
+            if request is not None:
+                reply_converter = select_reply_converter(
+                    self.converters,
+                    request.get_header("accept"),
+                    select_converter(self.converters, request.get_header("content-type"))
+                    or self.converter,
+                )
+
             if isinstance(error, NotFoundError):
                 response.write_status(404)
                 # limitation of websocketify: headers can be set only after status, set in each
@@ -122,7 +140,7 @@ class WebSocketifyTransport(BaseTransport):
                     response,
                     self.config.get("cors_allow", DEFAULT_CONFIG["cors_allow"]),
                 )
-                response.end(self.converter.error_to_raw(error))
+                response.end(reply_converter.error_to_raw(error))
                 return
             elif isinstance(error, InvalidArgumentError):
                 response.write_status(422)
@@ -132,7 +150,7 @@ class WebSocketifyTransport(BaseTransport):
                     response,
                     self.config.get("cors_allow", DEFAULT_CONFIG["cors_allow"]),
                 )
-                response.end(self.converter.error_to_raw(error))
+                response.end(reply_converter.error_to_raw(error))
                 return
             elif isinstance(error, ServerError):
                 # does the same as return statement below, but shows explicitly mapping of ServerError to
@@ -145,7 +163,19 @@ class WebSocketifyTransport(BaseTransport):
                     response,
                     self.config.get("cors_allow", DEFAULT_CONFIG["cors_allow"]),
                 )
-                response.end(self.converter.error_to_raw(_error))
+                response.end(reply_converter.error_to_raw(_error))
+                return
+            elif isinstance(error, (DeadlineExceededError, ResourceExhaustedError)):
+                response.write_status(
+                    504 if isinstance(error, DeadlineExceededError) else 503
+                )
+                # limitation of websocketify: headers can be set only after status, set in each
+                # branch separately
+                _add_cors_headers_to_response(
+                    response,
+                    self.config.get("cors_allow", DEFAULT_CONFIG["cors_allow"]),
+                )
+                response.end(reply_converter.error_to_raw(error))
                 return
             _error = ServerError()
             response.write_status(500)
@@ -155,7 +185,7 @@ class WebSocketifyTransport(BaseTransport):
                 response,
                 self.config.get("cors_allow", DEFAULT_CONFIG["cors_allow"]),
             )
-            response.end(self.converter.error_to_raw(_error))
+            response.end(reply_converter.error_to_raw(_error))
             logger.exception(error)
 
         for route_path, route in routes.items():
@@ -167,22 +197,48 @@ class WebSocketifyTransport(BaseTransport):
                 # NOTE: if we explicitly set status, it should be done before headers:
                 # https://github.com/cirospaciari/socketify.py/issues/144
 
+                converter = select_converter(
+                    self.converters, request.get_header("content-type")
+                )
+                if converter is None:
+                    logger.error(
+                        "No converter for content type"
+                        f" {request.get_header('content-type')}"
+                    )
+                    _add_cors_headers_to_response(
+                        response.write_status(415),
+                        self.config.get("cors_allow", DEFAULT_CONFIG["cors_allow"]),
+                    ).end("Unsupported media type")
+                    return
+                reply_converter = select_reply_converter(
+                    self.converters, request.get_header("accept"), converter
+                )
+                deadline = deadline_from_header(
+                    request.get_header(TIMEOUT_HEADER.lower())
+                )
+
                 if route.proto_cardinality == Cardinality.UNARY_UNARY:
                     result = await self.got_request(
-                        route=route, raw_data=data.getvalue(), meta={}
+                        route=route,
+                        raw_data=data.getvalue(),
+                        meta={},
+                        converter=converter,
+                        reply_converter=reply_converter,
+                        deadline=deadline,
+                    )
+                    assert isinstance(result, bytes)
+                    compression_min_size = self._get_compression_min_size()
+                    result, content_encoding = compress_if_needed(
+                        result,
+                        select_encoding(request.get_header("accept-encoding")),
+                        compression_min_size,
+                        self._get_compression_level(),
                     )
-                    if JsonConverter is not None and isinstance(
-                        self.converter, JsonConverter
-                    ):
-                        content_type = "application/json"
-                    elif ProtobufConverter is not None and isinstance(
-                        self.converter, ProtobufConverter
-                    ):
-                        content_type = "application/octet-stream"
-                    else:
-                        content_type = ""
-
-                    response.write_header("Content-Type", content_type)
+                    response.write_header("Content-Type", reply_converter.CONTENT_TYPE)
+                    if compression_min_size is not None:
+                        response.write_header("Vary", "Accept-Encoding")
+                    if content_encoding is not None:
+                        response.write_header("Content-Encoding", content_encoding)
                     _add_cors_headers_to_response(
                         response,
                         self.config.get("cors_allow", DEFAULT_CONFIG["cors_allow"]),
@@ -221,7 +277,12 @@ class WebSocketifyTransport(BaseTransport):
                         return
 
                     response_stream = await self.got_request(
-                        route=route, raw_data=data.getvalue(), meta={}
+                        route=route,
+                        raw_data=data.getvalue(),
+                        meta={},
+                        converter=converter,
+                        reply_converter=reply_converter,
+                        deadline=deadline,
                     )
                     # TODO: schedule execution
                     await self._send_stream_responses_in_ws(
@@ -258,7 +319,11 @@ class WebSocketifyTransport(BaseTransport):
         self.app.ws(
             "/stream",
             {
-                "compression": CompressOptions.SHARED_COMPRESSOR,
+                "compression": (
+                    CompressOptions.SHARED_COMPRESSOR
+                    if self._get_compression_min_size() is not None
+                    else CompressOptions.DISABLED
+                ),
                 "max_payload_length": self.config.get(
                     "max_message_size_kb", DEFAULT_CONFIG["max_message_size_kb"]
                 ),
@@ -327,5 +392,16 @@ class WebSocketifyTransport(BaseTransport):
         else:
             logger.warning("Cannot stop not started server")
 
+    def _get_compression_min_size(self) -> int | None:
+        return cast(
+            "int | None",
+            self.config.get("compression_min_size", DEFAULT_CONFIG["compression_min_size"]),
+        )
+
+    def _get_compression_level(self) -> int:
+        return cast(
+            int, self.config.get("compression_level", DEFAULT_CONFIG["compression_level"])
+        )
+
 
 __all__ = ["WebSocketifyTransport", "WebSocketifyTransportConfig"]
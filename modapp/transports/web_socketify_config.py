@@ -8,10 +8,17 @@ class WebSocketifyTransportConfig(BaseTransportConfig):
     # attribute of the transport after its start
     port: NotRequired[int | None]
     cors_allow: NotRequired[str | None]
+    # replies and stream messages smaller than this number of bytes are sent uncompressed. None
+    # disables compression. Replies are compressed only if client accepts it
+    compression_min_size: NotRequired[int | None]
+    # zlib compression level from 1 (fastest) to 9 (smallest)
+    compression_level: NotRequired[int]
 
 
 DEFAULT_CONFIG: WebSocketifyTransportConfig = {
     "port": 3000,
     "max_message_size_kb": 4096,
     "cors_allow": None,
+    "compression_min_size": 1024,
+    "compression_level": 6,
 }
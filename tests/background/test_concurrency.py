@@ -0,0 +1,22 @@
+import contextvars
+import threading
+
+from modapp.background import concurrency
+from modapp.background.concurrency import run_in_threadpool
+
+request_id = contextvars.ContextVar("request_id", default="")
+
+
+def get_request_id(prefix: str) -> tuple[str, int]:
+    return prefix + request_id.get(), threading.get_ident()
+
+
+async def test_run_in_threadpool_without_anyio(monkeypatch):
+    monkeypatch.setattr(concurrency, "anyio", None)
+    monkeypatch.setattr(concurrency, "_executor", None)
+    request_id.set("1")
+
+    result, thread_id = await run_in_threadpool(get_request_id, prefix="request ")
+
+    assert result == "request 1"
+    assert thread_id != threading.get_ident()
@@ -3,9 +3,10 @@ import importlib
 import uuid
 import pkg_resources
 from inspect import isclass
+import array
 from datetime import datetime, timezone
 from dataclasses import dataclass
-from typing import Generic, Type
+from typing import Any, Generic, Type
 from pathlib import Path
 
 from google.protobuf import message
@@ -76,6 +77,9 @@ class PydanticTestContext(Generic[ModelType]):
 # TODO: test model defaults
 # TODO: test correct result if wrong model is passed to raw_to_model
 class ProtobufConverterBaseTestSuite:
+    # options passed to the converter, allow to run the same suite in different modes
+    converter_options: dict[str, Any] = {}
+
     def arrange_test_scalars(
         self, tmp_path: Path
     ) -> PydanticTestContext[data.MessageWithScalars]:
@@ -83,7 +87,9 @@ class ProtobufConverterBaseTestSuite:
             data.message_with_scalars_proto_src,
             tmp_path,
         )
-        converter = ProtobufConverter(protos=generated_protos)
+        converter = ProtobufConverter(
+            protos=generated_protos, **self.converter_options
+        )
         proto_instance = generated_protos[
             "modapp.tests.converters.protobuf.scalars.MessageWithScalars"
         ](
@@ -138,7 +144,9 @@ class ProtobufConverterBaseTestSuite:
             data.message_with_enum_proto_src,
             tmp_path,
         )
-        converter = ProtobufConverter(protos=generated_protos)
+        converter = ProtobufConverter(
+            protos=generated_protos, **self.converter_options
+        )
         proto_instance = generated_protos[
             "modapp.tests.converters.protobuf.enum_test.MessageWithEnum"
         ](
@@ -167,7 +175,9 @@ class ProtobufConverterBaseTestSuite:
             data.message_to_test_defaults_proto_src,
             tmp_path,
         )
-        converter = ProtobufConverter(protos=generated_protos)
+        converter = ProtobufConverter(
+            protos=generated_protos, **self.converter_options
+        )
         proto_instance = generated_protos[
             "modapp.tests.converters.protobuf.defaults.MessageToTestDefaults"
         ]()
@@ -206,7 +216,9 @@ class ProtobufConverterBaseTestSuite:
             data.nested_messages_proto_src,
             tmp_path,
         )
-        converter = ProtobufConverter(protos=generated_protos)
+        converter = ProtobufConverter(
+            protos=generated_protos, **self.converter_options
+        )
         level3_proto_instance = generated_protos[
             "modapp.tests.converters.protobuf.nested_messages.MessageLevel3"
         ](result="success")
@@ -242,7 +254,9 @@ class ProtobufConverterBaseTestSuite:
             data.message_with_scalar_repeated_proto_src,
             tmp_path,
         )
-        converter = ProtobufConverter(protos=generated_protos)
+        converter = ProtobufConverter(
+            protos=generated_protos, **self.converter_options
+        )
         proto_instance = generated_protos[
             "modapp.tests.converters.protobuf.scalar_repeated.MessageWithScalarRepeated"
         ](integer_repeated=[56, -223, 91, 4412])
@@ -267,7 +281,9 @@ class ProtobufConverterBaseTestSuite:
             data.message_repeated_proto_src,
             tmp_path,
         )
-        converter = ProtobufConverter(protos=generated_protos)
+        converter = ProtobufConverter(
+            protos=generated_protos, **self.converter_options
+        )
         proto_instance = generated_protos[
             "modapp.tests.converters.protobuf.message_repeated.MessageWithMessageRepeated"
         ](
@@ -304,7 +320,9 @@ class ProtobufConverterBaseTestSuite:
             data.nested_message_repeated_proto_src,
             tmp_path,
         )
-        converter = ProtobufConverter(protos=generated_protos)
+        converter = ProtobufConverter(
+            protos=generated_protos, **self.converter_options
+        )
         proto_instance = generated_protos[
             "modapp.tests.converters.protobuf.nested_message_repeated.MessageWithNestedMessageRepeated"
         ](
@@ -361,7 +379,9 @@ class ProtobufConverterBaseTestSuite:
             data.one_of_scalars_proto_src,
             tmp_path,
         )
-        converter = ProtobufConverter(protos=generated_protos)
+        converter = ProtobufConverter(
+            protos=generated_protos, **self.converter_options
+        )
         proto_instance = generated_protos[
             "modapp.tests.converters.protobuf.one_of_scalars.MessageToTestOneOfScalars"
         ](str_field="string in one field", double_field=9514.73)
@@ -386,7 +406,9 @@ class ProtobufConverterBaseTestSuite:
             data.one_of_defaults_proto_src,
             tmp_path,
         )
-        converter = ProtobufConverter(protos=generated_protos)
+        converter = ProtobufConverter(
+            protos=generated_protos, **self.converter_options
+        )
         proto_instance = generated_protos[
             "modapp.tests.converters.protobuf.one_of_defaults.MessageToTestOneOfDefaults"
         ]()
@@ -411,7 +433,9 @@ class ProtobufConverterBaseTestSuite:
             data.one_of_nested_messages_proto_src,
             tmp_path,
         )
-        converter = ProtobufConverter(protos=generated_protos)
+        converter = ProtobufConverter(
+            protos=generated_protos, **self.converter_options
+        )
         proto_instance = generated_protos[
             "modapp.tests.converters.protobuf.one_of_nested_messages.MessageToTestOneOfNestedMessages"
         ](
@@ -468,7 +492,9 @@ class ProtobufConverterBaseTestSuite:
             data.test_timestamp_proto_src,
             tmp_path,
         )
-        converter = ProtobufConverter(protos=generated_protos)
+        converter = ProtobufConverter(
+            protos=generated_protos, **self.converter_options
+        )
         proto_instance = generated_protos[
             "modapp.tests.converters.protobuf.test_timestamp.MessageWithTimestamp"
         ](created_at=Timestamp(seconds=1692002513, nanos=585000000))
@@ -502,7 +528,9 @@ class ProtobufConverterBaseTestSuite:
             data.test_map_proto_src,
             tmp_path,
         )
-        converter = ProtobufConverter(protos=generated_protos)
+        converter = ProtobufConverter(
+            protos=generated_protos, **self.converter_options
+        )
         proto_instance = generated_protos[
             "modapp.tests.converters.protobuf.test_map.MessageWithMap"
         ](countries_names={"ua": "Ukraine", "at": "Austria", "us": "United States"})
@@ -527,7 +555,9 @@ class ProtobufConverterBaseTestSuite:
             data.test_nested_map_proto_src,
             tmp_path,
         )
-        converter = ProtobufConverter(protos=generated_protos)
+        converter = ProtobufConverter(
+            protos=generated_protos, **self.converter_options
+        )
         # proto instance
         city_kyiv_proto = generated_protos[
             "modapp.tests.converters.protobuf.test_nested_map.CityInfo"
@@ -593,3 +623,36 @@ class ProtobufConverterBaseTestSuite:
 
     def test_nested_map(self, tmp_path: Path) -> None:
         raise NotImplementedError()
+
+    def arrange_packed_repeated_test(
+        self, tmp_path: Path
+    ) -> PydanticTestContext[data.MessageWithPackedRepeated]:
+        generated_protos = generate_proto(
+            data.packed_repeated_proto_src,
+            tmp_path,
+        )
+        converter = ProtobufConverter(
+            protos=generated_protos, **self.converter_options
+        )
+        proto_instance = generated_protos[
+            "modapp.tests.converters.protobuf.packed_repeated.MessageWithPackedRepeated"
+        ](
+            name="sensor",
+            samples=[0.5, -1.25, 1e10],
+            counters=[1, 2**40, -3],
+        )
+        model_instance = data.MessageWithPackedRepeated(
+            name="sensor",
+            samples=array.array("d", [0.5, -1.25, 1e10]),
+            counters=array.array("q", [1, 2**40, -3]),
+        )
+        return PydanticTestContext[data.MessageWithPackedRepeated](
+            converter=converter,
+            proto_instance=proto_instance,
+            generated_protos=generated_protos,
+            model_cls=data.MessageWithPackedRepeated,
+            model_instance_ref=model_instance,
+        )
+
+    def test_packed_repeated(self, tmp_path: Path) -> None:
+        raise NotImplementedError()
@@ -3,6 +3,7 @@ from datetime import datetime
 from enum import Enum
 
 from modapp.models.pydantic import PydanticModel as BaseModel
+from modapp.packed import PackedFloat64Array, PackedInt64Array
 
 
 class MessageWithScalars(BaseModel):
@@ -443,3 +444,25 @@ class MessageWithNestedMap(BaseModel):
     __modapp_path__ = (
         "modapp.tests.converters.protobuf.test_nested_map.MessageWithNestedMap"
     )
+
+
+packed_repeated_proto_src = """
+syntax = "proto3";
+package modapp.tests.converters.protobuf.packed_repeated;
+
+message MessageWithPackedRepeated {
+    string name = 1;
+    repeated double samples = 2;
+    repeated int64 counters = 3;
+}
+"""
+
+
+class MessageWithPackedRepeated(BaseModel):
+    name: str
+    samples: PackedFloat64Array
+    counters: PackedInt64Array
+
+    __modapp_path__ = (
+        "modapp.tests.converters.protobuf.packed_repeated.MessageWithPackedRepeated"
+    )
@@ -95,3 +95,35 @@ class TestProtobufConverterRawToModel(ProtobufConverterBaseTestSuite):
         raw_data = context.converter.model_to_raw(model=context.model_instance_ref)
 
         assert raw_data == context.proto_instance.SerializeToString()
+
+    def test_packed_repeated(self, tmp_path: Path) -> None:
+        context = self.arrange_packed_repeated_test(tmp_path)
+
+        raw_data = context.converter.model_to_raw(model=context.model_instance_ref)
+
+        # packed fields are appended to the end of the message, compare parsed messages
+        assert type(context.proto_instance).FromString(raw_data) == context.proto_instance
+
+    def test_encode_plan_is_cached(self, tmp_path: Path) -> None:
+        context = self.arrange_one_of_scalars_test(tmp_path)
+
+        first_raw_data = context.converter.model_to_raw(model=context.model_instance_ref)
+        plan = context.converter._get_encode_plan(context.model_cls)
+        second_raw_data = context.converter.model_to_raw(model=context.model_instance_ref)
+
+        assert context.converter._get_encode_plan(context.model_cls) is plan
+        assert first_raw_data == second_raw_data
+        assert second_raw_data == context.proto_instance.SerializeToString()
+
+    def test_models_to_raw_many(self, tmp_path: Path) -> None:
+        context = self.arrange_nested_map_test(tmp_path)
+
+        raw_data = context.converter.models_to_raw_many(
+            models=[context.model_instance_ref, context.model_instance_ref]
+        )
+
+        assert raw_data == [context.proto_instance.SerializeToString()] * 2
+
+
+class TestProtobufConverterDirectModelToRaw(TestProtobufConverterRawToModel):
+    converter_options = {"direct_encode": True}
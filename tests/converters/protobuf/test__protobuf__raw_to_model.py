@@ -4,9 +4,11 @@ Notes:
     with the same name and in the same package can conflict even if they are in different files.
 """
 from __future__ import annotations
+import array
 import math
 from pathlib import Path
 
+from modapp.base_converter import TrustLevel
 from tests.converters.protobuf.base_testsuite import ProtobufConverterBaseTestSuite
 
 
@@ -186,3 +188,70 @@ class TestProtobufConverterRawToModel(ProtobufConverterBaseTestSuite):
         )
 
         assert model_instance == context.model_instance_ref
+
+    def test_packed_repeated(self, tmp_path: Path) -> None:
+        context = self.arrange_packed_repeated_test(tmp_path)
+
+        model_instance = context.converter.raw_to_model(
+            raw=context.proto_instance.SerializeToString(),
+            model_cls=context.model_cls,
+        )
+
+        assert isinstance(model_instance.samples, array.array)
+        assert isinstance(model_instance.counters, array.array)
+        assert model_instance == context.model_instance_ref
+
+    def test_decode_plan_is_cached(self, tmp_path: Path) -> None:
+        context = self.arrange_nested_message_repeated_test(tmp_path)
+        raw = context.proto_instance.SerializeToString()
+
+        first_model_instance = context.converter.raw_to_model(
+            raw=raw, model_cls=context.model_cls
+        )
+        plan = context.converter._get_decode_plan(
+            context.proto_instance.DESCRIPTOR
+        )
+        second_model_instance = context.converter.raw_to_model(
+            raw=raw, model_cls=context.model_cls
+        )
+
+        assert (
+            context.converter._get_decode_plan(context.proto_instance.DESCRIPTOR)
+            is plan
+        )
+        assert first_model_instance == second_model_instance
+        assert second_model_instance == context.model_instance_ref
+
+    def test_raw_to_models_many(self, tmp_path: Path) -> None:
+        context = self.arrange_message_repeated_test(tmp_path)
+        raw = context.proto_instance.SerializeToString()
+
+        model_instances = context.converter.raw_to_models_many(
+            raws=[raw, raw, raw], model_cls=context.model_cls
+        )
+
+        assert model_instances == [context.model_instance_ref] * 3
+
+
+class TestProtobufConverterLazyRawToModel(TestProtobufConverterRawToModel):
+    converter_options = {"lazy_models": True}
+
+    def test_fields_are_decoded_on_access(self, tmp_path: Path) -> None:
+        context = self.arrange_nested_message_repeated_test(tmp_path)
+
+        model_instance = context.converter.raw_to_model(
+            raw=context.proto_instance.SerializeToString(),
+            model_cls=context.model_cls,
+        )
+
+        assert isinstance(model_instance, context.model_cls)
+        assert "message_repeated" not in model_instance.__dict__
+        users = model_instance.message_repeated
+        assert "message_repeated" in model_instance.__dict__
+        assert "address" not in users[0].__dict__
+        assert users[0].address == context.model_instance_ref.message_repeated[0].address
+        assert model_instance.to_dict() == context.model_instance_ref.to_dict()
+
+
+class TestProtobufConverterTrustedRawToModel(TestProtobufConverterRawToModel):
+    converter_options = {"trust_level": TrustLevel.TRUSTED}
@@ -0,0 +1,34 @@
+from __future__ import annotations
+from pathlib import Path
+
+import pytest
+
+from modapp.converters.protobuf import ProtobufConverter
+from modapp.converters.protobuf_registry import LazyProtoRegistry
+from tests.converters.protobuf.base_testsuite import generate_proto
+import tests.converters.protobuf.data as data
+
+
+def test_registry_resolves_proto_on_first_use(tmp_path: Path) -> None:
+    generated_protos = generate_proto(data.message_repeated_proto_src, tmp_path)
+    proto_path = data.MessageWithMessageRepeated.__modapp_path__
+    registry = LazyProtoRegistry()
+    converter = ProtobufConverter(protos=registry)
+    model_instance = data.MessageWithMessageRepeated(
+        message_repeated=[data.User(first_name="Alex", last_name="Smith")]
+    )
+
+    assert len(registry) == 0
+    raw = converter.model_to_raw(model_instance)
+
+    assert registry[proto_path] is generated_protos[proto_path]
+    assert (
+        converter.raw_to_model(raw, data.MessageWithMessageRepeated) == model_instance
+    )
+
+
+def test_registry_raises_key_error_for_unknown_proto() -> None:
+    registry = LazyProtoRegistry(modules={"modapp.tests.unknown": "not_existing_pb2"})
+
+    with pytest.raises(KeyError):
+        registry["modapp.tests.unknown.Message"]
@@ -0,0 +1,67 @@
+from __future__ import annotations
+from dataclasses import dataclass
+
+import pytest
+
+from modapp.base_converter import TrustLevel
+from modapp.converters.json import JsonConverter
+from modapp.models.dataclass import DataclassModel
+from modapp.models.pydantic import PydanticModel
+
+
+@dataclass
+class Contact(DataclassModel):
+    phone_number: str
+
+    __model_config__ = {"camelCase": True}
+
+
+@dataclass
+class Coordinates:
+    lat_value: float
+    lon_value: float
+
+
+@dataclass
+class UserWithContacts(DataclassModel):
+    full_name: str
+    contacts: list[Contact]
+    home_coordinates: Coordinates | None = None
+
+    __model_config__ = {"camelCase": True}
+
+
+class Address(PydanticModel):
+    postal_code: int
+    country: str
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        UserWithContacts(full_name="John White", contacts=[Contact(phone_number="1")]),
+        Address(postal_code=80100, country="Ukraine"),
+    ],
+)
+def test_native_serialization_matches_dict_serialization(model) -> None:
+    native_raw = JsonConverter(native_serialization=True).model_to_raw(model)
+
+    assert native_raw == JsonConverter().model_to_raw(model)
+    assert (
+        JsonConverter(trust_level=TrustLevel.TRUSTED).raw_to_model(
+            native_raw, type(model)
+        )
+        == model
+    )
+
+
+def test_native_camel_case_serialization_of_plain_dataclass_field() -> None:
+    model = UserWithContacts(
+        full_name="John White",
+        contacts=[],
+        home_coordinates=Coordinates(lat_value=50.4, lon_value=30.5),
+    )
+
+    native_raw = JsonConverter(native_serialization=True).model_to_raw(model)
+
+    assert native_raw == JsonConverter().model_to_raw(model)
@@ -1,7 +1,13 @@
 
+from __future__ import annotations
+
 from dataclasses import dataclass
+from typing import Annotated, Optional
+
+import pytest
 
-from modapp.models.dataclass import DataclassModel
+from modapp.errors import InvalidArgumentError
+from modapp.models.dataclass import DataclassModel, _add_slots, slotted_dataclass
 
 
 @dataclass
@@ -25,3 +31,181 @@ def test_model_with_dict_data_to_dict_camelcase():
             'country_name': 'Ukraine'
         }
     }
+
+
+@dataclass
+class Address(DataclassModel):
+    postal_code: int
+    country: str
+
+
+@dataclass
+class UserWithAddresses(DataclassModel):
+    name: str
+    addresses: list[Address]
+
+
+def test_construct_from_trusted_dict():
+    user = UserWithAddresses.construct_from_dict(
+        {"name": "John White", "addresses": [{"postal_code": 80100, "country": "Ukraine"}]}
+    )
+
+    assert user == UserWithAddresses(
+        name="John White", addresses=[Address(postal_code=80100, country="Ukraine")]
+    )
+
+
+@dataclass
+class ContactInfo(DataclassModel):
+    phone_number: str
+
+    __model_config__ = {"camelCase": True}
+
+
+@dataclass
+class UserWithContacts(DataclassModel):
+    full_name: str
+    main_contact: ContactInfo
+    other_contacts: list[ContactInfo]
+
+    __model_config__ = {"camelCase": True}
+
+
+def test_nested_models_camelcase_round_trip():
+    user = UserWithContacts(
+        full_name="John White",
+        main_contact=ContactInfo(phone_number="1"),
+        other_contacts=[ContactInfo(phone_number="2")],
+    )
+
+    user_dict = user.to_dict()
+
+    assert user_dict == {
+        "fullName": "John White",
+        "mainContact": {"phoneNumber": "1"},
+        "otherContacts": [{"phoneNumber": "2"}],
+    }
+    assert UserWithContacts.construct_from_dict(user_dict) == user
+
+
+@dataclass
+class UserWithOptionalContacts(DataclassModel):
+    full_name: str
+    other_contacts: Optional[list[ContactInfo]] = None
+    contacts_by_kind: Optional[dict[str, ContactInfo]] = None
+
+    __model_config__ = {"camelCase": True}
+
+
+def test_optional_nested_models_camelcase_round_trip():
+    user = UserWithOptionalContacts(
+        full_name="John White",
+        other_contacts=[ContactInfo(phone_number="1")],
+        contacts_by_kind={"work_phone": ContactInfo(phone_number="2")},
+    )
+
+    user_dict = user.to_dict()
+
+    assert user_dict == {
+        "fullName": "John White",
+        "otherContacts": [{"phoneNumber": "1"}],
+        "contactsByKind": {"work_phone": {"phoneNumber": "2"}},
+    }
+    assert UserWithOptionalContacts.construct_from_dict(user_dict) == user
+    assert UserWithOptionalContacts(full_name="John White").to_dict() == {
+        "fullName": "John White",
+        "otherContacts": None,
+        "contactsByKind": None,
+    }
+
+
+def test_validate_nested_models_from_dict():
+    user = UserWithAddresses.validate_and_construct_from_dict(
+        {"name": "John White", "addresses": [{"postal_code": "80100", "country": "Ukraine"}]}
+    )
+
+    assert user == UserWithAddresses(
+        name="John White", addresses=[Address(postal_code=80100, country="Ukraine")]
+    )
+
+
+def test_validate_reports_errors_by_fields():
+    with pytest.raises(InvalidArgumentError) as error_info:
+        UserWithAddresses.validate_and_construct_from_dict(
+            {"addresses": [{"postal_code": "not a number", "country": "Ukraine"}]}
+        )
+
+    assert error_info.value.errors_by_fields == {
+        "name": "Field required",
+        "addresses.0.postal_code": "Input should be a valid integer",
+    }
+
+
+def test_to_dict_copies_mutable_values():
+    user = UserWithAddresses(
+        name="John White", addresses=[Address(postal_code=80100, country="Ukraine")]
+    )
+
+    user_dict = user.to_dict()
+    user_dict["addresses"].append({"postal_code": 80200, "country": "Ukraine"})
+
+    assert user_dict["addresses"][0] == {"postal_code": 80100, "country": "Ukraine"}
+    assert len(user.addresses) == 1
+
+
+@dataclass
+class UserWithAnnotatedContacts(DataclassModel):
+    main_contact: Annotated[ContactInfo, "main"]
+    other_contacts: Annotated[list[ContactInfo], "other"]
+
+    __model_config__ = {"camelCase": True}
+
+
+def test_annotated_nested_models_to_dict():
+    user = UserWithAnnotatedContacts(
+        main_contact=ContactInfo(phone_number="1"),
+        other_contacts=[ContactInfo(phone_number="2")],
+    )
+
+    assert user.to_dict() == {
+        "mainContact": {"phoneNumber": "1"},
+        "otherContacts": [{"phoneNumber": "2"}],
+    }
+
+
+@slotted_dataclass(frozen=True)
+class Tick(DataclassModel):
+    instrument_id: int
+    last_price: float
+
+    __model_config__ = {"camelCase": True}
+
+
+def test_slotted_frozen_model_round_trip():
+    tick = Tick(instrument_id=1, last_price=10.5)
+
+    tick_dict = tick.to_dict()
+
+    assert not hasattr(tick, "__dict__")
+    assert tick_dict == {"instrumentId": 1, "lastPrice": 10.5}
+    assert Tick.validate_and_construct_from_dict(tick_dict) == tick
+    assert Tick.construct_from_dict(tick_dict) == tick
+
+
+class LegacyTick(DataclassModel):
+    instrument_id: int
+    last_price: float = 0.0
+
+    __model_config__ = {"camelCase": True}
+
+
+def test_slots_fallback_of_python_3_9():
+    # the fallback is used on Python 3.9, where dataclasses don't support `slots=True`
+    tick_cls = _add_slots(dataclass(frozen=True)(LegacyTick))
+
+    tick = tick_cls(instrument_id=1)
+
+    assert tick_cls.__slots__ == ("instrument_id", "last_price")
+    assert not hasattr(tick, "__dict__")
+    assert tick.to_dict() == {"instrumentId": 1, "lastPrice": 0.0}
+    assert tick_cls.construct_from_dict({"instrumentId": 1, "lastPrice": 0.0}) == tick
@@ -43,3 +43,23 @@ def test_model_from_camelcase_data():
     )
 
     assert user_info == expected_user_info
+
+
+class Address(PydanticModel):
+    postal_code: int
+    country: str
+
+
+class UserWithAddresses(PydanticModel):
+    name: str
+    addresses: list[Address]
+
+
+def test_construct_from_trusted_dict():
+    user = UserWithAddresses.construct_from_dict(
+        {"name": "John White", "addresses": [{"postal_code": 80100, "country": "Ukraine"}]}
+    )
+
+    assert user == UserWithAddresses(
+        name="John White", addresses=[Address(postal_code=80100, country="Ukraine")]
+    )
@@ -0,0 +1,141 @@
+import asyncio
+import gc
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+import pytest
+
+from modapp.concurrency_limit import ConcurrencyLimiter
+from modapp.converters.json import JsonConverter
+from modapp.errors import ResourceExhaustedError
+from modapp.models.dataclass import DataclassModel
+from modapp.routing import Cardinality, RouteMeta
+from modapp.server import Modapp
+from modapp.transports.inmemory import InMemoryTransport
+from modapp.transports.inmemory_config import DEFAULT_CONFIG as INMEMORY_CONFIG
+
+
+@dataclass
+class SleepRequest(DataclassModel):
+    seconds: float
+
+    __modapp_path__ = "modapp.tests.SleepRequest"
+
+
+@dataclass
+class SleepResponse(DataclassModel):
+    __modapp_path__ = "modapp.tests.SleepResponse"
+
+
+SLEEP_PATH = "/modapp.tests.Service/Sleep"
+
+
+async def test_requests_over_limit_are_queued_and_rejected():
+    transport = InMemoryTransport(config=INMEMORY_CONFIG, converter=JsonConverter())
+    global_limiter = ConcurrencyLimiter(limit=10)
+    app = Modapp({transport}, concurrency_limiter=global_limiter)
+    route_limiter = ConcurrencyLimiter(limit=1, max_queue_size=1)
+
+    @app.endpoint(
+        RouteMeta(path=SLEEP_PATH, cardinality=Cardinality.UNARY_UNARY),
+        concurrency_limiter=route_limiter,
+    )
+    async def sleep(request: SleepRequest) -> SleepResponse:
+        await asyncio.sleep(request.seconds)
+        return SleepResponse()
+
+    await app.run_async()
+    assert app.router.routes[SLEEP_PATH].concurrency_limiters == (
+        route_limiter,
+        global_limiter,
+    )
+    results = await asyncio.gather(
+        *[
+            transport.handle_request(SLEEP_PATH, b'{"seconds": 0.05}')
+            for _ in range(3)
+        ],
+        return_exceptions=True,
+    )
+    await app.stop_async()
+
+    # one is handled, one waits in queue, one is rejected
+    assert results[:2] == [b"{}", b"{}"]
+    assert isinstance(results[2], ResourceExhaustedError)
+    assert route_limiter.in_flight == 0
+    assert global_limiter.in_flight == 0
+
+
+async def test_stream_holds_limit_until_it_is_finished():
+    transport = InMemoryTransport(config=INMEMORY_CONFIG, converter=JsonConverter())
+    app = Modapp({transport})
+    limiter = ConcurrencyLimiter(limit=1)
+
+    @app.endpoint(
+        RouteMeta(path=SLEEP_PATH, cardinality=Cardinality.UNARY_STREAM),
+        concurrency_limiter=limiter,
+    )
+    async def sleep(request: SleepRequest) -> AsyncIterator[SleepResponse]:
+        for _ in range(2):
+            await asyncio.sleep(request.seconds)
+            yield SleepResponse()
+
+    await app.run_async()
+    stream = await transport.got_request(
+        app.router.routes[SLEEP_PATH], b'{"seconds": 0}', {}
+    )
+    assert isinstance(stream, AsyncIterator)
+    assert limiter.in_flight == 1
+    with pytest.raises(ResourceExhaustedError):
+        await transport.got_request(app.router.routes[SLEEP_PATH], b'{"seconds": 0}', {})
+
+    messages = [message async for message in stream]
+    await app.stop_async()
+
+    assert messages == [b"{}", b"{}"]
+    assert limiter.in_flight == 0
+
+
+async def test_unstarted_stream_releases_limit_on_close_and_when_dropped():
+    transport = InMemoryTransport(config=INMEMORY_CONFIG, converter=JsonConverter())
+    app = Modapp({transport})
+    limiter = ConcurrencyLimiter(limit=1)
+
+    @app.endpoint(
+        RouteMeta(path=SLEEP_PATH, cardinality=Cardinality.UNARY_STREAM),
+        concurrency_limiter=limiter,
+    )
+    async def sleep(request: SleepRequest) -> AsyncIterator[SleepResponse]:
+        yield SleepResponse()
+
+    await app.run_async()
+    route = app.router.routes[SLEEP_PATH]
+    stream = await transport.got_request(route, b'{"seconds": 0}', {})
+    assert limiter.in_flight == 1
+    await stream.aclose()
+    assert limiter.in_flight == 0
+
+    # e.g. client disconnected before transport started to send the stream
+    stream = await transport.got_request(route, b'{"seconds": 0}', {})
+    assert limiter.in_flight == 1
+    del stream
+    gc.collect()
+    await app.stop_async()
+
+    assert limiter.in_flight == 0
+
+
+async def test_request_is_rejected_after_max_queue_time():
+    limiter = ConcurrencyLimiter(limit=1, max_queue_size=1, max_queue_time=0.01)
+    acquired_at = await limiter.acquire()
+    with pytest.raises(ResourceExhaustedError):
+        await limiter.acquire()
+    assert limiter.queue_size == 0
+    limiter.release(acquired_at)
+    assert limiter.in_flight == 0
+
+
+async def test_adaptive_limit_grows_while_latency_is_stable():
+    limiter = ConcurrencyLimiter(limit=2, adaptive=True, max_limit=8)
+    for _ in range(50):
+        limiter.release(await limiter.acquire())
+    assert 2 < limiter.limit <= 8
@@ -0,0 +1,35 @@
+from modapp.converter_utils import (
+    select_converter,
+    select_grpc_converter,
+    select_reply_converter,
+)
+from modapp.converters.json import JsonConverter
+from modapp.converters.protobuf import ProtobufConverter
+
+json_converter = JsonConverter()
+protobuf_converter = ProtobufConverter(protos={})
+converters = [json_converter, protobuf_converter]
+
+
+def test_select_converter_by_content_type():
+    assert select_converter(converters, "application/x-protobuf") is protobuf_converter
+    assert select_converter(converters, "application/json; charset=utf-8") is json_converter
+    assert select_converter(converters, None) is json_converter
+    assert select_converter(converters, "text/plain") is None
+
+
+def test_select_reply_converter_by_accept():
+    assert (
+        select_reply_converter(
+            converters, "application/json;q=0.5, application/octet-stream", json_converter
+        )
+        is protobuf_converter
+    )
+    assert select_reply_converter(converters, "*/*", protobuf_converter) is protobuf_converter
+    assert select_reply_converter(converters, "text/html", json_converter) is json_converter
+
+
+def test_select_grpc_converter_by_content_subtype():
+    assert select_grpc_converter(converters, "proto") is protobuf_converter
+    assert select_grpc_converter(converters, "json") is json_converter
+    assert select_grpc_converter(converters, "cbor") is None
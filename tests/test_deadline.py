@@ -0,0 +1,78 @@
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+
+from modapp.converters.json import JsonConverter
+from modapp.deadline import Deadline, decode_timeout, encode_timeout, get_deadline
+from modapp.errors import DeadlineExceededError
+from modapp.models.dataclass import DataclassModel
+from modapp.param_functions import Depends
+from modapp.routing import Cardinality, RouteMeta
+from modapp.server import Modapp
+from modapp.transports.inmemory import InMemoryTransport
+from modapp.transports.inmemory_config import DEFAULT_CONFIG as INMEMORY_CONFIG
+
+
+@dataclass
+class WaitRequest(DataclassModel):
+    seconds: float
+
+    __modapp_path__ = "modapp.tests.WaitRequest"
+
+
+@dataclass
+class WaitResponse(DataclassModel):
+    time_remaining: float
+
+    __modapp_path__ = "modapp.tests.WaitResponse"
+
+
+def test_timeout_is_encoded_in_grpc_format():
+    assert encode_timeout(30) == "30S"
+    assert encode_timeout(0.5) == "500m"
+    assert decode_timeout("500m") == pytest.approx(0.5)
+    with pytest.raises(ValueError):
+        decode_timeout("0.5s")
+
+
+async def test_handler_is_cancelled_on_deadline():
+    events: list[str] = []
+    transport = InMemoryTransport(config=INMEMORY_CONFIG, converter=JsonConverter())
+    app = Modapp({transport})
+
+    async def get_request_deadline(
+        deadline: Deadline | None = Depends(get_deadline),
+    ) -> Deadline | None:
+        return deadline
+
+    @app.endpoint(
+        RouteMeta(path="/modapp.tests.Service/Wait", cardinality=Cardinality.UNARY_UNARY)
+    )
+    async def wait(
+        request: WaitRequest, deadline: Deadline | None = Depends(get_request_deadline)
+    ) -> WaitResponse:
+        assert deadline is get_deadline()
+        try:
+            await asyncio.sleep(request.seconds)
+        except asyncio.CancelledError:
+            events.append("cancelled")
+            raise
+        return WaitResponse(time_remaining=deadline.time_remaining() if deadline else -1)
+
+    await app.run_async()
+    raw_reply = await transport.handle_request(
+        "/modapp.tests.Service/Wait",
+        b'{"seconds": 0}',
+        deadline=Deadline.from_timeout(1),
+    )
+    assert 0 < JsonConverter().raw_to_model(raw_reply, WaitResponse).time_remaining <= 1
+
+    with pytest.raises(DeadlineExceededError):
+        await transport.handle_request(
+            "/modapp.tests.Service/Wait",
+            b'{"seconds": 1}',
+            deadline=Deadline.from_timeout(0.05),
+        )
+    assert events == ["cancelled"]
+    await app.stop_async()
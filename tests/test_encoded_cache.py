@@ -0,0 +1,64 @@
+from dataclasses import dataclass
+
+from modapp.converters.json import JsonConverter
+from modapp.encoded_cache import EncodedModelCache, is_model_cacheable
+from modapp.models.dataclass import DataclassModel
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot(DataclassModel):
+    version: int
+    flags: tuple[str, ...]
+
+    __model_config__ = {"cacheEncoded": True}
+
+
+@dataclass(frozen=True)
+class MutableSnapshot(DataclassModel):
+    version: int
+    flags: list[str]
+
+    __model_config__ = {"cacheEncoded": True}
+
+
+class CountingConverter(JsonConverter):
+    def __init__(self) -> None:
+        super().__init__()
+        self.encoded_count = 0
+
+    def model_to_raw(self, model):
+        self.encoded_count += 1
+        return super().model_to_raw(model)
+
+
+def test_immutable_model_is_encoded_once():
+    cache = EncodedModelCache(max_size_bytes=1024)
+    converter = CountingConverter()
+    snapshot = ConfigSnapshot(version=1, flags=("a", "b"))
+
+    raws = [cache.model_to_raw(converter, snapshot) for _ in range(3)]
+
+    assert raws == [b'{"version":1,"flags":["a","b"]}'] * 3
+    assert converter.encoded_count == 1
+
+
+def test_model_with_mutable_fields_is_not_cached():
+    cache = EncodedModelCache(max_size_bytes=1024)
+    converter = CountingConverter()
+    snapshot = MutableSnapshot(version=1, flags=["a"])
+
+    cache.model_to_raw(converter, snapshot)
+    snapshot.flags.append("b")
+
+    assert not is_model_cacheable(MutableSnapshot)
+    assert cache.model_to_raw(converter, snapshot) == b'{"version":1,"flags":["a","b"]}'
+
+
+def test_cache_size_is_bounded():
+    cache = EncodedModelCache(max_size_bytes=64)
+    converter = CountingConverter()
+
+    for version in range(10):
+        cache.model_to_raw(converter, ConfigSnapshot(version=version, flags=("a",)))
+
+    assert cache.size_bytes <= 64
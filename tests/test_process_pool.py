@@ -0,0 +1,95 @@
+import json
+import os
+from dataclasses import dataclass
+
+from modapp.converters.json import JsonConverter
+from modapp.converters.protobuf import ProtobufConverter
+from modapp.models.dataclass import DataclassModel
+from modapp.param_functions import Meta
+from modapp.routing import APIRouter, Cardinality, RouteMeta
+from modapp.server import Modapp
+from modapp.transports.inmemory import InMemoryTransport
+from modapp.transports.inmemory_config import DEFAULT_CONFIG as INMEMORY_CONFIG
+from tests.converters.protobuf import data
+from tests.converters.protobuf.base_testsuite import generate_proto
+
+
+@dataclass
+class SumRequest(DataclassModel):
+    numbers: list[int]
+
+    __modapp_path__ = "modapp.tests.SumRequest"
+
+
+@dataclass
+class SumResponse(DataclassModel):
+    total: int
+    process_id: int
+
+    __modapp_path__ = "modapp.tests.SumResponse"
+
+
+SUM_ROUTE = RouteMeta(path="/modapp.tests.Service/Sum", cardinality=Cardinality.UNARY_UNARY)
+SWAP_ROUTE = RouteMeta(
+    path="/modapp.tests.Service/SwapOneOf", cardinality=Cardinality.UNARY_UNARY
+)
+
+router = APIRouter()
+
+
+@router.endpoint(SUM_ROUTE, process_workers=2)
+def sum_numbers(request: SumRequest, offset: int = Meta()) -> SumResponse:
+    return SumResponse(total=sum(request.numbers) + offset, process_id=os.getpid())
+
+
+protobuf_router = APIRouter()
+
+
+@protobuf_router.endpoint(SWAP_ROUTE, process_workers=1)
+def swap_one_of_values(
+    request: data.MessageToTestOneOfScalars,
+) -> data.MessageToTestOneOfScalars:
+    return data.MessageToTestOneOfScalars(
+        str_or_int64=len(request.str_or_int64), bool_or_double=float(request.bool_or_double)
+    )
+
+
+async def test_route_is_handled_in_process_pool():
+    transport = InMemoryTransport(config=INMEMORY_CONFIG, converter=JsonConverter())
+    app = Modapp({transport})
+    app.include_router(router)
+    await app.run_async()
+    try:
+        route = app.router.routes[SUM_ROUTE.path]
+        raw_reply = await transport.got_request(
+            route, b'{"numbers": [1, 2, 3]}', {"offset": 10}
+        )
+    finally:
+        await app.stop_async()
+
+    reply = json.loads(raw_reply)
+    assert reply["total"] == 16
+    assert reply["process_id"] != os.getpid()
+
+
+async def test_route_with_protobuf_converter_is_handled_in_process_pool(tmp_path):
+    protos = generate_proto(data.one_of_scalars_proto_src, tmp_path)
+    proto_cls = protos[data.MessageToTestOneOfScalars.__modapp_path__]
+    converter = ProtobufConverter(protos=protos)
+    raw_request = proto_cls(str_field="four", bool_field=True).SerializeToString()
+    # caches of converter with protobuf descriptors are filled, they cannot be pickled
+    converter.raw_to_model(raw_request, data.MessageToTestOneOfScalars)
+
+    transport = InMemoryTransport(config=INMEMORY_CONFIG, converter=converter)
+    app = Modapp({transport})
+    app.include_router(protobuf_router)
+    await app.run_async()
+    try:
+        route = app.router.routes[SWAP_ROUTE.path]
+        raw_reply = await transport.got_request(route, raw_request, {})
+    finally:
+        await app.stop_async()
+
+    reply = proto_cls.FromString(raw_reply)
+    assert reply.int64_field == 4
+    assert reply.double_field == 1.0
@@ -0,0 +1,230 @@
+import asyncio
+import threading
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import AsyncIterator, Iterator
+
+import pytest
+
+from modapp.dependencies import enter_async_contexts_concurrently
+from modapp.models.dataclass import DataclassModel
+from modapp.param_functions import Depends, Meta
+from modapp.routing import APIRouter, Cardinality, RouteMeta
+
+
+async def handler(request: DataclassModel) -> DataclassModel:
+    return request
+
+
+def test_routes_table_is_updated_after_router_tree_change():
+    app_router = APIRouter()
+    sub_router = APIRouter()
+    app_router.include_router(sub_router)
+    first_route = RouteMeta(path="/test.Service/First", cardinality=Cardinality.UNARY_UNARY)
+    second_route = RouteMeta(
+        path="/test.Service/Second", cardinality=Cardinality.UNARY_UNARY
+    )
+
+    sub_router.add_endpoint(first_route, handler)
+    routes_before = app_router.routes
+    sub_router.add_endpoint(second_route, handler)
+
+    assert list(routes_before) == [first_route.path]
+    assert list(app_router.routes) == [first_route.path, second_route.path]
+    assert app_router.routes is app_router.routes
+
+
+async def test_route_invocation_plan_solves_meta_and_dependencies():
+    events: list[str] = []
+
+    def get_session() -> Iterator[str]:
+        events.append("enter")
+        yield "session"
+        events.append("exit")
+
+    def sync_handler(
+        request: DataclassModel,
+        user_id: str = Meta(),
+        session: str = Depends(get_session),
+    ) -> DataclassModel:
+        events.append(f"handle {user_id} {session}")
+        return request
+
+    router = APIRouter()
+    router.add_endpoint(
+        RouteMeta(path="/test.Service/Sync", cardinality=Cardinality.UNARY_UNARY),
+        sync_handler,
+    )
+    route = router.routes["/test.Service/Sync"]
+
+    async with AsyncExitStack() as stack:
+        handler_args = await route.solve_handler_args({"user_id": "1"}, stack)
+        request = DataclassModel()
+        assert await route.call_handler(request, handler_args) is request
+
+    assert not route.is_async_handler
+    assert events == ["enter", "handle 1 session", "exit"]
+
+
+async def test_async_dependencies_are_entered_concurrently():
+    events: list[str] = []
+
+    async def get_connection() -> AsyncIterator[str]:
+        await asyncio.sleep(0.1)
+        events.append("enter connection")
+        yield "connection"
+        events.append("exit connection")
+
+    async def get_failing_client() -> AsyncIterator[str]:
+        await asyncio.sleep(0.05)
+        raise RuntimeError("client is not available")
+        yield "client"
+
+    async def get_config() -> AsyncIterator[str]:
+        await asyncio.sleep(0.1)
+        events.append("enter config")
+        yield "config"
+        events.append("exit config")
+
+    async def handler(
+        request: DataclassModel,
+        connection: str = Depends(get_connection),
+        config: str = Depends(get_config),
+    ) -> DataclassModel:
+        return request
+
+    router = APIRouter()
+    router.add_endpoint(
+        RouteMeta(path="/test.Service/Concurrent", cardinality=Cardinality.UNARY_UNARY),
+        handler,
+    )
+    route = router.routes["/test.Service/Concurrent"]
+
+    started_at = time.monotonic()
+    async with AsyncExitStack() as stack:
+        handler_args = await route.solve_handler_args({}, stack)
+    assert time.monotonic() - started_at < 0.19
+    assert handler_args == {"connection": "connection", "config": "config"}
+    # exited in reverse order of declaration
+    assert events[-2:] == ["exit config", "exit connection"]
+
+    events.clear()
+    stack = AsyncExitStack()
+    with pytest.raises(RuntimeError):
+        await enter_async_contexts_concurrently(
+            [
+                asynccontextmanager(get_connection)(),
+                asynccontextmanager(get_failing_client)(),
+                asynccontextmanager(get_config)(),
+            ],
+            stack,
+        )
+    await stack.aclose()
+    assert sorted(events[:2]) == ["enter config", "enter connection"]
+    assert events[2:] == ["exit config", "exit connection"]
+
+
+async def test_concurrent_dependency_is_entered_and_exited_in_one_task():
+    anyio = pytest.importorskip("anyio")
+    tasks: list[tuple[str, asyncio.Task]] = []
+
+    async def get_client() -> AsyncIterator[str]:
+        # cancel scope should be exited in the task where it was entered
+        with anyio.CancelScope():
+            tasks.append(("enter", asyncio.current_task()))
+            yield "client"
+            tasks.append(("exit", asyncio.current_task()))
+
+    async def get_config() -> AsyncIterator[str]:
+        yield "config"
+
+    async with AsyncExitStack() as stack:
+        values = await enter_async_contexts_concurrently(
+            [asynccontextmanager(get_client)(), asynccontextmanager(get_config)()],
+            stack,
+        )
+
+    assert values == ["client", "config"]
+    assert [event for event, _ in tasks] == ["enter", "exit"]
+    assert tasks[0][1] is tasks[1][1]
+
+
+async def test_cached_dependency_is_shared_in_request():
+    entered_sessions: list[object] = []
+
+    async def get_session() -> AsyncIterator[object]:
+        session = object()
+        entered_sessions.append(session)
+        yield session
+
+    def get_repository(session: object = Depends(get_session)) -> object:
+        return session
+
+    async def get_fresh_session(
+        session: object = Depends(get_session, use_cache=False),
+    ) -> object:
+        return session
+
+    async def handler(
+        request: DataclassModel,
+        session: object = Depends(get_session),
+        repository_session: object = Depends(get_repository),
+        fresh_session: object = Depends(get_fresh_session),
+    ) -> DataclassModel:
+        return request
+
+    router = APIRouter()
+    router.add_endpoint(
+        RouteMeta(path="/test.Service/Cached", cardinality=Cardinality.UNARY_UNARY),
+        handler,
+    )
+    route = router.routes["/test.Service/Cached"]
+
+    async with AsyncExitStack() as stack:
+        handler_args = await route.solve_handler_args({}, stack)
+
+    assert len(entered_sessions) == 2
+    assert handler_args["session"] is handler_args["repository_session"]
+    assert handler_args["fresh_session"] is not handler_args["session"]
+
+
+async def test_sync_handler_and_dependencies_run_in_threadpool():
+    threads: dict[str, int] = {}
+
+    def get_session() -> Iterator[str]:
+        threads["dependency"] = threading.get_ident()
+        yield "session"
+        threads["dependency exit"] = threading.get_ident()
+
+    def blocking_handler(
+        request: DataclassModel, session: str = Depends(get_session)
+    ) -> DataclassModel:
+        threads["handler"] = threading.get_ident()
+        return request
+
+    def cheap_handler(request: DataclassModel) -> DataclassModel:
+        threads["cheap handler"] = threading.get_ident()
+        return request
+
+    router = APIRouter()
+    router.add_endpoint(
+        RouteMeta(path="/test.Service/Blocking", cardinality=Cardinality.UNARY_UNARY),
+        blocking_handler,
+    )
+    router.add_endpoint(
+        RouteMeta(path="/test.Service/Cheap", cardinality=Cardinality.UNARY_UNARY),
+        cheap_handler,
+        sync_in_threadpool=False,
+    )
+
+    for path in ("/test.Service/Blocking", "/test.Service/Cheap"):
+        route = router.routes[path]
+        async with AsyncExitStack() as stack:
+            handler_args = await route.solve_handler_args({}, stack)
+            await route.call_handler(DataclassModel(), handler_args)
+
+    assert threads["dependency"] != threading.get_ident()
+    # thread-affine resources of dependency can be used in handler and closed on exit
+    assert threads["handler"] == threads["dependency"]
+    assert threads["dependency exit"] == threads["dependency"]
+    assert threads["cheap handler"] == threading.get_ident()
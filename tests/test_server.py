@@ -4,6 +4,11 @@ from dataclasses import dataclass
 
 import aiohttp
 from modapp.client import BaseChannel, Stream
+from modapp.param_functions import Depends
+from modapp.routing import Cardinality, ReplyBatch, RouteMeta
+from modapp.server import Modapp
+from modapp.transports.inmemory import InMemoryTransport
+from modapp.transports.inmemory_config import DEFAULT_CONFIG as INMEMORY_CONFIG
 from modapp.converters.json import JsonConverter
 import pytest
 from .transports.test_aiohttp import create_app
@@ -63,3 +68,108 @@ async def test_keep_running_and_health_check():
             # with pytest.raises(SystemExit):
             #     await asyncio.sleep(3)
             # print('after wait time')
+
+
+@dataclass
+class GetPoolRequest(BaseModel):
+    __modapp_path__ = "modapp.tests.GetPoolRequest"
+
+
+@dataclass
+class GetPoolResponse(BaseModel):
+    pool_id: int
+
+    __modapp_path__ = "modapp.tests.GetPoolResponse"
+
+
+async def test_app_dependencies_are_shared_until_stop():
+    events: list[str] = []
+
+    async def get_pool():
+        events.append("open pool")
+        yield 1
+        events.append("close pool")
+
+    async def get_test_pool():
+        events.append("open test pool")
+        yield 2
+        events.append("close test pool")
+
+    def get_connection(pool: int = Depends(get_pool)):
+        events.append(f"connection of pool {pool}")
+        yield pool
+
+    transport = InMemoryTransport(config=INMEMORY_CONFIG, converter=JsonConverter())
+    app = Modapp(
+        {transport},
+        app_dependencies=[get_pool],
+        dependency_overrides={get_pool: get_test_pool},
+    )
+
+    @app.endpoint(
+        RouteMeta(path="/modapp.tests.Service/GetPool", cardinality=Cardinality.UNARY_UNARY)
+    )
+    async def get_pool_id(
+        request: GetPoolRequest, connection: int = Depends(get_connection)
+    ) -> GetPoolResponse:
+        return GetPoolResponse(pool_id=connection)
+
+    await app.run_async()
+    for _ in range(2):
+        await transport.handle_request("/modapp.tests.Service/GetPool", b"{}")
+    assert events == [
+        "open test pool",
+        "connection of pool 2",
+        "connection of pool 2",
+    ]
+
+    await app.stop_async()
+    assert events[-1] == "close test pool"
+
+
+@dataclass
+class TickResponse(BaseModel):
+    price: int
+
+    __modapp_path__ = "modapp.tests.TickResponse"
+
+
+async def test_stream_reply_batch_is_sent_as_separate_messages():
+    transport = InMemoryTransport(config=INMEMORY_CONFIG, converter=JsonConverter())
+    app = Modapp({transport})
+
+    @app.endpoint(
+        RouteMeta(path="/modapp.tests.Service/GetTicks", cardinality=Cardinality.UNARY_STREAM)
+    )
+    async def get_ticks(request: BaseModel):
+        yield TickResponse(price=1)
+        yield ReplyBatch([TickResponse(price=2), TickResponse(price=3)])
+
+    await app.run_async()
+    stream = await transport.got_request(
+        app.router.routes["/modapp.tests.Service/GetTicks"], b"{}", {}
+    )
+    messages = [message async for message in stream]
+    await app.stop_async()
+
+    assert messages == [b'{"price":1}', b'{"price":2}', b'{"price":3}']
+
+
+def test_stop_after_loop_end_closes_app_dependencies():
+    events: list[str] = []
+
+    async def get_pool():
+        events.append("open pool")
+        yield 1
+        events.append("close pool")
+
+    transport = InMemoryTransport(config=INMEMORY_CONFIG, converter=JsonConverter())
+    app = Modapp({transport}, app_dependencies=[get_pool])
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(app.run_async())
+        app.stop()
+    finally:
+        loop.close()
+
+    assert events == ["open pool", "close pool"]
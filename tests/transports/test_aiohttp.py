@@ -11,7 +11,7 @@ from modapp.client import BaseChannel
 from modapp.converters.json import JsonConverter
 from modapp.models.pydantic import PydanticModel
 from modapp.transports.web_aiohttp import WebAiohttpTransport
-from modapp.transports.web_aiohttp_config import WebAiohttpTransportConfig
+from modapp.transports.web_aiohttp_config import DEFAULT_CONFIG, WebAiohttpTransportConfig
 from modapp.routing import RouteMeta, Cardinality
 from modapp.server import Modapp
 from modapp.transports.utils.free_port import get_free_port
@@ -82,10 +82,14 @@ async def generate_notes(request: GenerateNotesRequest) -> AsyncIterator[Note]:
 
 
 @asynccontextmanager
-async def create_app() -> AsyncGenerator[tuple[Modapp, int], None]:
+async def create_app(
+    compression_min_size: int | None = DEFAULT_CONFIG["compression_min_size"],
+) -> AsyncGenerator[tuple[Modapp, int], None]:
     converter = JsonConverter()
     free_port = get_free_port()
-    config = WebAiohttpTransportConfig(port=free_port)
+    config = WebAiohttpTransportConfig(
+        port=free_port, compression_min_size=compression_min_size
+    )
     web_transport = WebAiohttpTransport(config=config, converter=converter)
 
     app = Modapp({web_transport},
@@ -96,7 +100,7 @@ async def create_app() -> AsyncGenerator[tuple[Modapp, int], None]:
     try:
         yield app, free_port
     finally:
-        app.stop()
+        await app.stop_async()
 
 
 async def test_unary_unary_returns_data():
@@ -114,6 +118,22 @@ async def test_unary_unary_returns_data():
         }
 
 
+async def test_unary_unary_reply_is_compressed():
+    async with create_app(compression_min_size=0) as (_, port):
+        async with aiohttp.ClientSession() as session:
+            async with session.post(
+                f"http://127.0.0.1:{port}/modapp/tests/transports/aiohttp/aiohttpservice/listnotes",
+                headers={"Accept-Encoding": "gzip"},
+            ) as resp:
+                content_encoding = resp.headers.get("Content-Encoding")
+                response_body = await resp.json()
+
+        assert content_encoding == "gzip"
+        assert response_body == {
+            "notes": [{"content": "don't forget to test your code"}]
+        }
+
+
 class AiohttpClientServiceCls:
     async def generate_notes(
         self, channel: BaseChannel, request: GenerateNotesRequest
@@ -74,7 +74,7 @@ async def create_app() -> AsyncGenerator[Modapp, None]:
     try:
         yield app
     finally:
-        app.stop()
+        await app.stop_async()
 
 
 async def test_unary_unary_returns_data():